@@ -0,0 +1,192 @@
+"""Batch plan generation on a warm process pool.
+
+Unique queries are grouped into chunks and each chunk is planned by one
+worker process. Inside a chunk, every query that needs the NLTK path is
+POS-tagged with a single ``pos_tag_sents`` call. Results are yielded in
+input order as soon as the chunk holding the next item has finished.
+Plans come back frozen (plan_model.py), so a large batch held in memory
+shares its keys and repeated strings.
+
+Every web worker has its own pool, so BATCH_WORKERS defaults to the CPUs
+divided among WEB_CONCURRENCY web workers. Pool processes are started from
+a forkserver (BATCH_START_METHOD), not forked from a threaded web worker
+that may hold a lock. A pool broken by a crashed process is replaced.
+"""
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from plan_model import freeze, json_default
+
+_cpus = os.cpu_count() or 1
+BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', str(max(1, _cpus // int(os.getenv('WEB_CONCURRENCY', str(_cpus)))))))
+BATCH_START_METHOD = os.getenv(
+    'BATCH_START_METHOD',
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+BATCH_CHUNK_SIZE = int(os.getenv('BATCH_CHUNK_SIZE', '32'))
+BATCH_MAX_QUERIES = int(os.getenv('BATCH_MAX_QUERIES', '10000'))
+
+_executor = None
+_executor_pid = None
+
+
+def _warm_worker():
+    """Load the planner, tagger and templates once per worker process."""
+    import milestone_generator
+    milestone_generator.generate_plan("Create a 7-day workout plan")
+
+
+def create_executor(workers=BATCH_WORKERS):
+    """Create a warm pool; ``workers=0`` plans in a single thread of this process."""
+    if workers <= 0:
+        return ThreadPoolExecutor(max_workers=1, initializer=_warm_worker)
+    return ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker,
+                               mp_context=multiprocessing.get_context(BATCH_START_METHOD))
+
+
+def get_executor():
+    """Return the shared pool, creating it on first use and again after a fork."""
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        _executor = create_executor()
+        _executor_pid = os.getpid()
+    return _executor
+
+
+def reset_executor(broken):
+    """Drop ``broken`` as the shared pool, so the next get_executor() builds a new one."""
+    global _executor
+    if _executor is broken:
+        _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def generate_plans(queries):
+    """Plan a chunk of unique queries, returning (ok, plan or error message) per query."""
+    import milestone_generator as mg
+    from query_analysis import QueryAnalysis, classify_analyses, tag_analyses
+
+    analyses = classify_analyses([QueryAnalysis(query) for query in queries])
+    # Only queries the fast path cannot decide need tags; tag them all in one call
+    try:
+        tag_analyses([analysis for analysis in analyses if analysis.fast.ambiguous])
+    except Exception:
+        pass  # Each query retries on its own below and reports its own error
+
+    results = []
+    # One string pool per chunk; pickling the results keeps the sharing
+    pool = {}
+    for analysis in analyses:
+        try:
+            results.append((True, freeze(mg.generate_plan(analysis), pool)))
+        except Exception as e:
+            results.append((False, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def iter_batch_results(queries, executor=None, chunk_size=BATCH_CHUNK_SIZE, max_queries=BATCH_MAX_QUERIES):
+    """Yield one result dict per input query, in input order.
+
+    ``queries`` may be any iterable, so large NDJSON uploads are dispatched
+    while they are still being read. Identical queries are planned once.
+    """
+    shared = executor is None
+    executor = executor or get_executor()
+    futures = []      # chunk id -> future
+    locations = {}    # query -> (chunk id, offset)
+    chunk = []
+    pending = deque()  # (index, query, error) in input order
+
+    def submit(queries):
+        """Submit a chunk, replacing a broken shared pool once; a second failure fails the chunk.
+
+        A pool broken while chunks run fails those chunks, and is replaced
+        on the next submit, here or in a later batch.
+        """
+        nonlocal executor
+        for attempt in range(2):
+            try:
+                return executor.submit(generate_plans, queries)
+            except BrokenExecutor as e:
+                error = e
+                if not shared:
+                    break
+                reset_executor(executor)
+                executor = get_executor()
+        failed = Future()
+        failed.set_exception(error)
+        return failed
+
+    def flush():
+        if chunk:
+            futures.append(submit(list(chunk)))
+            chunk.clear()
+
+    def ready(item):
+        index, query, error = item
+        if error is not None:
+            return True
+        chunk_id, _ = locations[query]
+        return chunk_id < len(futures) and futures[chunk_id].done()
+
+    def result(item):
+        index, query, error = item
+        if error is not None:
+            return {"index": index, "query": query, "error": error}
+        chunk_id, offset = locations[query]
+        try:
+            ok, value = futures[chunk_id].result()[offset]
+        except Exception as e:
+            ok, value = False, f"{type(e).__name__}: {e}"
+        if ok:
+            return {"index": index, "query": query, "plan": value}
+        return {"index": index, "query": query, "error": value}
+
+    for index, query in enumerate(queries):
+        error = None
+        if isinstance(query, Exception):
+            error, query = str(query), None
+        elif not isinstance(query, str) or not query.strip():
+            error = "Query must be a non-empty string"
+        elif index >= max_queries:
+            error = f"Batch is limited to {max_queries} queries"
+        elif query not in locations:
+            locations[query] = (len(futures), len(chunk))
+            chunk.append(query)
+            if len(chunk) >= chunk_size:
+                flush()
+        pending.append((index, query, error))
+
+        while pending and ready(pending[0]):
+            yield result(pending.popleft())
+
+    flush()
+    while pending:
+        yield result(pending.popleft())
+
+
+def iter_ndjson_queries(lines):
+    """Parse NDJSON lines holding either a JSON string or an object with a "query" field.
+
+    Malformed lines are yielded as ValueError instances so they become per-item errors.
+    """
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='replace')
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON line: {e}")
+            continue
+        yield item.get('query') if isinstance(item, dict) else item
+
+
+def iter_ndjson_results(queries, executor=None):
+    """Serialize batch results as NDJSON lines."""
+    for item in iter_batch_results(queries, executor):
+        yield json.dumps(item, default=json_default) + '\n'
@@ -0,0 +1 @@
+"""Benchmark scripts for the planning service; run them with ``python -m benchmarks.<name>``."""
@@ -0,0 +1,81 @@
+"""Per-stage CPU cost of query analysis: repeated NLTK passes vs. one shared QueryAnalysis.
+
+    python -m benchmarks.analysis --rounds 20
+"""
+import argparse
+import time
+from nltk.tokenize import word_tokenize
+from nltk.tag import pos_tag
+from nltk.chunk import ne_chunk
+from nltk.corpus import stopwords
+
+from benchmarks.corpus import QUERIES
+
+
+def legacy_stages(query):
+    """The NLTK work generate_plan used to do, stage by stage."""
+    # analyze_query
+    tokens = word_tokenize(query)
+    tags = pos_tag(tokens)
+    ne_chunk(tags)
+    stop_words = set(stopwords.words('english'))
+    [w for w in tokens if w.lower() not in stop_words]
+    yield 'analyze_query'
+    # clean_query
+    stop_words = set(stopwords.words('english'))
+    [w for w in word_tokenize(query.lower()) if w not in stop_words]
+    yield 'clean_query'
+    # detect_time_period
+    pos_tag(word_tokenize(query))
+    yield 'detect_time_period'
+
+
+def shared_stages(query):
+    """The same stages reading from a single QueryAnalysis."""
+    import milestone_generator as mg
+    analysis = mg.QueryAnalysis(query)
+    mg.analyze_query(analysis)
+    yield 'analyze_query'
+    mg.clean_query(analysis)
+    yield 'clean_query'
+    mg.detect_time_period(analysis)
+    yield 'detect_time_period'
+
+
+def time_stages(stages, rounds):
+    """Return mean microseconds per query for each stage."""
+    totals = {}
+    for _ in range(rounds):
+        for query in QUERIES:
+            start = time.perf_counter()
+            for stage in stages(query):
+                now = time.perf_counter()
+                totals[stage] = totals.get(stage, 0.0) + (now - start)
+                start = now
+    count = rounds * len(QUERIES)
+    return {stage: total / count * 1e6 for stage, total in totals.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    # Warm up the tagger, chunker and stopword caches before timing
+    list(legacy_stages(QUERIES[0]))
+    list(shared_stages(QUERIES[0]))
+
+    before = time_stages(legacy_stages, args.rounds)
+    after = time_stages(shared_stages, args.rounds)
+
+    print(f"{'Stage':<22} {'before':>12} {'after':>12} {'saved':>8}")
+    for stage in before:
+        saved = (1 - after[stage] / before[stage]) * 100 if before[stage] else 0.0
+        print(f"{stage:<22} {before[stage]:>10.1f}us {after[stage]:>10.1f}us {saved:>7.1f}%")
+    total_before, total_after = sum(before.values()), sum(after.values())
+    print(f"{'total':<22} {total_before:>10.1f}us {total_after:>10.1f}us "
+          f"{(1 - total_after / total_before) * 100:>7.1f}%")
+
+
+if __name__ == '__main__':
+    main()
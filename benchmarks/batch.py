@@ -0,0 +1,70 @@
+"""Throughput of /generate/batch planning vs. worker count.
+
+    python -m benchmarks.batch --queries 2000
+    python -m benchmarks.batch --workers 1 2 4 --chunk-size 64
+"""
+import argparse
+import os
+import time
+
+import batch
+from benchmarks.corpus import QUERIES
+
+
+def make_queries(count):
+    """Distinct queries, so deduplication does not hide the planning cost."""
+    return [f"{QUERIES[i % len(QUERIES)]} for person {i}" for i in range(count)]
+
+
+def sequential_qps(queries):
+    """Queries per second planning one query at a time in this process."""
+    import milestone_generator as mg
+    mg.generate_plan(queries[0])
+    start = time.perf_counter()
+    for query in queries:
+        mg.generate_plan(query)
+    return len(queries) / (time.perf_counter() - start)
+
+
+def batch_qps(queries, workers, chunk_size):
+    """Queries per second through a warm pool of ``workers`` processes."""
+    executor = batch.create_executor(workers)
+    try:
+        # Warm every worker before timing
+        list(batch.iter_batch_results(queries[:workers * chunk_size], executor, chunk_size))
+        start = time.perf_counter()
+        for item in batch.iter_batch_results(queries, executor, chunk_size):
+            if 'error' in item:
+                raise RuntimeError(item['error'])
+        return len(queries) / (time.perf_counter() - start)
+    finally:
+        executor.shutdown()
+
+
+def default_workers():
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers())
+    parser.add_argument('--chunk-size', type=int, default=batch.BATCH_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    queries = make_queries(args.queries)
+    baseline = sequential_qps(queries)
+    print(f"{'sequential':<12} {baseline:>10.1f} q/s")
+    for workers in args.workers:
+        qps = batch_qps(queries, workers, args.chunk_size)
+        print(f"{f'{workers} workers':<12} {qps:>10.1f} q/s  {qps / baseline:>5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Content-type classification of 100k queries: substring scan vs. weighted scoring.
+
+    python -m benchmarks.classifier --queries 100000
+
+Times the old first-match substring scan, the shared classifier one query
+at a time, and the same classifier on the whole batch. Also reports how
+often the old scan and the classifier disagree, with a few examples.
+"""
+import argparse
+import random
+import time
+
+from content_classifier import content_classifier
+
+# The first-match substring lists the classifier replaced
+LEGACY_KEYWORDS = (
+    ('workout', ('workout', 'fitness', 'exercise', 'training', 'gym')),
+    ('study', ('study', 'learn', 'practice', 'education', 'course', 'ielts', 'coding')),
+    ('meal', ('diet', 'meal', 'food', 'nutrition', 'protein', 'vegetarian')),
+    ('finance', ('budget', 'savings', 'financial', 'money', 'finance'))
+)
+
+OPENERS = ["Create a", "Build a", "Plan my", "Help me with a", "I need a", "Make a"]
+SPANS = ["week", "month", "year", "daily", "3-month", "12-week", "two week"]
+SUBJECTS = [
+    "workout routine", "gym schedule", "protein rich diet", "meal prep", "study schedule for IELTS",
+    "coding practice", "savings strategy", "budget", "guitar practice", "gymnastics training",
+    "seafood cooking course", "money management", "half marathon training", "vegan nutrition",
+    "exam revision", "garden", "reading list", "debt payoff", "strength and cardio", "language learning"
+]
+ENDINGS = ["", " for beginners", " with weekends off", ", of course", " to stay on track", " plan"]
+
+
+def make_queries(count, seed=0):
+    rng = random.Random(seed)
+    return [f"{rng.choice(OPENERS)} {rng.choice(SPANS)} {rng.choice(SUBJECTS)}{rng.choice(ENDINGS)}"
+            for _ in range(count)]
+
+
+def legacy_classify(query):
+    query_lower = query.lower()
+    for content_type, keywords in LEGACY_KEYWORDS:
+        if any(word in query_lower for word in keywords):
+            return content_type
+    return "general"
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', type=int, default=100000)
+    parser.add_argument('--examples', type=int, default=5, help="Disagreements to print")
+    args = parser.parse_args()
+
+    queries = make_queries(args.queries)
+    legacy, legacy_s = timed(lambda: [legacy_classify(query) for query in queries])
+    single, single_s = timed(lambda: [content_classifier.classify(query)[0] for query in queries])
+    (batch, confidences), batch_s = timed(lambda: content_classifier.classify_batch(queries))
+    assert single == batch, "per-query and batch classification disagree"
+
+    for name, seconds in (('substring scan', legacy_s), ('classifier, per query', single_s),
+                          ('classifier, batch', batch_s)):
+        print(f"{name:<24} {seconds * 1e3:>9.1f} ms {seconds / len(queries) * 1e6:>8.2f} us/query")
+    changed = [(query, old, new) for query, old, new in zip(queries, legacy, batch) if old != new]
+    print(f"mean confidence {confidences.mean():.3f}; "
+          f"{len(changed)} of {len(queries)} queries ({len(changed) / len(queries):.1%}) change type")
+    for query, old, new in list(dict.fromkeys(changed))[:args.examples]:
+        print(f"  {query!r}: {old} -> {new}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Latency and bytes of a full /generate response vs. a 304 for a known ETag.
+
+    python -m benchmarks.conditional --rounds 200
+
+Runs in process through Flask's test client, so the numbers are the
+server's own work without the network.
+"""
+import argparse
+import json
+import time
+
+import milestone_generator as mg
+
+QUERIES = {
+    'week': "Build a week protein rich diet plan",
+    'year': "How can I achieve financial goals in a year?",
+    '3-year daily': "Create a 3-year daily study plan",
+    '3-year daily, page of 100': "Create a 3-year daily study plan"
+}
+
+
+def request_us(client, path, body, headers, rounds):
+    """Mean microseconds per request and the size of the last body."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        response = client.post(path, json=body, headers=headers)
+    return (time.perf_counter() - start) / rounds * 1e6, len(response.data), response.status_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=200)
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    client = mg.create_app().test_client()
+    results = {}
+    for name, query in QUERIES.items():
+        path = '/generate?limit=100' if 'page' in name else '/generate'
+        body = {'query': query}
+        etag = client.post(path, json=body).headers['ETag']
+        for case, headers in (('full', {}), ('304', {'If-None-Match': etag})):
+            us, size, status = request_us(client, path, body, headers, args.rounds)
+            results[f"{name}/{case}"] = {'us': us, 'bytes': size, 'status': status}
+
+    if args.json:
+        print(json.dumps({name: dict(result, us=round(result['us'], 1)) for name, result in results.items()}, indent=2))
+        return
+    print(f"{'case':<35} {'status':>6} {'latency':>11} {'bytes':>9}")
+    for name, result in results.items():
+        print(f"{name:<35} {result['status']:>6} {result['us']:>9.1f}us {result['bytes']:>9}")
+
+
+if __name__ == '__main__':
+    main()
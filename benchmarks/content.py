@@ -0,0 +1,63 @@
+"""Per-entry cost of building plan content (create_progressive_content / validate_and_fill_content).
+
+    python -m benchmarks.content --rounds 200
+    python -m benchmarks.content --json > content.json
+"""
+import argparse
+import json
+import time
+
+import milestone_generator as mg
+
+CONTENT_TYPES = ['study', 'workout', 'meal', 'finance', 'general']
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June',
+          'July', 'August', 'September', 'October', 'November', 'December']
+
+# Arguments create_entries passes per period: (entry count, period names)
+PERIOD_ARGS = {
+    'week': (7, [''] * 7),
+    'month': (4, [''] * 4),
+    'year': (12, MONTHS)
+}
+
+
+def per_entry_us(content_type, period, rounds):
+    """Mean microseconds to build one entry's description."""
+    total, names = PERIOD_ARGS[period]
+    initial_values = mg.get_initial_values(content_type)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for i, name in enumerate(names):
+            mg.create_progressive_content(content_type, i + 1, total, initial_values, name)
+    return (time.perf_counter() - start) / (rounds * total) * 1e6
+
+
+def fill_us(content_type, rounds):
+    """Mean microseconds for validate_and_fill_content on an empty entry."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        mg.validate_and_fill_content({"description": {}}, content_type)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=200)
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    results = {}
+    for content_type in CONTENT_TYPES:
+        for period in PERIOD_ARGS:
+            results[f"create_progressive_content/{content_type}/{period}"] = per_entry_us(content_type, period, args.rounds)
+        results[f"validate_and_fill_content/{content_type}"] = fill_us(content_type, args.rounds * 10)
+
+    if args.json:
+        print(json.dumps({name: round(value, 3) for name, value in results.items()}, indent=2))
+        return
+    for name, value in results.items():
+        print(f"{name:<50} {value:>8.2f}us")
+
+
+if __name__ == '__main__':
+    main()
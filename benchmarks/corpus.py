@@ -0,0 +1,31 @@
+"""Fixed query corpus shared by the benchmark scripts."""
+
+# Queries from test_planner.py, temp.py and the README examples
+QUERIES = [
+    "Design a week-long home workout routine",
+    "Create a month-long fitness plan",
+    "Plan a year of fitness goals and milestones",
+    "Make a daily IELTS study schedule",
+    "Plan a week of coding practice",
+    "Design a year-long learning roadmap",
+    "Create a weekly budget plan",
+    "Plan monthly savings strategy",
+    "Make a yearly financial planning strategy",
+    "Plan tomorrow's workout",
+    "Create a daily study plan",
+    "Create a 12-month career development plan",
+    "Plan a year of personal growth goals",
+    "Design a yearly business strategy",
+    "create a month plan to loose belly fat ",
+    "create a monthly financial savings plan with $1000 budget",
+    "design a weekly workout routine for beginners",
+    "make a weekly habit building plan for early morning routine",
+    "plan a yearly career development roadmap for software engineer",
+    "Build a week protein rich diet plan",
+    "How can I achieve financial goals in a year?",
+    "Create a month-long workout routine",
+    "Plan my daily study schedule for IELTS",
+    "Build a 7-day protein rich diet plan for muscle gain",
+    "Create a month-long workout routine for weight loss",
+    "Plan a year-long financial savings strategy",
+]
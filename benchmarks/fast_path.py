@@ -0,0 +1,81 @@
+"""Parity and speed of the keyword fast path against the NLTK analysis path.
+
+Exits non-zero if the two paths disagree on any non-ambiguous query:
+
+    python -m benchmarks.fast_path --rounds 20
+"""
+import argparse
+import sys
+import time
+
+import milestone_generator as mg
+from benchmarks.corpus import QUERIES
+from fast_path import fast_analyze
+from query_analysis import QueryAnalysis
+
+# Extra queries exercising punctuation, clitics and numbers on top of the shared corpus
+PARITY_QUERIES = QUERIES + [
+    "Plan tomorrow's meals",
+    "I don't have time, plan a week",
+    "Save $1,000 in 6 months",
+    "Give me a 30 day plan.",
+    "annual review, then a weekly check-in",
+    "Seven day detox",
+    "a thirty-day challenge",
+    "Plan my weekend!",
+    "Study 1.5 hours daily",
+    "Someone's yearly goals",
+]
+
+
+def nltk_answer(query):
+    """Period, duration and content type as decided by the NLTK path."""
+    analysis = QueryAnalysis.of(query)
+    cleaned = mg.clean_query(analysis)
+    return mg.detect_time_period(analysis), mg.detect_duration(analysis), mg.detect_content_type(cleaned)
+
+
+def mean_us(func, queries, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            func(query)
+    return (time.perf_counter() - start) / (rounds * len(queries)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    mismatches = []
+    ambiguous = 0
+    for query in PARITY_QUERIES:
+        fast = fast_analyze(query)
+        if fast.ambiguous:
+            ambiguous += 1
+            continue
+        expected = nltk_answer(query)
+        if (fast.period, fast.duration, fast.content_type) != expected:
+            mismatches.append((query, fast, expected))
+
+    print(f"Parity: {len(PARITY_QUERIES)} queries, {ambiguous} ambiguous, {len(mismatches)} mismatches")
+    for query, fast, expected in mismatches:
+        print(f"  {query!r}: fast={fast[:3]} nltk={expected}")
+
+    # Full NLTK path includes the tagging and chunking that analyze_query does
+    def nltk_path(query):
+        analysis = QueryAnalysis(query)
+        mg.analyze_query(analysis)
+        nltk_answer(analysis)
+
+    nltk_path(QUERIES[0])
+    fast_us = mean_us(fast_analyze, QUERIES, args.rounds)
+    nltk_us = mean_us(nltk_path, QUERIES, args.rounds)
+    print(f"Fast path: {fast_us:.1f}us/query, NLTK path: {nltk_us:.1f}us/query ({nltk_us / fast_us:.1f}x)")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
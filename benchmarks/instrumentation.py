@@ -0,0 +1,94 @@
+"""Per-call overhead of the @timed stage instrumentation.
+
+    python -m benchmarks.instrumentation --budget-us 3
+
+Compares a wrapped and a bare no-op of each kind (function, generator and
+coroutine) outside and inside a request. Exits 1 if any overhead exceeds
+the budget.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from metrics import Metrics, finish_request, start_request, timed
+
+
+def noop(value):
+    return value
+
+
+def noop_items(count):
+    yield from range(count)
+
+
+async def noop_async(value):
+    return value
+
+
+def per_call_us(func, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def per_item_us(func, calls, items=10):
+    start = time.perf_counter()
+    for _ in range(calls // items):
+        for _ in func(items):
+            pass
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def per_await_us(func, calls):
+    async def drive():
+        start = time.perf_counter()
+        for i in range(calls):
+            await func(i)
+        return (time.perf_counter() - start) / calls * 1e6
+    return asyncio.run(drive())
+
+
+def measure(calls, repeat):
+    """Return {case: overhead in microseconds}, the best of ``repeat`` runs of each side."""
+    registry = Metrics()
+    cases = {
+        'function': (per_call_us, noop),
+        'generator (per item)': (per_item_us, noop_items),
+        'coroutine': (per_await_us, noop_async)
+    }
+    overheads = {}
+    for name, (runner, func) in cases.items():
+        wrapped = timed('bench', registry)(func)
+        bare = min(runner(func, calls) for _ in range(repeat))
+        timed_us = min(runner(wrapped, calls) for _ in range(repeat))
+        overheads[name] = (bare, timed_us, timed_us - bare)
+    return overheads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-us', type=float, default=3.0, help="Largest acceptable overhead per call")
+    args = parser.parse_args()
+
+    results = {'outside a request': measure(args.calls, args.repeat)}
+    start_request()
+    results['inside a request'] = measure(args.calls, args.repeat)
+    finish_request()
+
+    over_budget = False
+    print(f"{'case':<40} {'bare':>9} {'timed':>9} {'overhead':>9}")
+    for context, overheads in results.items():
+        for name, (bare, timed_us, overhead) in overheads.items():
+            flag = '  OVER BUDGET' if overhead > args.budget_us else ''
+            over_budget = over_budget or bool(flag)
+            print(f"{name + ', ' + context:<40} {bare:>7.3f}us {timed_us:>7.3f}us {overhead:>7.3f}us{flag}")
+    if over_budget:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
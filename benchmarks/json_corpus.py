@@ -0,0 +1,88 @@
+"""Malformed model responses and the values they should repair to.
+
+Each sample is (name, raw response text, expected parsed value).
+"""
+
+PLAN = {
+    "title": "Morning Run Plan",
+    "description": "Build endurance gradually",
+    "metrics": ["Distance per run", "Average pace"],
+    "tips": ["Warm up first", "Stay hydrated"]
+}
+
+SAMPLES = [
+    ("valid",
+     '{"title": "Morning Run Plan", "description": "Build endurance gradually", '
+     '"metrics": ["Distance per run", "Average pace"], "tips": ["Warm up first", "Stay hydrated"]}',
+     PLAN),
+    ("code_fence",
+     '```json\n{"title": "Morning Run Plan", "description": "Build endurance gradually",\n'
+     '"metrics": ["Distance per run", "Average pace"], "tips": ["Warm up first", "Stay hydrated"]}\n```',
+     PLAN),
+    ("prose_around",
+     'Here is your plan:\n{"title": "Morning Run Plan", "description": "Build endurance gradually", '
+     '"metrics": ["Distance per run", "Average pace"], "tips": ["Warm up first", "Stay hydrated"]}\nGood luck!',
+     PLAN),
+    ("trailing_commas",
+     '{"title": "Morning Run Plan", "description": "Build endurance gradually", '
+     '"metrics": ["Distance per run", "Average pace",], "tips": ["Warm up first", "Stay hydrated",],}',
+     PLAN),
+    ("unquoted_keys",
+     '{title: "Morning Run Plan", description: "Build endurance gradually", '
+     'metrics: ["Distance per run", "Average pace"], tips: ["Warm up first", "Stay hydrated"]}',
+     PLAN),
+    ("single_quotes",
+     "{'title': 'Morning Run Plan', 'description': 'Build endurance gradually', "
+     "'metrics': ['Distance per run', 'Average pace'], 'tips': ['Warm up first', 'Stay hydrated']}",
+     PLAN),
+    ("unquoted_values",
+     '{"title": Morning Run Plan, "description": Build endurance gradually, '
+     '"metrics": ["Distance per run", "Average pace"], "tips": ["Warm up first", "Stay hydrated"]}',
+     PLAN),
+    ("duplicate_commas",
+     '{"title": "Morning Run Plan",, "description": "Build endurance gradually", '
+     '"metrics": [, "Distance per run", "Average pace"], "tips": ["Warm up first",, "Stay hydrated"]}',
+     PLAN),
+    ("apostrophe_in_string",
+     '{"title": "Today\'s Run", "tips": ["Don\'t skip the warm-up", "Keep a steady pace"]}',
+     {"title": "Today's Run", "tips": ["Don't skip the warm-up", "Keep a steady pace"]}),
+    ("apostrophe_in_single_quotes",
+     "{'title': 'Today's Run', 'tips': ['Don't skip the warm-up']}",
+     {"title": "Today's Run", "tips": ["Don't skip the warm-up"]}),
+    ("raw_newlines",
+     '{"title": "Morning Run Plan",\n"description": "Build endurance\ngradually"}',
+     {"title": "Morning Run Plan", "description": "Build endurance\ngradually"}),
+    ("comments",
+     '{\n  "title": "Morning Run Plan", // short title\n  /* kept brief */ "tips": ["Warm up first"]\n}',
+     {"title": "Morning Run Plan", "tips": ["Warm up first"]}),
+    ("python_literals",
+     '{"title": "Morning Run Plan", "rest_day": True, "notes": None}',
+     {"title": "Morning Run Plan", "rest_day": True, "notes": None}),
+    ("missing_commas",
+     '{"title": "Morning Run Plan"\n"tips": ["Warm up first"\n"Stay hydrated"]}',
+     {"title": "Morning Run Plan", "tips": ["Warm up first", "Stay hydrated"]}),
+    ("truncated_string",
+     '{"title": "Morning Run Plan", "tips": ["Warm up first", "Stay hydr',
+     {"title": "Morning Run Plan", "tips": ["Warm up first", "Stay hydr"]}),
+    ("truncated_after_key",
+     '{"title": "Morning Run Plan", "tips": ["Warm up first"], "metrics":',
+     {"title": "Morning Run Plan", "tips": ["Warm up first"], "metrics": None}),
+    ("truncated_nested",
+     '{"title": "Morning Run Plan", "content": {"days": [{"day": "Monday", "focus": "Easy run"}, {"day": "Tue',
+     {"title": "Morning Run Plan", "content": {"days": [{"day": "Monday", "focus": "Easy run"}, {"day": "Tue"}]}}),
+    ("inner_quotes",
+     '{"title": "The "couch to 5k" plan", "tips": ["Warm up first"]}',
+     {"title": 'The "couch to 5k" plan', "tips": ["Warm up first"]}),
+    ("numbers_and_units",
+     '{"distance_km": 5, "pace": 6.5, "duration": 30 minutes}',
+     {"distance_km": 5, "pace": 6.5, "duration": "30 minutes"}),
+    ("mismatched_closer",
+     '{"title": "Morning Run Plan", "tips": ["Warm up first", "Stay hydrated"}',
+     {"title": "Morning Run Plan", "tips": ["Warm up first", "Stay hydrated"]}),
+    ("missing_braces",
+     '"title": "Morning Run Plan", "tips": ["Warm up first"]',
+     {"title": "Morning Run Plan", "tips": ["Warm up first"]}),
+    ("escaped_quotes",
+     '{"title": "Say \\"go\\" at the start", "tips": ["Warm up first"]}',
+     {"title": 'Say "go" at the start', "tips": ["Warm up first"]}),
+]
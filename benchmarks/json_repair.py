@@ -0,0 +1,133 @@
+"""Repair coverage and worst-case scaling of repair_json vs. the old regex chain.
+
+    python -m benchmarks.json_repair
+    python -m benchmarks.json_repair --size 100000 --json
+
+Exits 1 if repair_json repairs fewer corpus samples than the old chain, or
+if its time on an adversarial payload grows clearly faster than the size.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+
+from json_repair import repair_json
+from benchmarks.json_corpus import SAMPLES
+
+
+def legacy_parse(text):
+    """The preprocessing and aggressive_json_fix chain parse_plan_chunk used to run."""
+    text = text.strip()
+    text = text.replace('```json', '').replace('```', '').strip()
+    text = text.replace('\n', ' ').replace('\r', ' ')
+    if not text.startswith('{'): text = '{' + text
+    if not text.endswith('}'): text = text + '}'
+    text = re.sub(r'^[^{]*{', '{', text)
+    text = re.sub(r'}[^}]*$', '}', text)
+    text = text.replace("'", '"')
+    text = re.sub(r'(?<!\\)"`|`"', '"', text)
+    text = re.sub(r'([{,])\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:', r'\1"\2":', text)
+    text = re.sub(r',(\s*[}\]])', r'\1', text)
+    text = re.sub(r':\s*([a-zA-Z][a-zA-Z0-9_\s-]*[a-zA-Z0-9])([,}\]])', r':"\1"\2', text)
+    text = re.sub(r',\s*,', ',', text)
+    text = re.sub(r'{\s*,', '{', text)
+    text = re.sub(r'\[\s*,', '[', text)
+    return json.loads(text)
+
+
+def repaired_parse(text):
+    return json.loads(repair_json(text))
+
+
+def coverage(parse):
+    """Names of the corpus samples ``parse`` turns into the expected value."""
+    repaired = set()
+    for name, text, expected in SAMPLES:
+        try:
+            if parse(text) == expected:
+                repaired.add(name)
+        except ValueError:
+            pass
+    return repaired
+
+
+# Malformed payloads aimed at backtracking and repeated rescans
+ADVERSARIAL = {
+    'unquoted_value': lambda n: '{"k": ' + 'a ' * (n // 2),
+    'unquoted_colons': lambda n: '{"k": ' + 'a: ' * (n // 3),
+    'unterminated_string': lambda n: '{"k": "' + "it's " * (n // 5),
+    'stray_quotes': lambda n: '{"k": "' + '" a' * (n // 3),
+    'quote_whitespace': lambda n: "['" + ("' " + ' ' * 50) * (n // 52),
+    'commas': lambda n: '{' + ',' * n,
+    'colons': lambda n: '{' + ':' * n,
+    'backslashes': lambda n: '{"k": "' + '\\' * n,
+    'open_comments': lambda n: '{' + '/*' * (n // 2),
+    'bare_keys': lambda n: '{' + 'k' * n,
+    'stray_closers': lambda n: '{"k": 1' + ']' * n,
+    'many_items': lambda n: '[' + '[1],' * (n // 4),
+    'spaces_then_colon': lambda n: '{"k":' + ' ' * n + 'a',
+}
+
+
+def best_time(func, text, rounds):
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        try:
+            func(text)
+        except ValueError:
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=100_000, help="Adversarial payload size in bytes")
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    legacy_repaired = coverage(legacy_parse)
+    repaired = coverage(repaired_parse)
+
+    scaling = {}
+    for name, make in ADVERSARIAL.items():
+        small, large = make(args.size // 4), make(args.size)
+        result = {}
+        for label, func in (('legacy', legacy_parse), ('repair_json', repaired_parse)):
+            small_time = best_time(func, small, args.rounds)
+            large_time = best_time(func, large, args.rounds)
+            result[label] = {'ms': large_time * 1e3, 'growth': large_time / max(small_time, 1e-9)}
+        scaling[name] = result
+
+    # 4x the input should cost about 4x the time; allow noise, not 16x
+    superlinear = [name for name, result in scaling.items() if result['repair_json']['growth'] > 8]
+    regressions = sorted(legacy_repaired - repaired)
+
+    if args.json:
+        print(json.dumps({
+            'corpus': {'samples': len(SAMPLES), 'legacy': len(legacy_repaired), 'repair_json': len(repaired),
+                       'regressions': regressions},
+            'adversarial': scaling
+        }, indent=2))
+    else:
+        print(f"corpus: legacy repaired {len(legacy_repaired)}/{len(SAMPLES)}, "
+              f"repair_json repaired {len(repaired)}/{len(SAMPLES)}")
+        for name in regressions:
+            print(f"  regression: {name}")
+        print(f"\nadversarial payloads, {args.size} bytes (growth = time at size / time at size/4)")
+        for name, result in scaling.items():
+            legacy, new = result['legacy'], result['repair_json']
+            print(f"{name:<22} legacy {legacy['ms']:>9.2f}ms x{legacy['growth']:<5.1f} "
+                  f"repair_json {new['ms']:>9.2f}ms x{new['growth']:.1f}")
+        for name in superlinear:
+            print(f"  super-linear: {name}")
+
+    if regressions or superlinear or len(repaired) < len(legacy_repaired):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Latency of enrichment calls with the model response cache off, cold, warm and replayed.
+
+    python -m benchmarks.llm_cache --prompts 20 --repeats 5 --latency 0.2
+
+Each pass sends every prompt ``--repeats`` times through generate_plan_chunk
+against a FakeModel with a fixed latency standing in for Gemini. ``record``
+fills a fresh cache file, ``on`` is then served from it, and ``replay`` must
+reproduce the recorded chunks exactly without calling the model (exits 1
+otherwise).
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault('LLM_BACKEND', 'fake')
+
+import milestone_generator as mg
+from llm_cache import CachedModel, ResponseCache, cache_key
+from model_backend import FakeModel
+from resilience import CircuitBreaker, RetryPolicy
+
+SUBJECTS = ["workout routine", "IELTS study", "vegetarian meal", "savings budget", "guitar practice"]
+
+
+def run(model, prompts, repeats):
+    """Return (chunks of the last repeat, mean ms per call, model calls made)."""
+    mg.model = model
+    mg.llm_retry = RetryPolicy(base_delay=0.0)
+    mg.llm_breaker = CircuitBreaker()
+    fake = model.model if isinstance(model, CachedModel) else model
+    start = time.perf_counter()
+    for _ in range(repeats):
+        chunks = [mg.generate_plan_chunk(prompt) for prompt in prompts]
+    elapsed = time.perf_counter() - start
+    return chunks, elapsed / (len(prompts) * repeats) * 1e3, fake.get_stats()['calls']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--prompts', type=int, default=20)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.2)
+    args = parser.parse_args()
+
+    prompts = [f"Create a {i % 12 + 1} month {SUBJECTS[i % len(SUBJECTS)]} plan, take {i}"
+               for i in range(args.prompts)]
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResponseCache(os.path.join(directory, 'llm_cache.sqlite3'))
+        print(f"{'mode':<8} {'per call':>10} {'model calls':>12}")
+        results = {}
+        for mode in ('off', 'record', 'on', 'replay'):
+            fake = FakeModel(latency=args.latency)
+            model = fake if mode == 'off' else CachedModel(fake, cache, 'fake', mode)
+            # record refreshes every response, so it runs once like a recording session
+            repeats = 1 if mode == 'record' else args.repeats
+            results[mode], ms, calls = run(model, prompts, repeats)
+            print(f"{mode:<8} {ms:>8.2f}ms {calls:>12}")
+
+        if results['replay'] != results['record']:
+            raise SystemExit("replayed chunks differ from the recorded ones")
+        print(f"cache: {cache.get_stats()}")
+
+    rounds = 10000
+    start = time.perf_counter()
+    for _ in range(rounds):
+        cache_key('fake', prompts[0], mg.chunk_generation_config(1))
+    print(f"cache_key: {(time.perf_counter() - start) / rounds * 1e6:.1f}us per prompt")
+
+
+if __name__ == '__main__':
+    main()
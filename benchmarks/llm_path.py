@@ -0,0 +1,152 @@
+"""Retry, fallback and concurrency behaviour of the LLM path against the fake model.
+
+    python -m benchmarks.llm_path --calls 50
+    python -m benchmarks.llm_path --scenario flaky --json
+
+Every scenario uses a seeded FakeModel, so sequential results are
+reproducible run to run.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault('LLM_BACKEND', 'fake')
+
+import milestone_generator as mg
+from model_backend import FakeModel
+from resilience import CircuitBreaker, RetryPolicy
+
+SCENARIOS = {
+    'clean': {},
+    'fenced': {'fence_rate': 0.5},
+    'single_quoted': {'single_quote_rate': 0.3},
+    'truncated': {'truncate_rate': 0.3},
+    'flaky': {'error_rate': 0.2, 'errors': ('connection', 'unavailable')},
+    'slow': {'latency': 'lognormal:0.05,0.5'},
+    'outage': {'error_rate': 1.0, 'errors': ('unavailable',)},
+}
+
+QUERY = "Create a month-long workout routine for weight loss"
+
+
+def is_fallback(chunk):
+    return chunk.get('description', '').startswith('Structured ')
+
+
+def reset(model, retry_delay):
+    """Point the planner at ``model`` with fresh retry and breaker state."""
+    mg.model = model
+    mg.model_runner.model = model
+    mg.llm_retry = RetryPolicy(max_attempts=mg.llm_retry.max_attempts, base_delay=retry_delay,
+                               max_delay=retry_delay * 8)
+    mg.llm_breaker = CircuitBreaker(failure_threshold=mg.llm_breaker.failure_threshold,
+                                    reset_timeout=mg.llm_breaker.reset_timeout)
+
+
+def run_chunks(calls):
+    """Sequential generate_plan_chunk calls: latency and fallback count."""
+    latencies, fallbacks = [], 0
+    for i in range(calls):
+        start = time.perf_counter()
+        chunk = mg.generate_plan_chunk(f"{QUERY} #{i}")
+        latencies.append(time.perf_counter() - start)
+        fallbacks += is_fallback(chunk)
+    return latencies, fallbacks
+
+
+def run_milestone_plans(model, calls):
+    """Sequential temp.generate_milestone_plan calls: latency and error count."""
+    try:
+        import temp
+    except ImportError as e:
+        return None, f"skipped ({e})"
+    temp.model = model
+    latencies, errors = [], 0
+    for _ in range(calls):
+        start = time.perf_counter()
+        plan = temp.generate_milestone_plan(QUERY)
+        latencies.append(time.perf_counter() - start)
+        errors += 'error' in plan
+    return latencies, errors
+
+
+def run_concurrent(calls):
+    """All enrichments at once through the bounded async runner: wall time."""
+    plan = mg.generate_plan(QUERY)
+
+    async def enrich_all():
+        import asyncio
+        return await asyncio.gather(*(mg.enrich_plan(plan, QUERY, 'workout') for _ in range(calls)))
+
+    start = time.perf_counter()
+    results = mg.model_runner.run(enrich_all())
+    elapsed = time.perf_counter() - start
+    fallbacks = sum(1 for result in results if result['enrichment'] is None or is_fallback(result['enrichment']))
+    return elapsed, fallbacks
+
+
+def percentiles(latencies):
+    if not latencies:
+        return {}
+    ordered = sorted(latencies)
+    return {
+        'p50_ms': statistics.median(ordered) * 1e3,
+        'p99_ms': ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)] * 1e3,
+        'max_ms': ordered[-1] * 1e3
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=50)
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), action='append')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--retry-delay', type=float, default=0.01, help="Backoff base delay in seconds")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.scenario or SCENARIOS:
+        options = SCENARIOS[name]
+        result = {}
+
+        reset(FakeModel(seed=args.seed, **options), args.retry_delay)
+        latencies, fallbacks = run_chunks(args.calls)
+        result['generate_plan_chunk'] = dict(percentiles(latencies), fallbacks=fallbacks,
+                                             retry=mg.llm_retry.get_stats(),
+                                             breaker=mg.llm_breaker.get_stats()['state'])
+
+        model = FakeModel(seed=args.seed, **options)
+        latencies, errors = run_milestone_plans(model, args.calls)
+        result['generate_milestone_plan'] = (dict(percentiles(latencies), errors=errors)
+                                             if latencies is not None else errors)
+
+        reset(FakeModel(seed=args.seed, **options), args.retry_delay)
+        elapsed, fallbacks = run_concurrent(args.calls)
+        result['concurrent_enrich'] = {'wall_ms': elapsed * 1e3, 'fallbacks': fallbacks,
+                                       'concurrency': mg.model_runner.concurrency}
+        results[name] = result
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, result in results.items():
+        chunk, milestone, concurrent = (result['generate_plan_chunk'], result['generate_milestone_plan'],
+                                        result['concurrent_enrich'])
+        print(f"{name}")
+        print(f"  generate_plan_chunk      p50 {chunk['p50_ms']:8.2f}ms  p99 {chunk['p99_ms']:8.2f}ms  "
+              f"fallbacks {chunk['fallbacks']}/{args.calls}  retries {chunk['retry']['retries']}  "
+              f"short-circuited {chunk['retry']['short_circuited']}  breaker {chunk['breaker']}")
+        if isinstance(milestone, dict):
+            print(f"  generate_milestone_plan  p50 {milestone['p50_ms']:8.2f}ms  p99 {milestone['p99_ms']:8.2f}ms  "
+                  f"errors {milestone['errors']}/{args.calls}")
+        else:
+            print(f"  generate_milestone_plan  {milestone}")
+        print(f"  concurrent enrich        {concurrent['wall_ms']:8.2f}ms for {args.calls} calls  "
+              f"fallbacks {concurrent['fallbacks']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,302 @@
+"""Open- or closed-loop load generator for a running planning server.
+
+    # Open loop: 50 requests/second for 30 seconds, whatever the server does
+    python -m benchmarks.load --rate 50 --duration 30
+
+    # Closed loop: 16 clients sending back-to-back requests
+    python -m benchmarks.load --concurrency 16 --duration 30 --json run.json
+
+In open-loop mode each request has an intended start time on a fixed
+schedule. Latency is measured from that time, so a stalled server shows up
+as queueing delay instead of silently lowering the offered load.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection, HTTPSConnection
+from urllib.parse import urlsplit
+
+from benchmarks.corpus import QUERIES
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram in the spirit of HdrHistogram.
+
+    Values are microseconds. Each power-of-two range is split into
+    ``2 ** precision_bits`` equal buckets, so every recorded value is
+    kept within about 1% relative error (precision_bits=7), whatever
+    its magnitude.
+    """
+
+    def __init__(self, precision_bits=7):
+        self.precision_bits = precision_bits
+        self.counts = Counter()
+        self.total = 0
+        self.max = 0
+        self.min = None
+        self._lock = threading.Lock()
+
+    def _bucket(self, value):
+        shift = max(value.bit_length() - self.precision_bits - 1, 0)
+        return shift, value >> shift
+
+    def record(self, seconds):
+        value = max(int(seconds * 1e6), 1)
+        with self._lock:
+            self.counts[self._bucket(value)] += 1
+            self.total += 1
+            self.max = max(self.max, value)
+            self.min = value if self.min is None else min(self.min, value)
+
+    def merge(self, other):
+        with self._lock:
+            self.counts.update(other.counts)
+            self.total += other.total
+            self.max = max(self.max, other.max)
+            if other.min is not None:
+                self.min = other.min if self.min is None else min(self.min, other.min)
+
+    def percentile(self, percent):
+        """Return the latency in microseconds at ``percent`` (the bucket's upper edge)."""
+        if not self.total:
+            return 0
+        rank = max(math.ceil(self.total * percent / 100), 1)
+        seen = 0
+        for shift, index in sorted(self.counts, key=lambda bucket: (bucket[1] << bucket[0])):
+            seen += self.counts[(shift, index)]
+            if seen >= rank:
+                return min(((index + 1) << shift) - 1, self.max)
+        return self.max
+
+    def summary(self):
+        """Percentiles, min and max in milliseconds."""
+        summary = {f"p{p:g}": self.percentile(p) / 1e3 for p in PERCENTILES}
+        summary['min'] = (self.min or 0) / 1e3
+        summary['max'] = self.max / 1e3
+        return summary
+
+    def buckets(self):
+        """Non-empty buckets as [lower bound in microseconds, count], for storing with a run."""
+        return [[index << shift, self.counts[(shift, index)]]
+                for shift, index in sorted(self.counts, key=lambda bucket: (bucket[1] << bucket[0]))]
+
+
+class QueryMix:
+    """Weighted random choice of request bodies, reproducible with a seed."""
+
+    def __init__(self, weighted_queries, seed=0, extra=None):
+        self.queries = [query for query, _ in weighted_queries]
+        self.weights = [weight for _, weight in weighted_queries]
+        self.extra = extra or {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=None, seed=0, extra=None):
+        """Read a JSON list of queries or a {query: weight} object; default to the corpus."""
+        if path is None:
+            return cls([(query, 1) for query in QUERIES], seed, extra)
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return cls(list(data.items()), seed, extra)
+        return cls([(query, 1) for query in data], seed, extra)
+
+    def next_body(self):
+        with self._lock:
+            query = self._random.choices(self.queries, self.weights)[0]
+        return json.dumps(dict(self.extra, query=query)).encode()
+
+
+class Client:
+    """Keep-alive HTTP connection per worker thread."""
+
+    def __init__(self, url, timeout):
+        parts = urlsplit(url)
+        self.connection_class = HTTPSConnection if parts.scheme == 'https' else HTTPConnection
+        self.netloc = parts.netloc
+        self.path = parts.path or '/'
+        if parts.query:
+            self.path += '?' + parts.query
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def post(self, body):
+        """Send one request; return the status code after reading the whole body."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self.connection_class(self.netloc, timeout=self.timeout)
+        try:
+            conn.request('POST', self.path, body, {'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            return response.status
+        except Exception:
+            conn.close()
+            self._local.conn = None
+            raise
+
+
+class Recorder:
+    """Outcome counters and latency histograms for one run."""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        self.statuses = Counter()
+        self.errors = Counter()
+        self._lock = threading.Lock()
+
+    def request(self, client, body, intended_start):
+        start = time.perf_counter()
+        try:
+            status = client.post(body)
+        except TimeoutError:
+            outcome = 'timeout'
+        except Exception as e:
+            outcome = type(e).__name__
+        else:
+            outcome = None
+        end = time.perf_counter()
+
+        with self._lock:
+            if outcome is None:
+                self.statuses[status] += 1
+            else:
+                self.errors[outcome] += 1
+        if outcome is None and status < 400:
+            self.latency.record(end - intended_start)
+            self.service_time.record(end - start)
+
+
+def run_open_loop(client, mix, recorder, rate, duration, max_in_flight):
+    """Issue requests on a fixed schedule of ``rate`` per second."""
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    sent = 0
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        while True:
+            intended = start + sent * interval
+            if intended - start >= duration:
+                break
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(recorder.request, client, mix.next_body(), intended)
+            sent += 1
+    return sent, time.perf_counter() - start
+
+
+def run_closed_loop(client, mix, recorder, concurrency, duration):
+    """Run ``concurrency`` clients that each send their next request as soon as one completes."""
+    start = time.perf_counter()
+    deadline = start + duration
+    counts = [0] * concurrency
+
+    def worker(index):
+        while time.perf_counter() < deadline:
+            recorder.request(client, mix.next_body(), time.perf_counter())
+            counts[index] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts), time.perf_counter() - start
+
+
+def run(args, duration, mix):
+    client = Client(args.url, args.timeout)
+    recorder = Recorder()
+    if args.rate:
+        sent, elapsed = run_open_loop(client, mix, recorder, args.rate, duration, args.max_in_flight)
+    else:
+        sent, elapsed = run_closed_loop(client, mix, recorder, args.concurrency, duration)
+    return recorder, sent, elapsed
+
+
+def report(args, recorder, sent, elapsed):
+    completed = sum(recorder.statuses.values())
+    ok = sum(count for status, count in recorder.statuses.items() if status < 400)
+    failed = sent - ok
+    return {
+        'config': {
+            'url': args.url,
+            'mode': 'open' if args.rate else 'closed',
+            'rate': args.rate,
+            'concurrency': None if args.rate else args.concurrency,
+            'duration': args.duration,
+            'timeout': args.timeout,
+            'mix': args.mix or 'benchmarks.corpus',
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S')
+        },
+        'requests': sent,
+        'completed': completed,
+        'throughput_rps': ok / elapsed if elapsed else 0.0,
+        'error_rate': failed / sent if sent else 0.0,
+        'timeouts': recorder.errors.get('timeout', 0),
+        'statuses': {str(status): count for status, count in sorted(recorder.statuses.items())},
+        'errors': dict(recorder.errors),
+        'latency_ms': recorder.latency.summary(),
+        'service_time_ms': recorder.service_time.summary(),
+        'histogram_us': recorder.latency.buckets()
+    }
+
+
+def print_report(result):
+    config = result['config']
+    mode = f"open loop at {config['rate']} req/s" if config['mode'] == 'open' else f"{config['concurrency']} clients"
+    print(f"{config['url']}: {mode} for {config['duration']}s")
+    print(f"requests {result['requests']}  completed {result['completed']}  "
+          f"throughput {result['throughput_rps']:.1f} req/s")
+    print(f"error rate {result['error_rate']:.2%}  timeouts {result['timeouts']}  statuses {result['statuses']}")
+    if result['errors']:
+        print(f"errors {result['errors']}")
+    for label, key in (('latency', 'latency_ms'), ('service', 'service_time_ms')):
+        summary = result[key]
+        print(f"{label:<8} " + '  '.join(f"{name} {value:.1f}ms" for name, value in summary.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:5000/generate')
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument('--rate', type=float, help="Open loop: requests per second")
+    load.add_argument('--concurrency', type=int, default=8, help="Closed loop: concurrent clients")
+    parser.add_argument('--duration', type=float, default=30, help="Measured seconds")
+    parser.add_argument('--warmup', type=float, default=5, help="Unmeasured seconds before the run")
+    parser.add_argument('--timeout', type=float, default=30, help="Per-request timeout in seconds")
+    parser.add_argument('--max-in-flight', type=int, default=256, help="Open loop: worker thread cap")
+    parser.add_argument('--mix', help="JSON list of queries or {query: weight}; defaults to the corpus")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--enrich', action='store_true', help="Ask for LLM enrichment")
+    parser.add_argument('--json', metavar='PATH', help="Write the run as JSON ('-' for stdout)")
+    args = parser.parse_args()
+
+    extra = {'enrich': True} if args.enrich else None
+    mix = QueryMix.load(args.mix, args.seed, extra)
+    if args.warmup:
+        run(args, args.warmup, mix)
+    result = report(args, *run(args, args.duration, mix))
+
+    if args.json == '-':
+        json.dump(result, sys.stdout, indent=2)
+        print()
+        return
+    print_report(result)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
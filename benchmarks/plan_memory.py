@@ -0,0 +1,61 @@
+"""Memory held by 1,000 yearly plans as nested dicts vs. frozen __slots__ objects.
+
+    python -m benchmarks.plan_memory --plans 1000
+
+Each plan is decoded from its own JSON, as plans arriving from worker
+processes or the shared cache are, so no two plans share objects. Also
+reports the pickled size of a batch chunk, which is what worker processes
+send back.
+"""
+import argparse
+import gc
+import json
+import pickle
+import tracemalloc
+
+import milestone_generator as mg
+from batch import BATCH_CHUNK_SIZE
+from plan_model import freeze
+
+SUBJECTS = ["workout routine", "IELTS study", "vegetarian meal", "savings budget", "guitar practice"]
+
+
+def retained_bytes(build):
+    """Return (result, bytes still allocated once ``build`` returns)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--plans', type=int, default=1000)
+    args = parser.parse_args()
+
+    documents = [json.dumps(mg.generate_plan(f"Plan a year-long {SUBJECTS[i % len(SUBJECTS)]} plan, take {i}"))
+                 for i in range(args.plans)]
+
+    dicts, dict_bytes = retained_bytes(lambda: [json.loads(document) for document in documents])
+    # One pool for the whole set, as a batch chunk shares one
+    pool = {}
+    frozen, frozen_bytes = retained_bytes(lambda: [freeze(json.loads(document), pool) for document in documents])
+    assert [plan.to_dict() for plan in frozen] == dicts
+
+    print(f"{'representation':<16} {'total':>10} {'per plan':>10}")
+    for name, size in (('dicts', dict_bytes), ('frozen', frozen_bytes)):
+        print(f"{name:<16} {size / 2**20:>8.2f}MB {size / args.plans / 1024:>8.1f}KB")
+    print(f"frozen plans use {frozen_bytes / dict_bytes:.0%} of the memory")
+
+    chunk = BATCH_CHUNK_SIZE
+    dict_pickle = len(pickle.dumps(dicts[:chunk]))
+    frozen_pickle = len(pickle.dumps(frozen[:chunk]))
+    print(f"pickled chunk of {chunk}: {dict_pickle / 1024:.1f}KB as dicts, {frozen_pickle / 1024:.1f}KB frozen")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Numeric series of 1,000-entry plans: per-entry scalar math vs. one vectorized pass.
+
+    python -m benchmarks.progression --entries 1000 --rounds 20
+
+For each content type, times the scalar formulas create_progressive_content
+used to evaluate once per entry, progression() computing every entry's
+values at once, and create_entries building the whole plan.
+"""
+import argparse
+import time
+from datetime import date
+
+import milestone_generator as mg
+from plan_calendar import PlanCalendar
+from progression import CURVES, progression
+
+CONTENT_TYPES = ['study', 'workout', 'meal', 'finance']
+
+
+def scalar_values(content_type, current_period, total_periods, initial_values):
+    """The per-entry arithmetic progression() replaced."""
+    progress = current_period / total_periods
+    if content_type == 'study':
+        return {'progress': progress, 'accuracy': int(70 + (progress * 20))}
+    if content_type == 'workout':
+        return {
+            'progress': progress,
+            'intensity': min(int(progress * 5), 4),
+            'level': 2 if progress > 0.6 else 1 if progress > 0.3 else 0,
+            'minutes': 45 + int(progress * 15),
+            'bpm_low': 110 + int(progress * 40),
+            'bpm_high': 130 + int(progress * 40)
+        }
+    if content_type == 'meal':
+        protein = int(initial_values['protein_target']) + int(10 * progress)
+        return {
+            'progress': progress,
+            'protein': protein,
+            'protein_per_meal': int(protein / 4),
+            'carbs': int(initial_values['carbs_target']) - int(20 * progress),
+            'fats': int(initial_values['fats_target']),
+            'calories': int(initial_values['daily_calories']) + int(100 * progress)
+        }
+    return {
+        'progress': progress,
+        'savings': float(initial_values['monthly_savings'].rstrip('%')) + (5 * progress),
+        'investment': float(initial_values['investment_ratio'].rstrip('%')) + (10 * progress),
+        'expense_reduction': 5 + (5 * progress)
+    }
+
+
+def mean_ms(func, rounds):
+    func()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    total = args.entries
+    calendar = PlanCalendar(now=date.today())
+    print(f"{'case':<30} {'scalar':>10} {'vectorized':>11} {'speedup':>8} {'whole plan':>11}")
+    for content_type in CONTENT_TYPES:
+        initial_values = mg.get_initial_values(content_type)
+        scalar = [scalar_values(content_type, i + 1, total, initial_values) for i in range(total)]
+        if progression(content_type, total, initial_values, curve='linear') != scalar:
+            raise SystemExit(f"{content_type}: vectorized values differ from the scalar formulas")
+
+        scalar_ms = mean_ms(lambda: [scalar_values(content_type, i + 1, total, initial_values)
+                                     for i in range(total)], args.rounds)
+        for curve in CURVES:
+            vector_ms = mean_ms(lambda: progression(content_type, total, initial_values, curve=curve), args.rounds)
+            plan_ms = mean_ms(lambda: mg.create_entries('week', content_type, total, calendar), max(args.rounds // 4, 1))
+            print(f"{content_type + '/' + curve:<30} {scalar_ms:>8.3f}ms {vector_ms:>9.3f}ms "
+                  f"{scalar_ms / vector_ms:>7.1f}x {plan_ms:>9.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
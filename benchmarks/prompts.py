@@ -0,0 +1,54 @@
+"""Size of the enrichment prompt for each plan type, against PROMPT_TOKEN_BUDGET.
+
+    python -m benchmarks.prompts --budget 4000
+
+For each span and content type, generates the plan, renders the prompt the
+model is sent for it and reports its characters, estimated tokens and the
+entries left out to fit the budget. The last columns compare the characters
+of the plan's structure written as indented JSON (as the prompt used to) and
+as compact JSON.
+"""
+import argparse
+import json
+import re
+import time
+from datetime import date
+
+import milestone_generator as mg
+from prompts import compact_json, estimate_tokens, render_chunk_prompt, render_plan_prompt
+
+OMITTED_RE = re.compile(r'\((\d+) more entries follow')
+SPANS = ['1 week', '1 month', '3 months', '1 year', '3 years']
+SUBJECTS = {'study': 'IELTS study', 'workout': 'workout routine', 'meal': 'vegetarian meal',
+            'finance': 'savings budget', 'general': 'guitar practice'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget', type=int, default=4000)
+    args = parser.parse_args()
+
+    today = date.today().strftime("%Y-%m-%d")
+    print(f"{'plan':<28} {'entries':>7} {'chars':>7} {'tokens':>7} {'omitted':>7} "
+          f"{'indented':>9} {'compact':>8}")
+    worst = 0
+    start = time.perf_counter()
+    for span in SPANS:
+        for content_type, subject in SUBJECTS.items():
+            query = f"Create a {span} {subject} plan"
+            plan = mg.generate_plan(query)
+            # The full prompt sent to the model, as enrich_plan builds it
+            prompt = render_plan_prompt(query, plan['period'], content_type, plan, today, args.budget)
+            text = render_chunk_prompt(prompt, args.budget)
+            tokens = estimate_tokens(text)
+            omitted = OMITTED_RE.search(prompt)
+            worst = max(worst, tokens)
+            print(f"{span + ' ' + content_type:<28} {len(plan['entries']):>7} {len(text):>7} {tokens:>7} "
+                  f"{int(omitted.group(1)) if omitted else 0:>7} {len(json.dumps(plan, indent=2)):>9} "
+                  f"{len(compact_json(plan)):>8}")
+    print(f"largest prompt: {worst} tokens of a {args.budget} budget "
+          f"({(time.perf_counter() - start) * 1e3:.0f}ms total)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Payload size and encode time of plan responses per format and compression.
+
+    python -m benchmarks.serialization --rounds 200
+    python -m benchmarks.serialization --json > serialization.json
+
+Plans are generated once per query and reused, as the plan cache does, so
+the fragment cache can hit. Formats whose package is not installed
+(orjson, msgpack, cbor2, brotli) are skipped.
+"""
+import argparse
+import json
+import time
+
+import milestone_generator as mg
+from serialization import CBOR, FORMATS, JSON, MSGPACK, FragmentCache, brotli, compress, orjson, serialize_plan
+
+QUERIES = {
+    'week': "Build a week protein rich diet plan",
+    'month': "Create a month-long workout routine",
+    'year': "How can I achieve financial goals in a year?",
+    'day': "Plan my daily study schedule for IELTS",
+    '3-year daily': "Create a 3-year daily study plan"
+}
+
+
+def stdlib_json(plan):
+    return json.dumps(plan).encode()
+
+
+def encoders():
+    """Return {name: encode(plan) -> bytes} for the installed formats."""
+    cases = {'json (stdlib)': stdlib_json}
+    if orjson is not None:
+        cases['json (orjson)'] = orjson.dumps
+        cases['json (orjson + fragments)'] = lambda plan, cache=FragmentCache(): serialize_plan(plan, JSON, cache)
+    if MSGPACK in FORMATS:
+        cases['msgpack'] = lambda plan, cache=FragmentCache(): serialize_plan(plan, MSGPACK, cache)
+    if CBOR in FORMATS:
+        cases['cbor'] = lambda plan, cache=FragmentCache(): serialize_plan(plan, CBOR, cache)
+    return cases
+
+
+def encode_us(encode, plan, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        encode(plan)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=200)
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    encodings = ['gzip'] + (['br'] if brotli is not None else [])
+    results = {}
+    for period, query in QUERIES.items():
+        plan = mg.generate_plan(query)
+        # Long plans encode slowly; keep the total time per case roughly level
+        rounds = max(args.rounds * 12 // max(len(plan['entries']), 12), 5)
+        for name, encode in encoders().items():
+            body = encode(plan)
+            result = {'us': encode_us(encode, plan, rounds), 'bytes': len(body)}
+            for encoding in encodings:
+                result[f"{encoding}_bytes"] = len(compress(body, encoding))
+            results[f"{period}/{name}"] = result
+
+    if args.json:
+        print(json.dumps({name: {key: round(value, 3) for key, value in result.items()}
+                          for name, result in results.items()}, indent=2))
+        return
+    header = f"{'case':<45} {'encode':>10} {'bytes':>9}" + ''.join(f" {encoding:>9}" for encoding in encodings)
+    print(header)
+    for name, result in results.items():
+        sizes = ''.join(f" {result[f'{encoding}_bytes']:>9}" for encoding in encodings)
+        print(f"{name:<45} {result['us']:>8.1f}us {result['bytes']:>9}{sizes}")
+
+
+if __name__ == '__main__':
+    main()
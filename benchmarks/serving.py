@@ -0,0 +1,151 @@
+"""Per-worker memory and cold-start latency of gunicorn with and without preloading.
+
+    python -m benchmarks.serving --workers 4
+    python -m benchmarks.serving --workers 8 --json serving.json
+
+Each scenario starts a fresh gunicorn with gunicorn.conf.py and
+GUNICORN_PRELOAD set to 0 (every worker imports the app and loads NLTK
+itself) or 1 (the master loads everything once, then forks). Memory is
+read from /proc/<pid>/smaps_rollup, so the benchmark needs Linux. PSS and
+private memory show what each worker really costs; RSS counts shared
+pages in every worker.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'no preload (before)': '0',
+    'preload (after)': '1'
+}
+
+QUERY = "Create a month-long workout routine for weight loss"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def request(port, method, path, body=None, timeout=60):
+    """Send one request on a fresh connection; return (status, seconds)."""
+    start = time.perf_counter()
+    conn = HTTPConnection('127.0.0.1', port, timeout=timeout)
+    try:
+        conn.request(method, path, body, {'Content-Type': 'application/json'} if body else {})
+        response = conn.getresponse()
+        response.read()
+        return response.status, time.perf_counter() - start
+    finally:
+        conn.close()
+
+
+def wait_ready(port, process, timeout):
+    """Poll /sample until the server answers; return the seconds waited."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {process.returncode}")
+        try:
+            status, _ = request(port, 'GET', '/sample', timeout=1)
+            if status == 200:
+                return time.perf_counter() - start
+        except OSError:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError(f"gunicorn not ready after {timeout}s")
+
+
+def worker_pids(master_pid):
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def memory(pid):
+    """Return Rss, Pss and private (Private_Clean + Private_Dirty) memory in MiB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            if value.strip().endswith('kB'):
+                fields[name] = int(value.split()[0]) / 1024
+    return {
+        'rss_mb': fields.get('Rss', 0.0),
+        'pss_mb': fields.get('Pss', 0.0),
+        'private_mb': fields.get('Private_Clean', 0.0) + fields.get('Private_Dirty', 0.0)
+    }
+
+
+def run_scenario(preload, args):
+    port = free_port()
+    env = dict(os.environ, GUNICORN_PRELOAD=preload, LLM_BACKEND=os.getenv('LLM_BACKEND', 'fake'),
+               PLAN_CACHE_PATH='')
+    command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f"127.0.0.1:{port}",
+               '--workers', str(args.workers), args.app]
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    try:
+        ready = wait_ready(port, process, args.timeout)
+        body = json.dumps({'query': QUERY}).encode()
+
+        # First requests after start-up: as many at once as there are workers
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            first = list(pool.map(lambda _: request(port, 'POST', '/generate', body), range(args.workers)))
+        # Wait until every worker has booted before reading its memory
+        while len(worker_pids(process.pid)) < args.workers:
+            time.sleep(0.05)
+        for _ in range(args.warm_requests):
+            request(port, 'POST', '/generate', body)
+
+        workers = [memory(pid) for pid in worker_pids(process.pid)]
+        return {
+            'ready_ms': ready * 1e3,
+            'since_launch_ms': (time.perf_counter() - start) * 1e3,
+            'first_request_ms': statistics.median(seconds for _, seconds in first) * 1e3,
+            'first_request_max_ms': max(seconds for _, seconds in first) * 1e3,
+            'errors': sum(status != 200 for status, _ in first),
+            'master': memory(process.pid),
+            'worker': {key: statistics.mean(worker[key] for worker in workers) for key in workers[0]},
+            'total_pss_mb': memory(process.pid)['pss_mb'] + sum(worker['pss_mb'] for worker in workers)
+        }
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--app', default='wsgi:app', help="WSGI application to serve")
+    parser.add_argument('--warm-requests', type=int, default=20, help="Requests sent before measuring memory")
+    parser.add_argument('--timeout', type=float, default=120, help="Seconds to wait for the server")
+    parser.add_argument('--json', metavar='PATH', help="Write the results as JSON")
+    args = parser.parse_args()
+
+    results = {name: run_scenario(preload, args) for name, preload in SCENARIOS.items()}
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    print(f"{args.workers} workers, memory in MiB per worker (mean)")
+    print(f"{'scenario':<22} {'ready':>9} {'1st req':>9} {'RSS':>7} {'PSS':>7} {'private':>8} {'total PSS':>10}")
+    for name, result in results.items():
+        worker = result['worker']
+        print(f"{name:<22} {result['ready_ms']:>7.0f}ms {result['first_request_ms']:>7.0f}ms "
+              f"{worker['rss_mb']:>7.1f} {worker['pss_mb']:>7.1f} {worker['private_mb']:>8.1f} "
+              f"{result['total_pss_mb']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Compare startup cost of the old nltk.download calls with the offline manifest check.
+
+Each scenario runs in a fresh interpreter so nothing is cached between runs:
+
+    python -m benchmarks.startup --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only the timed step is measured; interpreter start-up and `import nltk` are excluded
+SCENARIOS = {
+    'nltk.download (before)': """
+import time
+import nltk
+start = time.perf_counter()
+for resource in ['punkt', 'averaged_perceptron_tagger', 'maxent_ne_chunker', 'words', 'stopwords']:
+    nltk.download(resource, quiet=True)
+print(time.perf_counter() - start)
+""",
+    'manifest check (after)': """
+import time
+import nltk
+start = time.perf_counter()
+from nltk_resources import ensure_resources
+ensure_resources()
+print(time.perf_counter() - start)
+""",
+    'manifest check, full checksums': """
+import time
+start = time.perf_counter()
+from nltk_resources import verify_data
+verify_data(full=True)
+print(time.perf_counter() - start)
+"""
+}
+
+
+def run_scenario(code, runs, timeout):
+    """Run a scenario in fresh interpreters and return the timings in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        try:
+            result = subprocess.run(
+                [sys.executable, '-c', code],
+                cwd=BASE_DIR, capture_output=True, text=True, timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            return {'error': f"timed out after {timeout}s"}
+        if result.returncode != 0:
+            return {'error': result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'failed'}
+        timings.append(float(result.stdout.strip().splitlines()[-1]) * 1000)
+    return {
+        'runs': runs,
+        'median_ms': round(statistics.median(timings), 2),
+        'min_ms': round(min(timings), 2),
+        'max_ms': round(max(timings), 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=120.0, help="Per-run timeout in seconds")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    results = {name: run_scenario(code, args.runs, args.timeout) for name, code in SCENARIOS.items()}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'Scenario':<34} {'median':>10} {'min':>10} {'max':>10}")
+    for name, result in results.items():
+        if 'error' in result:
+            print(f"{name:<34} error: {result['error']}")
+        else:
+            print(f"{name:<34} {result['median_ms']:>8.2f}ms {result['min_ms']:>8.2f}ms {result['max_ms']:>8.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
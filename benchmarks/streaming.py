@@ -0,0 +1,68 @@
+"""Time to first entry vs. total latency for buffered and streamed /generate.
+
+    python -m benchmarks.streaming --rounds 20
+    python -m benchmarks.streaming --warm --json
+"""
+import argparse
+import json
+import statistics
+import time
+
+import milestone_generator as mg
+from plan_cache import PlanCache
+
+QUERIES = {
+    'day': "Plan my daily study schedule for IELTS",
+    'week': "Create a 7-day workout plan",
+    'month': "Create a month-long workout routine for weight loss",
+    'year': "Plan a year-long financial savings strategy"
+}
+
+
+def measure(client, query, stream):
+    """Return (seconds to first entry, seconds to last byte) for one request."""
+    path = '/generate?stream=true' if stream else '/generate'
+    start = time.perf_counter()
+    response = client.post(path, json={"query": query}, buffered=False)
+    first = None
+    for chunk in response.response:
+        if first is None and (not stream or b'"type": "entry"' in chunk):
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    response.close()
+    return first, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--warm', action='store_true', help="Serve entries from the plan cache")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    # A private in-memory cache; size 0 rebuilds every entry on every request
+    mg.plan_cache = PlanCache(path=None, max_entries=256 if args.warm else 0)
+    client = mg.app.test_client()
+
+    results = {}
+    for period, query in QUERIES.items():
+        for stream in (False, True):
+            measure(client, query, stream)
+            samples = [measure(client, query, stream) for _ in range(args.rounds)]
+            mode = 'stream' if stream else 'buffered'
+            results[f"{period}/{mode}"] = {
+                'first_entry_ms': statistics.median(first for first, _ in samples) * 1e3,
+                'total_ms': statistics.median(total for _, total in samples) * 1e3
+            }
+
+    if args.json:
+        print(json.dumps({name: {key: round(value, 3) for key, value in result.items()}
+                          for name, result in results.items()}, indent=2))
+        return
+    print(f"{'':<16} {'first entry':>12} {'total':>10}")
+    for name, result in results.items():
+        print(f"{name:<16} {result['first_entry_ms']:>10.2f}ms {result['total_ms']:>8.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
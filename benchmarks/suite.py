@@ -0,0 +1,223 @@
+"""Microbenchmarks for every stage of the planning pipeline, with JSON baselines.
+
+    python -m benchmarks.suite run --output before.json
+    python -m benchmarks.suite run --output after.json --filter generate_time_content
+    python -m benchmarks.suite compare before.json after.json --threshold 0.10
+
+``compare`` exits 1 when any benchmark's median is slower than the baseline
+by more than the threshold. The Gemini model is replaced by the local stub,
+so no API key or network access is needed.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from datetime import date, datetime
+
+from benchmarks.corpus import QUERIES
+from benchmarks.json_corpus import SAMPLES
+
+# Set by run(); compare() never loads the planner or NLTK data
+mg = None
+
+# name, zero-argument callable, operations per call
+Bench = namedtuple('Bench', ['name', 'func', 'ops'])
+
+PERIODS = ['day', 'week', 'month', 'year']
+CONTENT_TYPES = ['study', 'workout', 'meal', 'finance', 'general']
+
+
+def model_plan(period):
+    """A plan shaped like the model output format_output expects."""
+    if period == 'week':
+        return {"title": "Week plan", "days": [
+            {"day": day, "focus_area": "Focus", "schedule": {"morning": ["Run"]},
+             "resources_needed": ["Shoes"], "metrics_to_track": ["Distance"]} for day in mg.WEEKDAYS]}
+    if period == 'month':
+        return {"title": "Month plan", "weeks": [
+            {"week": f"Week {n}", "focus_area": "Focus", "goals": ["Goal"],
+             "key_activities": ["Activity"], "resources_needed": ["Book"]} for n in range(1, 5)]}
+    return {"title": "Year plan", "months": [
+        {"month": month, "focus_area": "Focus", "goals": ["Goal"],
+         "milestones": ["Milestone"], "resources_needed": ["Course"]} for month in mg.MONTHS]}
+
+
+def corpus_bench(name, stage):
+    return Bench(name, lambda: [stage(query) for query in QUERIES], len(QUERIES))
+
+
+def build_benches():
+    """Return every benchmark in a stable order."""
+    from json_repair import repair_json
+    benches = [
+        corpus_bench('analyze_query', mg.analyze_query),
+        corpus_bench('clean_query', mg.clean_query),
+        corpus_bench('detect_time_period', mg.detect_time_period),
+        corpus_bench('fast_analyze', lambda query: mg.QueryAnalysis(query).fast),
+    ]
+
+    for period in PERIODS:
+        for content_type in CONTENT_TYPES:
+            benches.append(Bench(
+                f"generate_time_content/{period}/{content_type}",
+                lambda period=period, content_type=content_type: mg.generate_time_content(
+                    f"{content_type} plan", period, None, content_type=content_type, duration=0),
+                1
+            ))
+
+    period_names = {
+        'day': ['Today'],
+        'week': list(mg.WEEKDAYS),
+        'month': [f"Week {n}" for n in range(1, 5)],
+        'year': list(mg.MONTHS)
+    }
+    for period, names in period_names.items():
+        benches.append(Bench(
+            f"get_date_for_entry/{period}",
+            lambda period=period, names=names: [mg.get_date_for_entry(period, name) for name in names],
+            len(names)
+        ))
+
+    from plan_calendar import entry_dates
+    today = date.today().toordinal()
+    for period, count in (('week', 7), ('month', 10), ('year', 12)):
+        # Bypass the per-day cache to time the one-pass computation itself
+        benches.append(Bench(f"plan_calendar/{period}",
+                             lambda period=period, count=count: entry_dates.__wrapped__(today, period, count), count))
+
+    responses = [text for _, text, _ in SAMPLES]
+    benches.append(Bench('repair_json/corpus', lambda: [repair_json(text) for text in responses], len(responses)))
+    benches.append(Bench('parse_plan_chunk/stub', lambda: mg.parse_plan_chunk(mg.model.generate_content('').text), 1))
+
+    plans = {period: mg.generate_plan(f"Create a {period} workout plan") for period in ('week', 'month', 'year')}
+    for period, plan in plans.items():
+        benches.append(Bench(f"validate_plan_content/{period}", lambda plan=plan: mg.validate_plan_content(plan), 1))
+    for period in ('week', 'month', 'year'):
+        plan = model_plan(period)
+        benches.append(Bench(f"format_output/{period}", lambda plan=plan, period=period: mg.format_output(plan, period), 1))
+
+    benches.append(corpus_bench('generate_plan', mg.generate_plan))
+    return benches
+
+
+def measure(bench, repeat, min_time):
+    """Return per-operation timings in microseconds over ``repeat`` calibrated runs."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            bench.func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            bench.func()
+        samples.append((time.perf_counter() - start) / (loops * bench.ops) * 1e6)
+    return samples
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    global mg
+    # Never reach the real model from a benchmark
+    os.environ.setdefault('LLM_BACKEND', 'stub')
+    import milestone_generator as mg
+    from plan_cache import PlanCache
+
+    # Rebuild entries on every call; a warm cache would only measure dictionary lookups
+    mg.plan_cache = PlanCache(path=None, max_entries=0)
+
+    results = {}
+    for bench in build_benches():
+        if args.filter and args.filter not in bench.name:
+            continue
+        samples = measure(bench, args.repeat, args.min_time)
+        results[bench.name] = {
+            'median_us': statistics.median(samples),
+            'min_us': min(samples),
+            'stdev_us': statistics.stdev(samples) if len(samples) > 1 else 0.0
+        }
+        print(f"{bench.name:<42} {results[bench.name]['median_us']:>10.2f}us", file=sys.stderr)
+
+    baseline = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+    else:
+        print(json.dumps(baseline, indent=2, sort_keys=True))
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        before = json.load(f)['results']
+    with open(args.current) as f:
+        after = json.load(f)['results']
+
+    regressions = []
+    print(f"{'benchmark':<42} {'before':>10} {'after':>10} {'change':>8}")
+    for name in sorted(set(before) | set(after)):
+        if name not in before or name not in after:
+            print(f"{name:<42} {'only in ' + ('baseline' if name in before else 'current'):>30}")
+            continue
+        old, new = before[name]['median_us'], after[name]['median_us']
+        change = new / old - 1 if old else 0.0
+        flag = ''
+        if change > args.threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        elif change < -args.threshold:
+            flag = '  faster'
+        print(f"{name:<42} {old:>8.2f}us {new:>8.2f}us {change:>+7.1%}{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="Run the suite and write a JSON baseline")
+    run_parser.add_argument('--output', help="Baseline file (stdout if omitted)")
+    run_parser.add_argument('--filter', help="Only run benchmarks whose name contains this text")
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--min-time', type=float, default=0.1, help="Seconds per timed run")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser('compare', help="Compare two baselines")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help="Relative slowdown that counts as a regression")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
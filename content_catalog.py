@@ -0,0 +1,453 @@
+"""Static content catalogs for plan entries, compiled once at import.
+
+Every catalog is frozen (dicts become read-only mappings, lists become
+tuples), so entries can reference these values directly and share them
+across threads without copying. Only the values that change per entry are
+built fresh.
+"""
+from types import MappingProxyType
+
+
+def freeze(value):
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def copy_template(template, nested_keys):
+    """Copy a frozen template so values can be injected into it.
+
+    Only the mapping levels are copied; the tuples inside stay shared.
+    """
+    # MappingProxyType.copy() returns a plain dict via the fast dict.copy path
+    copy = template.copy()
+    for key in nested_keys:
+        copy[key] = template[key].copy()
+    return copy
+
+
+WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+MONTHS = ('January', 'February', 'March', 'April', 'May', 'June',
+          'July', 'August', 'September', 'October', 'November', 'December')
+WEEKDAY_NUMBERS = freeze({day: number for number, day in enumerate(WEEKDAYS)})
+MONTH_NUMBERS = freeze({month: number for number, month in enumerate(MONTHS, start=1)})
+
+# Empty description skeletons per content type; copied before values are injected
+CONTENT_TEMPLATES = freeze({
+    "workout": {
+        "exercises": [],
+        "duration": "45-60 minutes",
+        "intensity": "Moderate",
+        "equipment": [],
+        "notes": []
+    },
+    "study": {
+        "topics": [],
+        "schedule": {
+            "morning": [],
+            "afternoon": [],
+            "evening": []
+        },
+        "resources": [],
+        "goals": []
+    },
+    "meal": {
+        "meals": {
+            "breakfast": [],
+            "lunch": [],
+            "dinner": [],
+            "snacks": []
+        },
+        "nutrients": {
+            "protein": [],
+            "carbs": [],
+            "fats": []
+        },
+        "macros": {
+            "protein_target": "0g",
+            "carbs_target": "0g",
+            "fats_target": "0g",
+            "total_calories": "0"
+        },
+        "tasks": [],
+        "tips": [],
+        "tracking": {
+            "weight": "",
+            "protein_intake": "",
+            "water_intake": ""
+        }
+    },
+    "finance": {
+        "budget": {
+            "income": [],
+            "expenses": [],
+            "savings": []
+        },
+        "goals": {
+            "savings_target": "0",
+            "expense_reduction": "0",
+            "investment_allocation": "0"
+        },
+        "tracking": {
+            "current_balance": "",
+            "savings_progress": "",
+            "expense_categories": []
+        },
+        "tasks": [],
+        "tips": []
+    },
+    "general": {
+        "tasks": [],
+        "schedule": {
+            "morning": [],
+            "afternoon": [],
+            "evening": []
+        },
+        "goals": [],
+        "notes": []
+    }
+})
+
+# Keys of each template whose values are mappings and must be copied per entry
+TEMPLATE_NESTED_KEYS = freeze({
+    content_type: [key for key, value in template.items() if isinstance(value, MappingProxyType)]
+    for content_type, template in CONTENT_TEMPLATES.items()
+})
+
+# IELTS study components
+STUDY_COMPONENTS = freeze({
+    "reading": [
+        "Skimming and scanning practice",
+        "Reading for detail",
+        "Time management strategies",
+        "Multiple choice questions",
+        "True/False/Not Given",
+        "Matching headings"
+    ],
+    "writing": [
+        "Task 1 - Data interpretation",
+        "Task 1 - Process description",
+        "Task 2 - Essay structure",
+        "Task 2 - Argument development",
+        "Grammar and vocabulary",
+        "Coherence and cohesion"
+    ],
+    "listening": [
+        "Note completion",
+        "Multiple choice",
+        "Map/Plan completion",
+        "Form filling",
+        "Sentence completion",
+        "Summary completion"
+    ],
+    "speaking": [
+        "Part 1 - Personal questions",
+        "Part 2 - Long turn",
+        "Part 3 - Discussion",
+        "Pronunciation practice",
+        "Fluency development",
+        "Vocabulary building"
+    ]
+})
+
+# Daily focus areas based on the day of the week
+STUDY_DAY_FOCUS = freeze({
+    'Monday': ('reading', 'writing'),
+    'Tuesday': ('listening', 'speaking'),
+    'Wednesday': ('writing', 'reading'),
+    'Thursday': ('speaking', 'listening'),
+    'Friday': ('reading', 'listening'),
+    'Saturday': ('writing', 'speaking'),
+    'Sunday': ('review', 'practice_test')
+})
+STUDY_DEFAULT_FOCUS = ('all_skills', 'review')
+
+STUDY_REVIEW_SCHEDULE = freeze({
+    "morning": [
+        "Review previous week's materials - 1 hour",
+        "Practice test (Reading) - 1 hour",
+        "Practice test (Writing Task 1) - 1 hour"
+    ],
+    "afternoon": [
+        "Practice test (Listening) - 1 hour",
+        "Practice test (Writing Task 2) - 1 hour",
+        "Review and mark practice tests - 1 hour"
+    ],
+    "evening": [
+        "Speaking practice with study partner - 30 mins",
+        "Plan next week's study goals - 30 mins",
+        "Review weak areas identified in practice tests - 1 hour"
+    ]
+})
+
+STUDY_EVENING_SCHEDULE = (
+    "Review day's learning - 30 mins",
+    "Practice exercises - 45 mins",
+    "Prepare for tomorrow's topics - 15 mins"
+)
+
+STUDY_RESOURCES = (
+    "Cambridge IELTS Practice Tests",
+    "IELTS Official Guide",
+    "Online practice platform",
+    "Study timer/stopwatch",
+    "Note-taking materials"
+)
+
+
+def _study_schedule(focus_areas):
+    if focus_areas[0] == 'review':
+        return STUDY_REVIEW_SCHEDULE
+
+    morning = ()
+    if focus_areas[0] in STUDY_COMPONENTS:
+        morning = tuple(
+            f"{focus_areas[0].title()} skill: {component} - 45 mins"
+            for component in STUDY_COMPONENTS[focus_areas[0]][:2]
+        ) + ("Vocabulary building - 30 mins",)
+
+    afternoon = ()
+    if focus_areas[1] in STUDY_COMPONENTS:
+        afternoon = tuple(
+            f"{focus_areas[1].title()} skill: {component} - 45 mins"
+            for component in STUDY_COMPONENTS[focus_areas[1]][:2]
+        ) + ("Grammar practice - 30 mins",)
+
+    return freeze({"morning": morning, "afternoon": afternoon, "evening": STUDY_EVENING_SCHEDULE})
+
+
+def _study_topics(focus_areas):
+    return (
+        f"Focus 1: {focus_areas[0].replace('_', ' ').title()}",
+        f"Focus 2: {focus_areas[1].replace('_', ' ').title()}",
+        "Vocabulary and Grammar Development"
+    )
+
+
+# Schedules and topics only depend on the focus areas, so build them all up front
+STUDY_SCHEDULES = freeze({
+    focus: _study_schedule(focus) for focus in set(STUDY_DAY_FOCUS.values()) | {STUDY_DEFAULT_FOCUS}
+})
+STUDY_TOPICS = freeze({
+    focus: _study_topics(focus) for focus in set(STUDY_DAY_FOCUS.values()) | {STUDY_DEFAULT_FOCUS}
+})
+
+# Exercise categories; strength work gets harder as the plan progresses
+WORKOUT_WARMUP = (
+    "Dynamic stretching - 5 mins",
+    "Light jogging in place - 5 mins",
+    "Arm circles and leg swings - 2 mins"
+)
+WORKOUT_CARDIO = (
+    "Jumping jacks - 1 min",
+    "High knees - 30 secs",
+    "Mountain climbers - 30 secs",
+    "Burpees - 30 secs"
+)
+WORKOUT_STRENGTH_LEVELS = (
+    (
+        "Push-ups - 10 reps",
+        "Bodyweight squats - 15 reps",
+        "Lunges - 10 each leg",
+        "Plank hold - 30 secs"
+    ),
+    (
+        "Push-ups - 15 reps",
+        "Jump squats - 20 reps",
+        "Walking lunges - 15 each leg",
+        "Plank hold - 45 secs"
+    ),
+    (
+        "Diamond push-ups - 12 reps",
+        "Pistol squats - 8 each leg",
+        "Jump lunges - 12 each leg",
+        "Plank with shoulder taps - 45 secs"
+    )
+)
+WORKOUT_COOLDOWN = (
+    "Static stretching - 5 mins",
+    "Deep breathing - 2 mins",
+    "Light walking - 3 mins"
+)
+
+# Full exercise list and equipment per strength level
+WORKOUT_EXERCISES = tuple(
+    WORKOUT_WARMUP + WORKOUT_CARDIO + strength + WORKOUT_COOLDOWN
+    for strength in WORKOUT_STRENGTH_LEVELS
+)
+WORKOUT_EQUIPMENT = (
+    ("Exercise mat", "Water bottle", "Timer/stopwatch"),
+    ("Exercise mat", "Water bottle", "Timer/stopwatch", "Resistance bands"),
+    ("Exercise mat", "Water bottle", "Timer/stopwatch", "Resistance bands", "Dumbbells (optional)")
+)
+
+INTENSITY_LEVELS = ("Light", "Light-Moderate", "Moderate", "Moderate-High", "High")
+
+WORKOUT_WEEK_FOCUS = freeze({
+    1: "Form and Technique",
+    2: "Building Endurance",
+    3: "Strength Development",
+    4: "High-Intensity Training"
+})
+# Focus by quarter of the year
+WORKOUT_QUARTER_FOCUS = (
+    "Building Foundation",
+    "Strength and Endurance",
+    "Power and Performance",
+    "Peak Performance"
+)
+
+MEAL_TASKS = (
+    "Week 1: Meal prep and grocery planning",
+    "Week 2: Review and adjust portions based on progress",
+    "Week 3: Try new recipes with seasonal ingredients",
+    "Week 4: Monthly progress assessment and adjustments"
+)
+
+SEASONS = freeze({
+    'winter': ['December', 'January', 'February'],
+    'spring': ['March', 'April', 'May'],
+    'summer': ['June', 'July', 'August'],
+    'fall': ['September', 'October', 'November']
+})
+MONTH_SEASONS = freeze({month: season for season, months in SEASONS.items() for month in months})
+
+SEASONAL_TIPS = freeze({
+    'winter': ["Boost vitamin D intake", "Include warming foods", "Focus on immune support"],
+    'spring': ["Incorporate fresh greens", "Lighter cooking methods", "Seasonal produce focus"],
+    'summer': ["Stay hydrated", "Light, cooling meals", "Grill and fresh prep"],
+    'fall': ["Boost fiber intake", "Hearty, warming dishes", "Immune system support"]
+})
+DEFAULT_MEAL_TIPS = ("Stay consistent with portions", "Track macros daily", "Prep meals in advance")
+
+SEASONAL_FOODS = freeze({
+    'January': ['root vegetables', 'citrus fruits', 'winter greens'],
+    'February': ['winter squash', 'potatoes', 'citrus fruits'],
+    'March': ['spring greens', 'asparagus', 'early berries'],
+    'April': ['peas', 'asparagus', 'spring onions'],
+    'May': ['strawberries', 'new potatoes', 'spring vegetables'],
+    'June': ['summer berries', 'leafy greens', 'early tomatoes'],
+    'July': ['tomatoes', 'summer squash', 'stone fruits'],
+    'August': ['corn', 'tomatoes', 'melons'],
+    'September': ['apples', 'pears', 'fall squash'],
+    'October': ['pumpkins', 'apples', 'root vegetables'],
+    'November': ['winter squash', 'root vegetables', 'cranberries'],
+    'December': ['winter citrus', 'root vegetables', 'winter greens']
+})
+DEFAULT_SEASONAL_FOODS = ('vegetables', 'fruits', 'proteins')
+
+FINANCE_COMMON_TASKS = (
+    "Review and categorize expenses",
+    "Update budget tracking spreadsheet",
+    "Check progress on savings goals"
+)
+FINANCE_MONTH_TASKS = freeze({
+    'January': ["Set annual financial goals", "Review previous year's performance"],
+    'April': ["Prepare tax documents", "Review Q1 performance"],
+    'July': ["Mid-year financial review", "Adjust investment strategy"],
+    'October': ["Q4 planning", "Holiday budget preparation"]
+})
+
+# Fallback content for empty arrays in generated entries
+DEFAULT_CONTENT = freeze({
+    'exercises': [
+        "Warm-up exercises (10 minutes)",
+        "Main workout routine",
+        "Cool-down stretches"
+    ],
+    'equipment': [
+        "Exercise mat",
+        "Water bottle",
+        "Comfortable clothes"
+    ],
+    'notes': [
+        "Start with proper form",
+        "Listen to your body",
+        "Stay hydrated"
+    ],
+    'morning': [
+        "Start with light activity",
+        "Focus on main goals",
+        "Track progress"
+    ],
+    'afternoon': [
+        "Continue with planned activities",
+        "Review progress",
+        "Adjust as needed"
+    ],
+    'evening': [
+        "Complete remaining tasks",
+        "Review day's progress",
+        "Plan for tomorrow"
+    ],
+    'goals': [
+        "Complete planned activities",
+        "Maintain consistent effort",
+        "Track progress"
+    ],
+    'tasks': [
+        "Priority task 1",
+        "Secondary task",
+        "Follow-up activities"
+    ],
+    'meals': {
+        'breakfast': [
+            "High-protein breakfast option",
+            "Healthy carbs and fruits"
+        ],
+        'lunch': [
+            "Balanced protein and vegetables",
+            "Complex carbohydrates"
+        ],
+        'dinner': [
+            "Lean protein option",
+            "Vegetables and whole grains"
+        ],
+        'snacks': [
+            "Protein-rich snack",
+            "Healthy fruits or nuts"
+        ]
+    },
+    'nutrients': {
+        'protein': [
+            "Track daily protein intake",
+            "Aim for balanced protein distribution"
+        ],
+        'carbs': [
+            "Focus on complex carbohydrates",
+            "Monitor carb intake"
+        ],
+        'fats': [
+            "Include healthy fats",
+            "Balance fat consumption"
+        ]
+    },
+    'tips': [
+        "Stay hydrated throughout the day",
+        "Prepare meals in advance",
+        "Track your nutrition"
+    ],
+    'budget': {
+        'income': [
+            "Regular income sources",
+            "Additional income opportunities"
+        ],
+        'expenses': [
+            "Essential expenses",
+            "Non-essential spending"
+        ],
+        'savings': [
+            "Emergency fund allocation",
+            "Long-term savings goals"
+        ]
+    },
+    'expense_categories': [
+        "Housing and utilities",
+        "Food and groceries",
+        "Transportation",
+        "Healthcare"
+    ]
+})
@@ -0,0 +1,89 @@
+"""Weighted whole-word classification of queries and prompts.
+
+A KeywordClassifier indexes its vocabulary once: every word gets a row of a
+(words x labels) weight matrix. A text's scores are the dot product of its
+sparse word-count vector with that matrix. A batch is scanned with one
+regex pass over the joined texts and scored with one weighted bincount per
+label, so classifying 100k queries takes a handful of NumPy calls.
+
+Words only match whole ("gym" does not match inside "gymkhana"). The label
+with the highest score wins and ties go to the earlier label. The
+confidence is the winner's share of the total score; a text without any
+vocabulary word gets the default label with confidence 0.
+"""
+import re
+
+import numpy as np
+
+from vocabulary import CONTENT_TYPE_WEIGHTS, TIMEFRAME_WEIGHTS
+
+
+def trie_pattern(words):
+    """Return a regex alternation of ``words`` that shares common prefixes.
+
+    re tries every branch of a flat alternation at every position; a trie
+    rejects a position after one character test, which halves the scan time.
+    """
+    branches = {}
+    for word in words:
+        branches.setdefault(word[:1], []).append(word[1:])
+    optional = '' in branches.pop('', [None])
+    alternatives = [re.escape(char) + trie_pattern(rests) for char, rests in sorted(branches.items())]
+    if not alternatives:
+        return ''
+    pattern = alternatives[0] if len(alternatives) == 1 and not optional else f"(?:{'|'.join(alternatives)})"
+    return pattern + '?' if optional else pattern
+
+
+class KeywordClassifier:
+    """Score texts against per-label word weights."""
+
+    def __init__(self, weights, default):
+        self.labels = tuple(label for label, _ in weights)
+        self.default = default
+        words = sorted({word for _, table in weights for word in table})
+        self.index = {word: row for row, word in enumerate(words)}
+        self.weights = np.zeros((len(words), len(self.labels)))
+        for column, (_, table) in enumerate(weights):
+            for word, weight in table.items():
+                self.weights[self.index[word], column] = weight
+        self.pattern = re.compile(rf"\b{trie_pattern(words)}\b")
+        self._labels = np.array(self.labels + (default,), dtype=object)
+
+    def batch_scores(self, texts):
+        """Return the (texts x labels) score matrix of a batch of texts."""
+        lowered = [text.lower() for text in texts]
+        # Offset of each text in the joined string; a match belongs to the last text starting before it
+        starts = np.cumsum([0] + [len(text) + 1 for text in lowered[:-1]])
+        matches = [(match.start(), self.index[match.group()]) for match in self.pattern.finditer('\n'.join(lowered))]
+        positions, rows = np.array(matches, dtype=np.int64).reshape(-1, 2).T
+        owners = np.searchsorted(starts, positions, side='right') - 1
+        scores = np.empty((len(texts), len(self.labels)))
+        for column in range(len(self.labels)):
+            scores[:, column] = np.bincount(owners, weights=self.weights[rows, column], minlength=len(texts))
+        return scores
+
+    def classify(self, text):
+        """Return (label, confidence) for one text."""
+        rows = [self.index[word] for word in self.pattern.findall(text.lower())]
+        if not rows:
+            return self.default, 0.0
+        scores = self.weights[rows].sum(axis=0).tolist()
+        best = scores.index(max(scores))
+        return self.labels[best], scores[best] / sum(scores)
+
+    def classify_batch(self, texts):
+        """Return (labels, confidences) for a batch of texts, scored in one matrix pass."""
+        if not texts:
+            return [], np.zeros(0)
+        scores = self.batch_scores(texts)
+        totals = scores.sum(axis=1)
+        best = scores.argmax(axis=1)
+        found = totals > 0
+        confidences = np.where(found, scores.max(axis=1) / np.where(found, totals, 1), 0.0)
+        labels = self._labels[np.where(found, best, len(self.labels))]
+        return labels.tolist(), confidences
+
+
+content_classifier = KeywordClassifier(CONTENT_TYPE_WEIGHTS, 'general')
+timeframe_classifier = KeywordClassifier(TIMEFRAME_WEIGHTS, 'week')
@@ -0,0 +1,98 @@
+"""Asynchronous model calls for LLM plan enrichment.
+
+Every call runs on one background event loop. A global semaphore bounds how
+many calls are in flight and each call has its own timeout. Waiting on the
+model therefore costs a coroutine, not an OS thread per request. Models with
+``generate_content_async`` are awaited directly; any other model is offloaded
+to the loop's default thread pool. A thread cannot be stopped, so a timed-out
+sync call keeps its concurrency slot until its thread returns, and the bound
+still holds for the calls actually running.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+
+ENRICH_CONCURRENCY = int(os.getenv('ENRICH_CONCURRENCY', '16'))
+ENRICH_TIMEOUT = float(os.getenv('ENRICH_TIMEOUT', '30'))
+
+
+class ModelRunner:
+    """Run model calls on a shared event loop with bounded concurrency and timeouts."""
+
+    def __init__(self, model, concurrency=ENRICH_CONCURRENCY, timeout=ENRICH_TIMEOUT):
+        self.model = model
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._loop = None
+        self._pid = None
+        self._semaphore = None
+        self.stats = {
+            'calls': 0,
+            'in_flight': 0,
+            'timeouts': 0,
+            'errors': 0
+        }
+
+    @classmethod
+    def from_env(cls, model):
+        """Build a runner configured by ENRICH_* environment variables."""
+        return cls(model, concurrency=ENRICH_CONCURRENCY, timeout=ENRICH_TIMEOUT)
+
+    def _get_loop(self):
+        """Return the background loop, starting it on first use and again after a fork."""
+        if self._loop is not None and self._pid == os.getpid():
+            return self._loop
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='model-runner', daemon=True)
+                thread.start()
+                self._semaphore = asyncio.Semaphore(self.concurrency)
+                self._loop = loop
+                self._pid = os.getpid()
+        return self._loop
+
+    async def generate(self, prompt, generation_config=None, timeout=None):
+        """Return the model's response text, raising asyncio.TimeoutError after ``timeout``."""
+        await self._semaphore.acquire()
+        release = True
+        self.stats['calls'] += 1
+        self.stats['in_flight'] += 1
+        try:
+            if hasattr(self.model, 'generate_content_async'):
+                call = self.model.generate_content_async(prompt, generation_config=generation_config)
+            else:
+                func = functools.partial(contextvars.copy_context().run, self.model.generate_content,
+                                         prompt, generation_config=generation_config)
+                thread_call = asyncio.get_running_loop().run_in_executor(None, func)
+                # The slot is freed when the thread returns, even after a timeout
+                thread_call.add_done_callback(lambda _: self._semaphore.release())
+                release = False
+                call = asyncio.shield(thread_call)
+            response = await asyncio.wait_for(call, timeout or self.timeout)
+            return response.text
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            raise
+        except Exception:
+            self.stats['errors'] += 1
+            raise
+        finally:
+            self.stats['in_flight'] -= 1
+            if release:
+                self._semaphore.release()
+
+    def submit(self, coro):
+        """Schedule ``coro`` on the background loop and return a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+
+    def run(self, coro):
+        """Run ``coro`` on the background loop and wait for its result."""
+        return self.submit(coro).result()
+
+    def get_stats(self):
+        """Return call counters and the configured limits."""
+        return dict(self.stats, concurrency=self.concurrency, timeout=self.timeout)
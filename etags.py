@@ -0,0 +1,58 @@
+"""Entity tags and conditional requests for deterministic plans.
+
+A plan generated without enrichment depends only on its canonical inputs
+(period, content type, entry count, page and title) and the day it is dated
+from. Their hash, prefixed with that day, is the plan's id and its ETag, so
+the tag is known before the plan is built. A request whose If-None-Match
+already holds it is answered with 304 without building or serializing
+anything.
+
+The tag is weak: JSON, MessagePack and compressed bodies of one plan share
+it, and ``Vary`` tells caches apart. Set ETAG_SALT (for example to the
+release id) when a deploy changes the generated content, so old tags stop
+matching.
+"""
+import hashlib
+import json
+import os
+import re
+from datetime import date
+
+from flask import Response
+
+ETAG_SALT = os.getenv('ETAG_SALT', '')
+
+PLAN_ID_RE = re.compile(r'(\d{4})(\d{2})(\d{2})-[0-9a-f]{24}')
+
+
+def plan_id(inputs, day):
+    """Return the id of the plan built from ``inputs`` on ``day`` (an ISO date string)."""
+    raw = json.dumps([ETAG_SALT, day, inputs], separators=(',', ':'), ensure_ascii=False).encode()
+    return f"{day.replace('-', '')}-{hashlib.blake2b(raw, digest_size=12).hexdigest()}"
+
+
+def plan_day(plan_id):
+    """Return the ISO day a plan id was dated from, raising ValueError if it is malformed."""
+    match = PLAN_ID_RE.fullmatch(plan_id)
+    if match is None:
+        raise ValueError("Invalid plan id")
+    return date(*map(int, match.groups())).isoformat()
+
+
+def is_fresh(request, etag):
+    """True when the client's If-None-Match already holds ``etag``."""
+    return request.if_none_match.contains_weak(etag)
+
+
+def tag(response, etag):
+    """Add the ETag and the headers conditional clients rely on to ``response``."""
+    response.set_etag(etag, weak=True)
+    response.headers['Content-Location'] = f"/plans/{etag}"
+    # Cached copies are revalidated, which costs a 304 and no plan building
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.update(('Accept', 'Accept-Encoding'))
+    return response
+
+
+def not_modified(etag):
+    return tag(Response(status=304), etag)
@@ -0,0 +1,142 @@
+"""Rule-only query analysis that decides period, duration and content type without NLTK.
+
+The time vocabulary from vocabulary.py is compiled into one regex that is
+scanned once over the lowercased query. A zero-width lookahead reports every keyword
+occurrence, including overlapping ones, so the decision rules below reproduce
+the substring and token checks of the NLTK pipeline exactly. Queries whose
+tokenization the scanner cannot predict are reported as ambiguous and left to
+the NLTK path.
+"""
+import re
+from collections import namedtuple
+
+from vocabulary import (
+    TIME_MAPPINGS, TIME_UNITS, NUMERIC_TIME_PATTERN, WORD_NUMBER_TIME_PATTERN, TIME_PHRASES,
+    DAY_CONTEXT_WORDS, COMPOUND_PERIODS, EXPLICIT_PERIODS, MULTI_DAY_WORDS
+)
+from horizon import resolve_horizon
+from content_classifier import content_classifier
+
+FastAnalysis = namedtuple('FastAnalysis', ['period', 'duration', 'content_type', 'ambiguous'])
+
+# Token vocabulary mapped to the period it names (direct mappings take precedence)
+TOKEN_PERIODS = {word: unit for unit, variants in TIME_UNITS.items() for word in variants}
+TOKEN_PERIODS.update(TIME_MAPPINGS)
+
+# Every literal the decision rules test for, as plain substrings
+KEYWORDS = set(TOKEN_PERIODS)
+KEYWORDS.update(phrase for phrase, _ in TIME_PHRASES)
+KEYWORDS.update(DAY_CONTEXT_WORDS)
+KEYWORDS.update(pattern for _, patterns in COMPOUND_PERIODS for pattern in patterns)
+KEYWORDS.update(pattern for _, patterns in EXPLICIT_PERIODS for pattern in patterns)
+KEYWORDS.update(MULTI_DAY_WORDS)
+
+# Longest first, so the keyword matched at a position contains every shorter one there
+_ORDERED_KEYWORDS = sorted(KEYWORDS, key=len, reverse=True)
+_KEYWORD_ALTERNATION = '|'.join(re.escape(keyword) for keyword in _ORDERED_KEYWORDS)
+KEYWORD_PREFIXES = {
+    keyword: tuple(other for other in _ORDERED_KEYWORDS if keyword.startswith(other))
+    for keyword in _ORDERED_KEYWORDS
+}
+
+# One pass: numeric spans first, then keywords, reported at every starting position
+SCANNER = re.compile(
+    rf'(?=(?P<numeric>{NUMERIC_TIME_PATTERN})|(?P<word_number>{WORD_NUMBER_TIME_PATTERN})|(?P<keyword>{_KEYWORD_ALTERNATION}))'
+)
+KEYWORD_RE = re.compile(_KEYWORD_ALTERNATION)
+
+# Characters and forms whose tokenization by word_tokenize is not predicted here:
+# anything outside a plain ASCII set, double dashes and non-final periods
+UNSAFE_TEXT = re.compile(r"[^a-z0-9\s.,!?'$%&-]|--|\.(?=[\s\S]*\S)(?<!\d\.(?=\d))")
+# Clitics that word_tokenize splits off cleanly; any other apostrophe is ambiguous
+SAFE_CLITIC = re.compile(r"(?<=\w)(?:'(?:s|m|d|ll|re|ve)|n't)(?=[\s?!$%&]|,(?!\d)|\.\s*$|$)")
+TOKEN_SEPARATORS = frozenset(' \t\n\r\f\v?!$%&')
+
+
+def _is_token(text, start, end):
+    """Whether ``text[start:end]`` is a whole word_tokenize token."""
+    if start > 0 and text[start - 1] not in TOKEN_SEPARATORS and text[start - 1] != ',':
+        return False
+    if end == len(text):
+        return True
+    after = text[end]
+    if after == ',':
+        # Commas are only split off when they are not followed by a digit
+        return not text[end + 1:end + 2].isdigit()
+    if after == '.':
+        # Only the final period is split off
+        return not text[end + 1:].strip()
+    if after == "'" or text.startswith("n't", end):
+        return SAFE_CLITIC.match(text, end) is not None
+    return after in TOKEN_SEPARATORS
+
+
+def fast_analyze(query, content_type=None):
+    """Decide period and duration with a single keyword scan; ``content_type`` skips classifying again."""
+    text = query.lower()
+    if UNSAFE_TEXT.search(text.strip()) or "'" in SAFE_CLITIC.sub('', text):
+        return FastAnalysis(None, None, None, True)
+
+    present = set()
+    numeric = word_number = token_period = None
+    for match in SCANNER.finditer(text):
+        start = match.start()
+        if match.group('keyword') is None:
+            # A numeric span won the alternation; recover the keywords starting here
+            if match.group('numeric') and numeric is None:
+                numeric = re.match(NUMERIC_TIME_PATTERN, match.group('numeric'))
+            if match.group('word_number') and word_number is None:
+                word_number = re.match(WORD_NUMBER_TIME_PATTERN, match.group('word_number'))
+            keyword_match = KEYWORD_RE.match(text, start)
+            if keyword_match is None:
+                continue
+            keyword = keyword_match.group()
+        else:
+            keyword = match.group('keyword')
+
+        for found in KEYWORD_PREFIXES[keyword]:
+            present.add(found)
+            if token_period is None and found in TOKEN_PERIODS and _is_token(text, start, start + len(found)):
+                token_period = TOKEN_PERIODS[found]
+
+    period, duration = resolve_horizon(_resolve_period(present, numeric, word_number, token_period), text)
+    if content_type is None:
+        content_type = content_classifier.classify(text)[0]
+    return FastAnalysis(period, duration, content_type, False)
+
+
+def _resolve_period(present, numeric, word_number, token_period):
+    """Apply the period rules of extract_time_context and detect_time_period."""
+    period = None
+    for match, number in ((numeric, numeric and int(numeric.group(1))),
+                          (word_number, word_number and (7 if word_number.group(1) == 'seven' else 30))):
+        if match:
+            unit = match.group(2)
+            if unit == 'day' and number == 7:
+                period = 'week'
+            elif unit == 'day' and number == 30:
+                period = 'month'
+            else:
+                period = unit
+            break
+
+    if period is None:
+        period = token_period
+    if period is None:
+        period = next((period for phrase, period in TIME_PHRASES if phrase in present), None)
+    if period is None:
+        # Weekend/weekly context and the default both mean a week
+        period = 'day' if present.intersection(DAY_CONTEXT_WORDS) else 'week'
+
+    for compound_period, patterns in COMPOUND_PERIODS:
+        if present.intersection(patterns):
+            period = compound_period
+            break
+    for explicit_period, patterns in EXPLICIT_PERIODS:
+        if present.intersection(patterns):
+            period = explicit_period
+            break
+
+    if period == 'day' and present.intersection(MULTI_DAY_WORDS):
+        period = 'week'
+    return period
@@ -0,0 +1,13 @@
+"""Gunicorn settings for the planner: ``gunicorn -c gunicorn.conf.py wsgi:app``."""
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', str(os.cpu_count() or 1)))
+# Threads let one worker wait on several model calls and streamed responses
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+keepalive = 5
+
+# Import wsgi.py (and so preload()) once in the master, then fork the workers
+preload_app = os.getenv('GUNICORN_PRELOAD', '1') != '0'
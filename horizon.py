@@ -0,0 +1,47 @@
+"""Plan horizons: how many entries a query asks for and how they are spaced.
+
+A number and a unit ("a 24-month plan", "52 weeks", "three years") set the
+horizon. A cadence word ("daily", "weekly", "monthly") sets the spacing of
+the entries; without one, entries follow the unit, and years are planned
+month by month. Horizons the period rules already express (a single unit,
+or 7, 30 or 365 days) keep the period's default entry count.
+
+Both the keyword fast path and the NLTK path resolve horizons here, from
+the same lowercased query, so they always agree.
+"""
+import os
+import re
+
+from vocabulary import HORIZON_NUMBER_WORDS, HORIZON_PATTERN, CADENCE_WORDS, PERIOD_DAYS, UNIT_DAYS
+
+# Longest plan served, e.g. ten years of daily entries
+PLAN_MAX_ENTRIES = int(os.getenv('PLAN_MAX_ENTRIES', '3660'))
+
+# The plan period whose entries have each cadence
+CADENCE_PERIODS = {'day': 'week', 'week': 'month', 'month': 'year'}
+
+HORIZON_RE = re.compile(HORIZON_PATTERN)
+
+
+def parse_horizon(text):
+    """Return (number, unit) for the first "<number> <unit>" in lowercased ``text``, or None."""
+    match = HORIZON_RE.search(text)
+    if match is None:
+        return None
+    number = match.group(1)
+    return int(number) if number.isdigit() else HORIZON_NUMBER_WORDS[number], match.group(2)
+
+
+def resolve_horizon(period, text):
+    """Return (period, entry count) for lowercased ``text``; a count of 0 means the period default."""
+    horizon = parse_horizon(text)
+    if horizon is None:
+        return period, 0
+    number, unit = horizon
+    cadence = next((cadence for word, cadence in CADENCE_WORDS if word in text), None)
+    if cadence is None:
+        if number <= 1 or (unit == 'day' and number in PERIOD_DAYS):
+            return period, 0
+        cadence = 'month' if unit == 'year' else unit
+    count = max(round(number * UNIT_DAYS[unit] / UNIT_DAYS[cadence]), 1)
+    return CADENCE_PERIODS[cadence], min(count, PLAN_MAX_ENTRIES)
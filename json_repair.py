@@ -0,0 +1,270 @@
+"""Single-pass repair of the almost-JSON that language models return.
+
+``repair_json`` walks the text once with an explicit container stack and
+re-emits it as strict JSON. It handles:
+
+- prose and code fences around the payload
+- ``//`` and ``/* */`` comments
+- single-quoted strings, and apostrophes or stray quotes inside strings
+- unquoted keys and bare string values
+- missing, duplicate and trailing commas, and missing colons
+- output truncated mid-string or mid-container
+
+Every character is examined a bounded number of times and each regex used
+matches a simple character class, so the running time is linear in the
+input size.
+"""
+import json
+import os
+import re
+
+from metrics import timed
+
+KEY, COLON, VALUE, AFTER = range(4)
+
+# Deeper nesting is refused rather than handed to the recursive json decoder
+MAX_DEPTH = int(os.getenv('JSON_REPAIR_MAX_DEPTH', '200'))
+
+CONTAINER_START = re.compile(r'[{\[]')
+# Fence and whitespace before the payload; a quote right after it starts a brace-less object
+LEADING = re.compile(r'[\s`]*(?:json\b)?[\s`]*')
+SPACE = re.compile(r'[\s`]*')
+# Ordinary string characters, copied through in one slice
+STRING_RUN = re.compile(r'[^"\'\\\x00-\x1f]+')
+# Unquoted keys stop at the colon; unquoted values at the end of the item or line
+BARE_KEY = re.compile(r'[^:,{}\[\]\n\r"\']*')
+BARE_VALUE = re.compile(r'(?:[^,}\]\n\r/]|/(?![/*])|(?<=:)//)*')
+NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?')
+CONTROL_CHAR = re.compile(r'[\x00-\x1f]')
+HEX4 = re.compile(r'[0-9a-fA-F]{4}')
+
+LITERALS = {'true': 'true', 'false': 'false', 'null': 'null',
+            'True': 'true', 'False': 'false', 'None': 'null'}
+DECODER = json.JSONDecoder()
+CLOSERS = {'}': '{', ']': '['}
+# A quote only ends a string when one of these (or the end of input) follows it
+STRING_END_FOLLOWERS = frozenset(',:}]{["\'/`')
+SIMPLE_ESCAPES = frozenset('"\\/bfnrt')
+CONTROL_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t', '\b': '\\b', '\f': '\\f'}
+
+
+@timed('repair_json')
+def repair_json(text):
+    """Return ``text`` rewritten as strict JSON (an object when no container is found).
+
+    Raises ValueError when containers nest deeper than MAX_DEPTH.
+    """
+    n = len(text)
+    out = []
+    stack = []
+    open_counts = {'{': 0, '[': 0}
+
+    match = CONTAINER_START.search(text)
+    start = LEADING.match(text).end()
+    if match and not (start < match.start() and text[start] in '"\''):
+        i = match.start()
+        # Well-formed payloads only need to be cut out of the surrounding text
+        try:
+            _, end = DECODER.raw_decode(text, i)
+            return text[i:end]
+        except (ValueError, RecursionError):
+            pass
+    else:
+        # No container to start from: read the text as the body of an object
+        i = start
+        out.append('{')
+        stack.append(['{', KEY, 0])
+        open_counts['{'] += 1
+
+    while i < n:
+        i = SPACE.match(text, i).end()
+        if i >= n:
+            break
+        c = text[i]
+
+        if c == '/' and text[i + 1:i + 2] in ('/', '*'):
+            end = text.find('\n', i) if text[i + 1] == '/' else text.find('*/', i + 2)
+            i = n if end == -1 else end + (0 if text[i + 1] == '/' else 2)
+            continue
+
+        frame = stack[-1] if stack else None
+
+        if c in CLOSERS:
+            i += 1
+            kind = CLOSERS[c]
+            if not open_counts[kind]:
+                continue  # Nothing to close
+            while stack:
+                closed = stack.pop()
+                open_counts[closed[0]] -= 1
+                _finish(closed, out)
+                if closed[0] == kind:
+                    break
+            if not stack:
+                break
+            continue
+
+        if c == ',':
+            i += 1
+            if frame is not None:
+                if frame[0] == '{':
+                    _fill_missing_value(frame, out)
+                    frame[1] = KEY
+                else:
+                    frame[1] = VALUE
+            continue
+
+        if c == ':':
+            i += 1
+            if frame is not None and frame[0] == '{':
+                if frame[1] in (KEY, AFTER):
+                    _start_item(frame, out)
+                    out.append('"":')
+                    frame[1] = VALUE
+                elif frame[1] == COLON:
+                    out.append(':')
+                    frame[1] = VALUE
+            continue
+
+        if frame is not None and frame[0] == '{':
+            if frame[1] in (KEY, AFTER):
+                _start_item(frame, out)
+                if c == '"' or c == "'":
+                    key, i = _read_string(text, i)
+                elif c in '{[':
+                    key = f'"item_{frame[2]}"'  # A value without a key
+                else:
+                    match = BARE_KEY.match(text, i)
+                    key, i = _quote(match.group().strip()), match.end()
+                out.append(key)
+                frame[1] = COLON
+                continue
+            if frame[1] == COLON:
+                out.append(':')
+        elif frame is not None:
+            _start_item(frame, out)
+
+        # A value in an array, an object or at the root
+        if frame is not None:
+            frame[1] = AFTER
+        if c in '{[':
+            if len(stack) >= MAX_DEPTH:
+                raise ValueError(f"JSON nested deeper than {MAX_DEPTH} levels")
+            out.append(c)
+            stack.append([c, KEY if c == '{' else VALUE, 0])
+            open_counts[c] += 1
+            i += 1
+            continue
+        if c == '"' or c == "'":
+            value, i = _read_string(text, i)
+        else:
+            match = BARE_VALUE.match(text, i)
+            value, i = _bare_value(match.group().strip()), match.end()
+            if match.end() == match.start():
+                i += 1  # An unexpected character; drop it
+                if frame is not None and frame[0] == '{':
+                    frame[1] = VALUE
+                continue
+        out.append(value)
+        if frame is None:
+            break
+
+    # Close whatever truncated output left open
+    while stack:
+        _finish(stack.pop(), out)
+    return ''.join(out) or '{}'
+
+
+def _start_item(frame, out):
+    """Emit the separator before a container's next item."""
+    if frame[2]:
+        out.append(',')
+    frame[2] += 1
+
+
+def _fill_missing_value(frame, out):
+    """Give a key that has no value a null."""
+    if frame[1] == COLON:
+        out.append(':null')
+    elif frame[1] == VALUE:
+        out.append('null')
+
+
+def _finish(frame, out):
+    """Close a container, completing a dangling key first."""
+    if frame[0] == '{':
+        _fill_missing_value(frame, out)
+        out.append('}')
+    else:
+        out.append(']')
+
+
+def _quote(value):
+    """Return ``value`` as a JSON string literal."""
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+    return '"' + CONTROL_CHAR.sub(_escape_control, escaped) + '"'
+
+
+def _escape_control(match):
+    """Escape one control character for a JSON string."""
+    c = match.group()
+    return CONTROL_ESCAPES.get(c, f'\\u{ord(c):04x}')
+
+
+def _bare_value(token):
+    """Map an unquoted value to a JSON literal, number or string."""
+    if token in LITERALS:
+        return LITERALS[token]
+    if NUMBER.fullmatch(token):
+        return token
+    return _quote(token)
+
+
+def _read_string(text, i):
+    """Read a quoted string starting at ``text[i]``; return (JSON literal, next index)."""
+    n = len(text)
+    quote = text[i]
+    parts = ['"']
+    i += 1
+    while i < n:
+        match = STRING_RUN.match(text, i)
+        if match:
+            parts.append(match.group())
+            i = match.end()
+            if i >= n:
+                break
+        c = text[i]
+        if c == quote:
+            follow = SPACE.match(text, i + 1).end()
+            if follow >= n or text[follow] in STRING_END_FOLLOWERS:
+                i += 1
+                break
+            parts.append('\\"' if c == '"' else c)  # A quote inside the text
+            i += 1
+        elif c == '"':
+            parts.append('\\"')
+            i += 1
+        elif c == "'":
+            parts.append(c)
+            i += 1
+        elif c == '\\':
+            escape = text[i + 1:i + 2]
+            if escape in SIMPLE_ESCAPES and escape:
+                parts.append('\\' + escape)
+                i += 2
+            elif escape == 'u' and HEX4.match(text, i + 2):
+                parts.append(text[i:i + 6])
+                i += 6
+            elif escape == "'":
+                parts.append("'")
+                i += 2
+            elif not escape:
+                i += 1
+            else:
+                parts.append('\\\\')
+                i += 1
+        else:
+            parts.append(CONTROL_ESCAPES.get(c, f'\\u{ord(c):04x}'))
+            i += 1
+    parts.append('"')
+    return ''.join(parts), i
@@ -0,0 +1,247 @@
+"""Persistent, content-addressed cache of model responses.
+
+A response is stored under a hash of the model name, the generation config
+and the prompt with its whitespace normalized, so identical calls from any
+worker process on the host are answered from one SQLite file instead of the
+model. Entries expire after LLM_CACHE_TTL seconds, and the least recently
+used are dropped beyond LLM_CACHE_MAX_ENTRIES. To keep writes off the hot
+path, a hit only records its use when the last record is older than
+TOUCH_INTERVAL, and expiry and eviction run once every EVICT_EVERY stores,
+so the table can briefly hold that many rows over the limit.
+
+LLM_CACHE_MODE selects how ``CachedModel`` uses the cache:
+
+- ``on``: serve hits, call the model on a miss and store the response.
+- ``record``: always call the model and store the response, refreshing the cache.
+- ``replay``: serve only from the cache. A miss raises ReplayMissError and
+  the model is never called, so runs are offline and deterministic.
+- ``off``: call the model directly.
+
+Only response text is cached, and a failed call is never stored.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from resilience import ReplayMissError
+
+MODES = ('off', 'on', 'record', 'replay')
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Seconds between updates of a hit row's last-used time
+TOUCH_INTERVAL = 300
+# Stores between expiry and eviction sweeps
+EVICT_EVERY = 64
+
+
+def normalize_prompt(prompt):
+    """Return ``prompt`` with runs of whitespace collapsed, as the cache compares it."""
+    return WHITESPACE_RE.sub(' ', prompt).strip()
+
+
+def cache_key(model_name, prompt, generation_config=None):
+    """Return the content address of a call: a hash of the model, its config and the prompt."""
+    config = generation_config
+    if config is not None and not isinstance(config, dict):
+        # GenerationConfig objects hold their settings as attributes
+        config = getattr(config, '__dict__', repr(config))
+    payload = json.dumps([model_name, config, normalize_prompt(prompt)],
+                         sort_keys=True, ensure_ascii=False, default=repr)
+    return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+
+class CachedResponse:
+    """A response served from the cache; has the ``text`` the planner reads."""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class ResponseCache:
+    """SQLite store of response texts with a TTL and least-recently-used eviction."""
+
+    def __init__(self, path, ttl=7 * 24 * 3600, max_entries=10000, clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._puts = 0
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'stores': 0,
+            'errors': 0
+        }
+
+    def _connection(self):
+        """Return this thread's SQLite connection, reopening it after a fork."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, model TEXT NOT NULL, text TEXT NOT NULL, '
+                'created REAL NOT NULL, used REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS responses_used ON responses (used)')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def get(self, key):
+        """Return the cached text for ``key``, or None if it is missing or expired."""
+        now = self.clock()
+        try:
+            conn = self._connection()
+            row = conn.execute('SELECT text, created, used FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is not None and self.ttl and now - row[1] > self.ttl:
+                conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._count('expired')
+                row = None
+            if row is not None and now - row[2] > TOUCH_INTERVAL:
+                conn.execute('UPDATE responses SET used = ? WHERE key = ?', (now, key))
+        except sqlite3.Error:
+            self._count('errors')
+            row = None
+        self._count('hits' if row is not None else 'misses')
+        return row[0] if row is not None else None
+
+    def put(self, key, text, model_name=''):
+        """Store ``text`` under ``key``; every EVICT_EVERY stores, drop expired and least recently used rows."""
+        now = self.clock()
+        with self._lock:
+            self._puts += 1
+            sweep = self._puts % EVICT_EVERY == 1
+        try:
+            conn = self._connection()
+            conn.execute(
+                'INSERT OR REPLACE INTO responses (key, model, text, created, used) VALUES (?, ?, ?, ?, ?)',
+                (key, model_name, text, now, now)
+            )
+            if sweep:
+                self._evict(conn, now)
+        except sqlite3.Error:
+            self._count('errors')
+            return
+        self._count('stores')
+
+    def _evict(self, conn, now):
+        if self.ttl:
+            conn.execute('DELETE FROM responses WHERE created < ?', (now - self.ttl,))
+        conn.execute(
+            'DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY used '
+            'LIMIT max(0, (SELECT COUNT(*) FROM responses) - ?))',
+            (self.max_entries,)
+        )
+
+    def clear(self):
+        """Drop every stored response."""
+        try:
+            self._connection().execute('DELETE FROM responses')
+        except sqlite3.Error:
+            self._count('errors')
+
+    def get_stats(self):
+        """Return hit/miss counters and the number of stored responses."""
+        with self._lock:
+            stats = dict(self.stats, ttl=self.ttl, max_entries=self.max_entries)
+        try:
+            stats['size'] = self._connection().execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        except sqlite3.Error:
+            stats['size'] = None
+        return stats
+
+
+class CachedModel:
+    """Wraps a model so identical calls are answered from a ResponseCache."""
+
+    def __init__(self, model, cache, model_name, mode='on'):
+        if mode not in MODES:
+            raise ValueError(f"Unknown LLM_CACHE_MODE: {mode}")
+        self.model = model
+        self.cache = cache
+        self.model_name = model_name
+        self.mode = mode
+
+    @classmethod
+    def from_env(cls, model, model_name, default_mode='on'):
+        """Wrap ``model`` as configured by LLM_CACHE_* environment variables.
+
+        Returns ``model`` itself when the mode is ``off`` or no path is set.
+        """
+        mode = os.getenv('LLM_CACHE_MODE') or default_mode
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        path = os.getenv('LLM_CACHE_PATH', os.path.join(base_dir, 'llm_cache.sqlite3'))
+        if mode not in MODES:
+            raise ValueError(f"Unknown LLM_CACHE_MODE: {mode}")
+        if mode == 'replay' and not path:
+            raise ValueError("LLM_CACHE_MODE=replay needs LLM_CACHE_PATH")
+        if mode == 'off' or not path:
+            return model
+        cache = ResponseCache(
+            path,
+            ttl=float(os.getenv('LLM_CACHE_TTL', str(7 * 24 * 3600))),
+            max_entries=int(os.getenv('LLM_CACHE_MAX_ENTRIES', '10000'))
+        )
+        return cls(model, cache, model_name, mode)
+
+    def _lookup(self, prompt, generation_config):
+        """Return (key, cached response or None), raising on a replay miss."""
+        key = cache_key(self.model_name, prompt, generation_config)
+        if self.mode == 'record':
+            return key, None
+        text = self.cache.get(key)
+        if text is not None:
+            return key, CachedResponse(text)
+        if self.mode == 'replay':
+            raise ReplayMissError(f"No recorded response for prompt {key}")
+        return key, None
+
+    def _store(self, key, response):
+        try:
+            text = response.text
+        except ValueError:
+            # Blocked or empty candidates have no text; the caller sees the same error
+            return
+        self.cache.put(key, text, self.model_name)
+
+    def generate_content(self, prompt, generation_config=None, **kwargs):
+        key, cached = self._lookup(prompt, generation_config)
+        if cached is not None:
+            return cached
+        response = self.model.generate_content(prompt, generation_config=generation_config, **kwargs)
+        self._store(key, response)
+        return response
+
+    async def generate_content_async(self, prompt, generation_config=None, **kwargs):
+        # SQLite can wait on another process's lock; keep that off the shared event loop
+        key, cached = await asyncio.to_thread(self._lookup, prompt, generation_config)
+        if cached is not None:
+            return cached
+        if hasattr(self.model, 'generate_content_async'):
+            response = await self.model.generate_content_async(prompt, generation_config=generation_config, **kwargs)
+        else:
+            response = await asyncio.to_thread(self.model.generate_content, prompt,
+                                               generation_config=generation_config, **kwargs)
+        await asyncio.to_thread(self._store, key, response)
+        return response
+
+    def get_stats(self):
+        """Return the wrapped model's stats, if it keeps any, with the cache's."""
+        stats = self.model.get_stats() if hasattr(self.model, 'get_stats') else {}
+        return dict(stats, cache=dict(self.cache.get_stats(), mode=self.mode))
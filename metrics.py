@@ -0,0 +1,191 @@
+"""Per-stage latency histograms, counters and Server-Timing for the planning pipeline.
+
+Pipeline functions are wrapped with ``@timed('stage')``. Every call records
+its duration in that stage's histogram. While a request is being served,
+the duration is also added to the request's timings, which become its
+``Server-Timing`` header. ``render()`` returns everything in the Prometheus
+text exposition format.
+
+Counters are kept per process, so under gunicorn each worker reports its
+own. Set METRICS_ENABLED=0 to leave every stage unwrapped.
+"""
+import contextvars
+import functools
+import inspect
+import os
+import threading
+from bisect import bisect_left
+from collections import Counter
+from time import perf_counter
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') != '0'
+
+# Upper bounds in seconds: from a cached dictionary lookup up to a slow model call
+BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+           0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Stage name -> seconds for the request being served on this thread, or None outside a request
+_request_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+class Histogram:
+    """Bucket counts, sum and count of observed durations."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """Stage histograms, stage error counters and request counters for one process."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.stages = {}
+        self.errors = Counter()
+        self.requests = Counter()
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds, error=False):
+        """Record one call of ``stage`` and add it to the current request's timings."""
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            if error:
+                self.errors[stage] += 1
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + seconds
+
+    def count_request(self, endpoint, status):
+        with self._lock:
+            self.requests[(endpoint, status)] += 1
+
+    def render(self):
+        """Return every metric in the Prometheus text format (version 0.0.4)."""
+        with self._lock:
+            stages = {stage: (list(h.counts), h.sum, h.count) for stage, h in sorted(self.stages.items())}
+            errors = sorted(self.errors.items())
+            requests = sorted(self.requests.items())
+
+        lines = [
+            '# HELP planner_stage_duration_seconds Time spent in each pipeline stage.',
+            '# TYPE planner_stage_duration_seconds histogram'
+        ]
+        for stage, (counts, total, count) in stages.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'planner_stage_duration_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'planner_stage_duration_seconds_sum{{stage="{stage}"}} {total!r}')
+            lines.append(f'planner_stage_duration_seconds_count{{stage="{stage}"}} {count}')
+
+        lines += [
+            '# HELP planner_stage_errors_total Stage calls that raised an exception.',
+            '# TYPE planner_stage_errors_total counter'
+        ]
+        lines += [f'planner_stage_errors_total{{stage="{stage}"}} {count}' for stage, count in errors]
+
+        lines += [
+            '# HELP planner_requests_total HTTP requests by endpoint and status code.',
+            '# TYPE planner_requests_total counter'
+        ]
+        lines += [f'planner_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}'
+                  for (endpoint, status), count in requests]
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
+
+
+def timed(stage, registry=None):
+    """Decorate a function, coroutine function or generator function as pipeline ``stage``.
+
+    Generators are charged only for the time spent producing items, not for
+    the time the consumer holds each one.
+    """
+    def decorate(func):
+        if not METRICS_ENABLED:
+            return func
+        observe = (registry or metrics).observe
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception:
+                    observe(stage, perf_counter() - start, error=True)
+                    raise
+                observe(stage, perf_counter() - start)
+                return result
+
+        elif inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                generator = func(*args, **kwargs)
+                elapsed = 0.0
+                error = False
+                try:
+                    while True:
+                        start = perf_counter()
+                        try:
+                            item = next(generator)
+                        except StopIteration as stop:
+                            elapsed += perf_counter() - start
+                            return stop.value
+                        except Exception:
+                            elapsed += perf_counter() - start
+                            error = True
+                            raise
+                        elapsed += perf_counter() - start
+                        yield item
+                finally:
+                    generator.close()
+                    observe(stage, elapsed, error=error)
+
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception:
+                    observe(stage, perf_counter() - start, error=True)
+                    raise
+                observe(stage, perf_counter() - start)
+                return result
+
+        return wrapper
+    return decorate
+
+
+def start_request():
+    """Start collecting stage timings for the request served by this thread."""
+    _request_timings.set({})
+
+
+def finish_request():
+    """Stop collecting and return the request's stage timings in seconds."""
+    timings = _request_timings.get()
+    _request_timings.set(None)
+    return timings or {}
+
+
+def server_timing(timings, total=None):
+    """Format stage timings as a Server-Timing header value, durations in milliseconds."""
+    parts = [f"{stage};dur={seconds * 1e3:.3f}" for stage, seconds in timings.items()]
+    if total is not None:
+        parts.append(f"total;dur={total * 1e3:.3f}")
+    return ', '.join(parts)
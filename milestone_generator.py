@@ -1,43 +1,76 @@
-import os
 import json
 import re
-import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.tag import pos_tag
-from nltk.chunk import ne_chunk
-from nltk.corpus import stopwords
-import google.generativeai as genai
+from nltk.tokenize import sent_tokenize
 from dotenv import load_dotenv
-from flask import Flask, request, jsonify
-from datetime import datetime, timedelta
+from flask import Blueprint, Flask, Response, request, jsonify, stream_with_context, g
+from datetime import datetime, date
+from time import perf_counter
+from nltk_resources import ensure_resources
+from query_analysis import QueryAnalysis
+from plan_cache import PlanCache
+from plan_index import PlanIndex
+from plan_calendar import PlanCalendar
+from horizon import resolve_horizon, PLAN_MAX_ENTRIES
+from pagination import Page, parse_page, next_cursor
+from enrichment import ModelRunner
+from model_backend import create_model
+from llm_cache import CachedModel
+from resilience import CircuitBreaker, RetryPolicy
+from batch import iter_ndjson_queries, iter_ndjson_results
+from streaming import wants_stream, wants_sse, encode_events
+from serialization import plan_response
+from content_classifier import content_classifier
+from progression import progression, PROGRESSION_CURVE
+from prompts import render_plan_prompt, render_chunk_prompt
+from etags import plan_id, plan_day, is_fresh, tag, not_modified
+from json_repair import repair_json
+from metrics import metrics, timed, start_request, finish_request, server_timing
+from profiling import Profiler
+from content_catalog import (
+    copy_template, WEEKDAYS, MONTHS, MONTH_NUMBERS, CONTENT_TEMPLATES,
+    TEMPLATE_NESTED_KEYS, STUDY_DAY_FOCUS, STUDY_DEFAULT_FOCUS, STUDY_SCHEDULES, STUDY_TOPICS,
+    STUDY_RESOURCES, WORKOUT_EXERCISES, WORKOUT_EQUIPMENT, INTENSITY_LEVELS, WORKOUT_WEEK_FOCUS,
+    WORKOUT_QUARTER_FOCUS, MEAL_TASKS, MONTH_SEASONS, SEASONAL_TIPS, DEFAULT_MEAL_TIPS,
+    SEASONAL_FOODS, DEFAULT_SEASONAL_FOODS, FINANCE_COMMON_TASKS, FINANCE_MONTH_TASKS, DEFAULT_CONTENT
+)
+from vocabulary import (
+    TIME_MAPPINGS, TIME_UNITS, NUMERIC_TIME_PATTERN, WORD_NUMBER_TIME_PATTERN, TIME_PHRASES,
+    DAY_CONTEXT_WORDS, WEEK_CONTEXT_WORDS, COMPOUND_PERIODS, EXPLICIT_PERIODS, MULTI_DAY_WORDS
+)
 
-# Download required NLTK data
-nltk.download('punkt')
-nltk.download('averaged_perceptron_tagger')
-nltk.download('maxent_ne_chunker')
-nltk.download('words')
-nltk.download('stopwords')
+# Verify the pinned NLTK data (install it once with `python nltk_resources.py prepare-data`)
+ensure_resources()
 
 # Load environment variables
 load_dotenv()
 
-# Configure Gemini API
-genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
-model = genai.GenerativeModel('gemini-1.5-flash')
+# Configure the model (LLM_BACKEND=fake answers locally without a key)
+model = create_model()
 
-app = Flask(__name__)
+# Bounded, timed-out async model calls shared by every request
+model_runner = ModelRunner.from_env(model)
 
+# Retries and a shared breaker, so a failing upstream is skipped instead of waited on
+llm_retry = RetryPolicy.from_env()
+llm_breaker = CircuitBreaker.from_env()
+
+# Routes live on a blueprint so create_app() can build independent app instances
+planner = Blueprint('planner', __name__)
+
+# Deterministic plan entries shared across requests and worker processes
+plan_cache = PlanCache.from_env()
+
+# How to rebuild each plan served, by plan id, for GET /plans/<plan_id>
+plan_index = PlanIndex.from_env()
+
+# Opt-in profiles of generate_plan (PROFILE_ENABLED or an allow-listed X-Profile header)
+profiler = Profiler.from_env()
+
+@timed('analyze_query')
 def analyze_query(query):
     """Analyze the query using NLTK to extract key information."""
-    # Tokenize the query
-    tokens = word_tokenize(query)
-    # Get POS tags
-    pos_tags = pos_tag(tokens)
-    # Get named entities
-    named_entities = ne_chunk(pos_tags)
-    # Remove stopwords
-    stop_words = set(stopwords.words('english'))
-    filtered_tokens = [w for w in tokens if w.lower() not in stop_words]
+    analysis = QueryAnalysis.of(query)
+    pos_tags = analysis.pos_tags
     
     # Extract key components
     time_words = []
@@ -53,27 +86,19 @@ def analyze_query(query):
             time_words.append(token)
     
     return {
-        'tokens': tokens,
+        'tokens': analysis.tokens,
         'pos_tags': pos_tags,
-        'named_entities': named_entities,
-        'filtered_tokens': filtered_tokens,
+        'named_entities': analysis.named_entities,
+        'filtered_tokens': analysis.filtered_tokens,
         'time_words': time_words,
         'action_words': action_words,
         'subjects': subjects
     }
 
+@timed('clean_query')
 def clean_query(query):
     """Clean and normalize the input query using NLTK."""
-    # Tokenize and normalize
-    tokens = word_tokenize(query.lower())
-    # Remove stopwords
-    stop_words = set(stopwords.words('english'))
-    tokens = [w for w in tokens if w not in stop_words]
-    # Join back into a string
-    cleaned = ' '.join(tokens)
-    # Remove special characters but keep basic punctuation
-    cleaned = re.sub(r'[^\w\s.,!?-]', '', cleaned)
-    return cleaned
+    return QueryAnalysis.of(query).cleaned
 
 def extract_duration(query):
     """Extract duration information from the query."""
@@ -95,35 +120,17 @@ def extract_duration(query):
     
     return None, None
 
-def extract_time_context(query, pos_tags):
+def extract_time_context(query, pos_tags=None):
     """Extract detailed time context from the query using NLTK analysis."""
-    # Common time-related words and their mappings
-    time_mappings = {
-        'daily': 'day',
-        'tomorrow': 'day',
-        'today': 'day',
-        'weekly': 'week',
-        'monthly': 'month',
-        'yearly': 'year',
-        'annual': 'year'
-    }
-    
-    # Time unit patterns
-    time_units = {
-        'day': ['day', 'days', 'daily', 'tomorrow', 'today'],
-        'week': ['week', 'weeks', 'weekly', '7-day', 'seven-day'],
-        'month': ['month', 'months', 'monthly', '30-day', 'thirty-day'],
-        'year': ['year', 'years', 'yearly', 'annual', 'annually']
-    }
-    
-    # Extract time-related phrases using POS tags
-    time_phrases = []
-    query_lower = query.lower()
+    analysis = QueryAnalysis.of(query)
+    # Only the words matter here, so reuse the shared tokens instead of tagging
+    words = [word.lower() for word, tag in pos_tags] if pos_tags is not None else analysis.lower_tokens
+    query_lower = analysis.lower
     
     # Look for numeric time patterns first (e.g., "7 day", "30 day", etc.)
     numeric_patterns = [
-        (r'(\d+)[\s-]*(day|week|month|year)s?', lambda m: (m.group(2), int(m.group(1)))),
-        (r'(seven|thirty)[\s-]*(day|week|month)s?', lambda m: (m.group(2), 7 if m.group(1) == 'seven' else 30))
+        (NUMERIC_TIME_PATTERN, lambda m: (m.group(2), int(m.group(1)))),
+        (WORD_NUMBER_TIME_PATTERN, lambda m: (m.group(2), 7 if m.group(1) == 'seven' else 30))
     ]
     
     for pattern, handler in numeric_patterns:
@@ -137,19 +144,17 @@ def extract_time_context(query, pos_tags):
             return unit
     
     # Extract time-related words and their context
-    for i, (word, tag) in enumerate(pos_tags):
-        word_lower = word.lower()
-        
+    for i, word_lower in enumerate(words):
         # Direct mapping check
-        if word_lower in time_mappings:
-            return time_mappings[word_lower]
+        if word_lower in TIME_MAPPINGS:
+            return TIME_MAPPINGS[word_lower]
         
         # Check for time units
-        for unit, variants in time_units.items():
+        for unit, variants in TIME_UNITS.items():
             if word_lower in variants:
                 # Look for modifiers before the time word
                 if i > 0:
-                    prev_word = pos_tags[i-1][0].lower()
+                    prev_word = words[i-1]
                     if prev_word.isdigit():
                         if int(prev_word) == 7 and unit == 'day':
                             return 'week'
@@ -158,65 +163,49 @@ def extract_time_context(query, pos_tags):
                 return unit
     
     # Check for specific phrases
-    phrases = [
-        ('next week', 'week'),
-        ('this month', 'month'),
-        ('this year', 'year'),
-        ('daily routine', 'day'),
-        ('weekly plan', 'week'),
-        ('monthly schedule', 'month'),
-        ('yearly goals', 'year')
-    ]
-    
-    for phrase, period in phrases:
+    for phrase, period in TIME_PHRASES:
         if phrase in query_lower:
             return period
     
     # Default based on query context
-    if any(word in query_lower for word in ['routine', 'today', 'tomorrow', 'schedule']):
+    if any(word in query_lower for word in DAY_CONTEXT_WORDS):
         return 'day'
-    if any(word in query_lower for word in ['weekend', 'weekly']):
+    if any(word in query_lower for word in WEEK_CONTEXT_WORDS):
         return 'week'
     
     # Default to week as it's the most common planning period
     return 'week'
 
+@timed('detect_time_period')
 def detect_time_period(query):
     """Detect the time period from the query using improved NLTK analysis."""
-    # Tokenize and get POS tags
-    tokens = word_tokenize(query)
-    pos_tags = pos_tag(tokens)
+    analysis = QueryAnalysis.of(query)
     
     # Extract time context
-    time_period = extract_time_context(query, pos_tags)
+    time_period = extract_time_context(analysis)
     
     # Additional validation
-    query_lower = query.lower()
+    query_lower = analysis.lower
     
     # Check for compound time words
-    if any(pattern in query_lower for pattern in ['week long', 'week-long', 'weekly']):
-        time_period = 'week'
-    elif any(pattern in query_lower for pattern in ['month long', 'month-long', 'monthly']):
-        time_period = 'month'
-    elif any(pattern in query_lower for pattern in ['year long', 'year-long', 'yearly', 'annual']):
-        time_period = 'year'
-    elif any(pattern in query_lower for pattern in ['daily', 'day long', 'day-long', "tomorrow's", "today's"]):
-        time_period = 'day'
+    for period, patterns in COMPOUND_PERIODS:
+        if any(pattern in query_lower for pattern in patterns):
+            time_period = period
+            break
     
     # Override for explicit patterns
-    if '7 day' in query_lower or 'seven day' in query_lower or '7-day' in query_lower:
-        time_period = 'week'
-    elif '30 day' in query_lower or 'thirty day' in query_lower or '30-day' in query_lower:
-        time_period = 'month'
-    elif '365 day' in query_lower or 'year long' in query_lower:
-        time_period = 'year'
+    for period, patterns in EXPLICIT_PERIODS:
+        if any(pattern in query_lower for pattern in patterns):
+            time_period = period
+            break
     
     # Default to week for workout/diet/study plans if no specific time is mentioned
     if time_period == 'day':
-        if any(word in query_lower for word in ['workout', 'diet', 'meal', 'study', 'learn']):
+        if any(word in query_lower for word in MULTI_DAY_WORDS):
             time_period = 'week'
     
-    return time_period
+    # Long horizons ("24-month", "3-year daily") pick the period whose entries they count
+    return resolve_horizon(time_period, query_lower)[0]
 
 def structure_output(plan_data):
     """Structure the output using NLTK for better organization."""
@@ -303,159 +292,213 @@ def format_output(plan, time_period):
 
 def get_date_for_entry(time_period, period_name):
     """Generate appropriate date for an entry based on time period."""
-    today = datetime.now()
-    
-    if time_period == 'week':
-        # Map day names to weekday numbers (0 = Monday)
-        day_map = {
-            'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
-            'Friday': 4, 'Saturday': 5, 'Sunday': 6
-        }
-        target_day = day_map.get(period_name, 0)
-        current_day = today.weekday()
-        days_ahead = target_day - current_day
-        
-        if days_ahead <= 0:  # Target day has passed this week
-            days_ahead += 7  # Move to next week
-            
-        target_date = today + timedelta(days=days_ahead)
-        return target_date.strftime("%Y-%m-%d")
-        
-    elif time_period == 'month':
-        # For monthly plans, set dates to start of each week
-        week_num = int(period_name.split()[1])  # Extract week number
-        days_ahead = (week_num - 1) * 7  # Each week starts 7 days after the previous
-        target_date = today + timedelta(days=days_ahead)
-        return f"{target_date.strftime('%Y-%m-%d')} to {(target_date + timedelta(days=6)).strftime('%Y-%m-%d')}"
-        
-    elif time_period == 'year':
-        # For yearly plans, set dates to start of each month
-        month_names = {
-            'January': 1, 'February': 2, 'March': 3, 'April': 4,
-            'May': 5, 'June': 6, 'July': 7, 'August': 8,
-            'September': 9, 'October': 10, 'November': 11, 'December': 12
-        }
-        target_month = month_names.get(period_name, 1)
-        target_year = today.year if target_month >= today.month else today.year + 1
-        start_date = datetime(target_year, target_month, 1)
-        
-        # Get the last day of the month
-        if target_month == 12:
-            end_date = datetime(target_year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = datetime(target_year, target_month + 1, 1) - timedelta(days=1)
-            
-        return f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
-    
-    # For daily plans or fallback
-    return today.strftime("%Y-%m-%d")
+    return PlanCalendar().date_for(time_period, period_name)
 
-def generate_time_content(query, time_period, analysis):
-    """Generate time-specific content using NLTK analysis."""
-    # Create base structure for the plan
-    base_structure = {
-        "period": time_period,
-        "title": query.strip().title(),
-        "entries": []
-    }
+def detect_duration(query):
+    """Detect how many entries the query's horizon asks for (0 for the period's default)."""
+    return resolve_horizon(None, QueryAnalysis.of(query).lower)[1]
 
-    # Extract duration from query
-    query_lower = query.lower()
-    duration = 0
-    for num in ['one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten', '1', '2', '3', '4', '5', '6', '7', '8', '9', '10']:
-        if num in query_lower:
-            duration = int(num) if num.isdigit() else {
-                'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
-                'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
-            }[num]
-            break
+def detect_content_type(query):
+    """Detect the kind of plan the query asks for."""
+    return content_classifier.classify(query)[0]
 
-    # Determine content type and initial values
-    content_type = "general"
-    initial_values = {}
-    if any(word in query_lower for word in ["workout", "fitness", "exercise", "training", "gym"]):
-        content_type = "workout"
-        initial_values = {
+def get_initial_values(content_type):
+    """Return the starting targets that a plan of this type progresses from."""
+    if content_type == "workout":
+        return {
             "calories_target": "2500",
             "workout_duration": "45-60",
             "intensity_level": "moderate"
         }
-    elif any(word in query_lower for word in ["study", "learn", "practice", "education", "course", "ielts", "coding"]):
-        content_type = "study"
-        initial_values = {
+    elif content_type == "study":
+        return {
             "daily_hours": "4",
             "practice_sessions": "3",
             "review_frequency": "weekly"
         }
-    elif any(word in query_lower for word in ["diet", "meal", "food", "nutrition", "protein", "vegetarian"]):
-        content_type = "meal"
-        initial_values = {
+    elif content_type == "meal":
+        return {
             "daily_calories": "2000",
             "protein_target": "150",
             "carbs_target": "250",
             "fats_target": "70"
         }
-    elif any(word in query_lower for word in ["budget", "savings", "financial", "money", "finance"]):
-        content_type = "finance"
-        initial_values = {
+    elif content_type == "finance":
+        return {
             "monthly_savings": "20%",
             "emergency_fund": "6 months",
             "investment_ratio": "30%"
         }
+    return {}
 
-    # Generate entries based on time period with progressive changes
+def generate_time_content(query, time_period, analysis, content_type=None, duration=None, calendar=None, page=None):
+    """Generate time-specific content using NLTK analysis."""
+    return collect_plan(iter_time_content(query, time_period, analysis, content_type, duration, calendar, page))
+
+# Buffered and streamed plans both run through here, so the stage is timed on the generator
+@timed('generate_time_content')
+def iter_time_content(query, time_period, analysis, content_type=None, duration=None, calendar=None, page=None):
+    """Yield the plan header first, then each entry as soon as it is built.
+
+    With a ``page``, only entries ``page.offset`` to ``page.offset + page.limit``
+    are built and the header also carries ``total_entries``.
+    """
+    # Read the clock once, so every entry and the cache key agree on the day
+    calendar = calendar or PlanCalendar()
+
+    # Create base structure for the plan
+    base_structure = {
+        "period": time_period,
+        "title": query.strip().title()
+    }
+
+    # Use the values resolved by the caller, detecting them from the query otherwise
+    query_lower = query.lower()
+    if duration is None:
+        duration = detect_duration(query_lower)
+    if content_type is None:
+        content_type = detect_content_type(query_lower)
+    num_entries = get_entry_count(time_period, duration)
+    start, stop = 0, None
+    if page is not None:
+        start, stop = page.offset, page.offset + page.limit
+        base_structure["total_entries"] = num_entries
+    yield base_structure
+
+    # Entries only depend on the canonical inputs, so reuse them across queries and workers
+    cache_key = (time_period, content_type, num_entries, PROGRESSION_CURVE)
+    if page is not None:
+        cache_key += (start, stop)
+    entries = plan_cache.get(cache_key, day=calendar.day)
+    if entries is not None:
+        yield from entries
+        return
+    entries = []
+    for entry in iter_entries(time_period, content_type, num_entries, calendar, start, stop):
+        entries.append(entry)
+        yield entry
+    plan_cache.put(cache_key, entries, day=calendar.day)
+
+def collect_plan(content):
+    """Assemble a full plan from a header-then-entries stream."""
+    plan = next(content)
+    plan["entries"] = list(content)
+    return plan
+
+def get_entry_count(time_period, duration):
+    """Return how many entries a plan of this period and duration has."""
     if time_period == 'week':
-        days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        for i, day in enumerate(days):
+        count = duration if duration > 0 else 7
+    elif time_period == 'month':
+        count = duration if duration > 0 else 4
+    elif time_period == 'year':
+        count = duration if duration > 0 else 12
+    else:
+        return 1
+    return min(count, PLAN_MAX_ENTRIES)
+
+def create_entries(time_period, content_type, num_entries, calendar=None, start=0, stop=None):
+    """Build the progressive entries for a plan."""
+    return list(iter_entries(time_period, content_type, num_entries, calendar, start, stop))
+
+def iter_entries(time_period, content_type, num_entries, calendar=None, start=0, stop=None):
+    """Yield entries ``start:stop`` of a plan one at a time.
+
+    Each entry depends only on its index, so a page is built without the
+    entries before it.
+    """
+    initial_values = get_initial_values(content_type)
+    calendar = calendar or PlanCalendar()
+    stop = num_entries if stop is None else min(stop, num_entries)
+    # Every numeric value of the page in one vectorized pass; entries only format them
+    series = progression(content_type, num_entries, initial_values, start, stop)
+
+    # Generate entries based on time period with progressive changes
+    if time_period == 'week' and num_entries == 7:
+        days = WEEKDAYS
+        dates = calendar.entry_dates(time_period, stop, start)
+        for i in range(start, stop):
+            day = days[i]
             entry = {
                 "period": "day",
                 "periodName": day,
-                "date": get_date_for_entry(time_period, day),
+                "date": dates[i - start],
                 "title": f"{day}'s Focus",
-                "description": create_progressive_content(content_type, i + 1, len(days), initial_values)
+                "description": create_progressive_content(content_type, i + 1, len(days), initial_values,
+                                                          values=series[i - start])
             }
-            base_structure["entries"].append(entry)
+            yield entry
+    
+    elif time_period == 'week':
+        # Horizons other than one week are planned as consecutive days from today
+        dates = calendar.entry_dates('days', stop, start)
+        for i in range(start, stop):
+            day_name = f"Day {i + 1}"
+            entry = {
+                "period": "day",
+                "periodName": day_name,
+                "date": dates[i - start],
+                "title": f"{day_name} Focus",
+                "description": create_progressive_content(content_type, i + 1, num_entries, initial_values,
+                                                          values=series[i - start])
+            }
+            yield entry
             
     elif time_period == 'month':
-        num_weeks = duration if duration > 0 else 4
-        for week_num in range(1, num_weeks + 1):
+        dates = calendar.entry_dates(time_period, stop, start)
+        for week_num in range(start + 1, stop + 1):
             week_name = f"Week {week_num}"
             entry = {
                 "period": "week",
                 "periodName": week_name,
-                "date": get_date_for_entry(time_period, week_name),
+                "date": dates[week_num - 1 - start],
                 "title": f"{week_name} Focus",
-                "description": create_progressive_content(content_type, week_num, num_weeks, initial_values)
+                "description": create_progressive_content(content_type, week_num, num_entries, initial_values,
+                                                          values=series[week_num - 1 - start])
             }
-            base_structure["entries"].append(entry)
+            yield entry
             
-    elif time_period == 'year':
-        months = ['January', 'February', 'March', 'April', 'May', 'June', 
-                 'July', 'August', 'September', 'October', 'November', 'December']
-        num_months = duration if duration > 0 else 12
-        months = months[:num_months]  # Limit months if duration specified
+    elif time_period == 'year' and num_entries == 12:
+        dates = calendar.entry_dates(time_period, stop, start)
         
-        for i, month in enumerate(months):
+        for i in range(start, stop):
+            month = MONTHS[i]
             entry = {
                 "period": "month",
                 "periodName": month,
-                "date": get_date_for_entry(time_period, month),
+                "date": dates[i - start],
                 "title": f"{month} Focus",
-                "description": create_progressive_content(content_type, i + 1, len(months), initial_values, month)
+                "description": create_progressive_content(content_type, i + 1, num_entries, initial_values, month,
+                                                          values=series[i - start])
+            }
+            yield entry
+    
+    elif time_period == 'year':
+        # Other horizons are planned as consecutive months from this one, named with their year
+        dates = calendar.entry_dates('months', stop, start)
+        for i in range(start, stop):
+            year, month_num = dates[i - start][:4], int(dates[i - start][5:7])
+            month = MONTHS[month_num - 1]
+            month_name = f"{month} {year}"
+            entry = {
+                "period": "month",
+                "periodName": month_name,
+                "date": dates[i - start],
+                "title": f"{month_name} Focus",
+                "description": create_progressive_content(content_type, i + 1, num_entries, initial_values, month,
+                                                          values=series[i - start])
             }
-            base_structure["entries"].append(entry)
+            yield entry
             
-    else:  # day
+    elif start < stop:  # day
         entry = {
             "period": "day",
             "periodName": "Today",
-            "date": get_date_for_entry(time_period, "Today"),
+            "date": calendar.entry_dates(time_period, 1)[0],
             "title": "Today's Focus",
-            "description": create_progressive_content(content_type, 1, 1, initial_values)
+            "description": create_progressive_content(content_type, 1, 1, initial_values, values=series[0])
         }
-        base_structure["entries"].append(entry)
-
-    return base_structure
+        yield entry
 
 def is_default_content(description, content_type):
     """Check if content contains only default values."""
@@ -467,130 +510,27 @@ def is_default_content(description, content_type):
         return all(v == "0" for v in goals.values())
     return False
 
-def create_progressive_content(content_type, current_period, total_periods, initial_values, period_name=''):
+def create_progressive_content(content_type, current_period, total_periods, initial_values, period_name='',
+                               values=None):
     """Create content that progresses over time."""
     base = create_content_template(content_type)
     
-    # Calculate progression factor (0.0 to 1.0)
-    progress = current_period / total_periods
+    # Numbers come precomputed from the plan's progression; a single entry computes its own
+    if values is None:
+        values = progression(content_type, total_periods, initial_values, current_period - 1, current_period)[0]
+    progress = values['progress']
     
     if content_type == "study":
-        # Define IELTS study components
-        study_components = {
-            "reading": [
-                "Skimming and scanning practice",
-                "Reading for detail",
-                "Time management strategies",
-                "Multiple choice questions",
-                "True/False/Not Given",
-                "Matching headings"
-            ],
-            "writing": [
-                "Task 1 - Data interpretation",
-                "Task 1 - Process description",
-                "Task 2 - Essay structure",
-                "Task 2 - Argument development",
-                "Grammar and vocabulary",
-                "Coherence and cohesion"
-            ],
-            "listening": [
-                "Note completion",
-                "Multiple choice",
-                "Map/Plan completion",
-                "Form filling",
-                "Sentence completion",
-                "Summary completion"
-            ],
-            "speaking": [
-                "Part 1 - Personal questions",
-                "Part 2 - Long turn",
-                "Part 3 - Discussion",
-                "Pronunciation practice",
-                "Fluency development",
-                "Vocabulary building"
-            ]
-        }
-
         # Set daily focus areas based on the day of the week
-        if period_name in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
-            day_focus = {
-                'Monday': ('reading', 'writing'),
-                'Tuesday': ('listening', 'speaking'),
-                'Wednesday': ('writing', 'reading'),
-                'Thursday': ('speaking', 'listening'),
-                'Friday': ('reading', 'listening'),
-                'Saturday': ('writing', 'speaking'),
-                'Sunday': ('review', 'practice_test')
-            }
-            focus_areas = day_focus[period_name]
-        else:
-            focus_areas = ('all_skills', 'review')
-
-        # Create schedule based on focus areas
-        morning_schedule = []
-        afternoon_schedule = []
-        evening_schedule = []
-        
-        if focus_areas[0] == 'review':
-            # Sunday review schedule
-            morning_schedule = [
-                "Review previous week's materials - 1 hour",
-                "Practice test (Reading) - 1 hour",
-                "Practice test (Writing Task 1) - 1 hour"
-            ]
-            afternoon_schedule = [
-                "Practice test (Listening) - 1 hour",
-                "Practice test (Writing Task 2) - 1 hour",
-                "Review and mark practice tests - 1 hour"
-            ]
-            evening_schedule = [
-                "Speaking practice with study partner - 30 mins",
-                "Plan next week's study goals - 30 mins",
-                "Review weak areas identified in practice tests - 1 hour"
-            ]
-        else:
-            # Regular day schedule
-            if focus_areas[0] in study_components:
-                morning_schedule = [
-                    f"{focus_areas[0].title()} skill: {component} - 45 mins"
-                    for component in study_components[focus_areas[0]][:2]
-                ]
-                morning_schedule.append("Vocabulary building - 30 mins")
-            
-            if focus_areas[1] in study_components:
-                afternoon_schedule = [
-                    f"{focus_areas[1].title()} skill: {component} - 45 mins"
-                    for component in study_components[focus_areas[1]][:2]
-                ]
-                afternoon_schedule.append("Grammar practice - 30 mins")
-            
-            evening_schedule = [
-                "Review day's learning - 30 mins",
-                "Practice exercises - 45 mins",
-                "Prepare for tomorrow's topics - 15 mins"
-            ]
+        focus_areas = STUDY_DAY_FOCUS.get(period_name, STUDY_DEFAULT_FOCUS)
 
-        # Update base content
+        # Schedules and topics are prebuilt per focus; only the goals depend on progress
         base.update({
-            "schedule": {
-                "morning": morning_schedule,
-                "afternoon": afternoon_schedule,
-                "evening": evening_schedule
-            },
-            "topics": [
-                f"Focus 1: {focus_areas[0].replace('_', ' ').title()}",
-                f"Focus 2: {focus_areas[1].replace('_', ' ').title()}",
-                "Vocabulary and Grammar Development"
-            ],
-            "resources": [
-                "Cambridge IELTS Practice Tests",
-                "IELTS Official Guide",
-                "Online practice platform",
-                "Study timer/stopwatch",
-                "Note-taking materials"
-            ],
+            "schedule": dict(STUDY_SCHEDULES[focus_areas]),
+            "topics": STUDY_TOPICS[focus_areas],
+            "resources": STUDY_RESOURCES,
             "goals": [
-                f"Complete {focus_areas[0].title()} exercises with {int(70 + (progress * 20))}% accuracy",
+                f"Complete {focus_areas[0].title()} exercises with {values['accuracy']}% accuracy",
                 f"Practice {focus_areas[1].title()} for at least 2 hours",
                 "Learn and use 10 new vocabulary words",
                 "Complete all planned practice sessions"
@@ -598,51 +538,9 @@ def create_progressive_content(content_type, current_period, total_periods, init
         })
         
     elif content_type == "workout":
-        # Define exercise categories and progression
-        base_exercises = {
-            "warmup": [
-                "Dynamic stretching - 5 mins",
-                "Light jogging in place - 5 mins",
-                "Arm circles and leg swings - 2 mins"
-            ],
-            "cardio": [
-                "Jumping jacks - 1 min",
-                "High knees - 30 secs",
-                "Mountain climbers - 30 secs",
-                "Burpees - 30 secs"
-            ],
-            "strength": [
-                "Push-ups - 10 reps",
-                "Bodyweight squats - 15 reps",
-                "Lunges - 10 each leg",
-                "Plank hold - 30 secs"
-            ],
-            "cooldown": [
-                "Static stretching - 5 mins",
-                "Deep breathing - 2 mins",
-                "Light walking - 3 mins"
-            ]
-        }
-
-        # Adjust intensity based on progression
-        intensity_levels = ["Light", "Light-Moderate", "Moderate", "Moderate-High", "High"]
-        current_intensity = intensity_levels[min(int(progress * 5), 4)]
-        
-        # Adjust exercise difficulty based on progress
-        if progress > 0.3:
-            base_exercises["strength"] = [
-                "Push-ups - 15 reps",
-                "Jump squats - 20 reps",
-                "Walking lunges - 15 each leg",
-                "Plank hold - 45 secs"
-            ]
-        if progress > 0.6:
-            base_exercises["strength"] = [
-                "Diamond push-ups - 12 reps",
-                "Pistol squats - 8 each leg",
-                "Jump lunges - 12 each leg",
-                "Plank with shoulder taps - 45 secs"
-            ]
+        # Adjust intensity and exercise difficulty based on progression
+        current_intensity = INTENSITY_LEVELS[values['intensity']]
+        level = values['level']
 
         # Set default focus
         focus = "General Fitness"
@@ -651,66 +549,28 @@ def create_progressive_content(content_type, current_period, total_periods, init
         if period_name:
             if period_name.startswith('Week'):
                 week_num = int(period_name.split()[1])
-                focus_areas = {
-                    1: "Form and Technique",
-                    2: "Building Endurance",
-                    3: "Strength Development",
-                    4: "High-Intensity Training"
-                }
-                focus = focus_areas.get(week_num, "Maintenance")
-            else:  # Monthly
-                month_names = ['January', 'February', 'March', 'April', 'May', 'June', 
-                           'July', 'August', 'September', 'October', 'November', 'December']
-                try:
-                    month_num = month_names.index(period_name)
-                    if month_num < 3:
-                        focus = "Building Foundation"
-                    elif month_num < 6:
-                        focus = "Strength and Endurance"
-                    elif month_num < 9:
-                        focus = "Power and Performance"
-                    else:
-                        focus = "Peak Performance"
-                except ValueError:
-                    focus = "General Fitness"
-
-        # Combine exercises based on focus
-        exercises = []
-        exercises.extend(base_exercises["warmup"])
-        exercises.extend(base_exercises["cardio"])
-        exercises.extend(base_exercises["strength"])
-        exercises.extend(base_exercises["cooldown"])
+                focus = WORKOUT_WEEK_FOCUS.get(week_num, "Maintenance")
+            elif period_name in MONTH_NUMBERS:
+                focus = WORKOUT_QUARTER_FOCUS[(MONTH_NUMBERS[period_name] - 1) // 3]
 
         # Update base content
         base.update({
-            "exercises": exercises,
-            "duration": f"{45 + int(progress * 15)} minutes",
+            "exercises": WORKOUT_EXERCISES[level],
+            "duration": f"{values['minutes']} minutes",
             "intensity": current_intensity,
-            "equipment": [
-                "Exercise mat",
-                "Water bottle",
-                "Timer/stopwatch",
-                "Resistance bands" if progress > 0.3 else None,
-                "Dumbbells (optional)" if progress > 0.6 else None
-            ],
+            "equipment": WORKOUT_EQUIPMENT[level],
             "notes": [
                 f"Focus area: {focus}",
-                f"Target heart rate: {110 + int(progress * 40)}-{130 + int(progress * 40)} BPM",
+                f"Target heart rate: {values['bpm_low']}-{values['bpm_high']} BPM",
                 "Rest 30-60 seconds between exercises",
                 "Maintain proper form throughout",
-                f"Progress to next level when current exercises feel comfortable"
+                "Progress to next level when current exercises feel comfortable"
             ]
         })
-
-        # Clean up None values from equipment list
-        base["equipment"] = [item for item in base["equipment"] if item is not None]
         
     elif content_type == "meal":
-        # Adjust macros based on progression
-        protein = int(initial_values['protein_target']) + int(10 * progress)
-        carbs = int(initial_values['carbs_target']) - int(20 * progress)
-        fats = int(initial_values['fats_target'])
-        calories = int(initial_values['daily_calories']) + int(100 * progress)
+        # Macros adjusted by the progression
+        protein, carbs, fats, calories = values['protein'], values['carbs'], values['fats'], values['calories']
         
         base['macros'].update({
             "protein_target": f"{protein}g",
@@ -731,7 +591,7 @@ def create_progressive_content(content_type, current_period, total_periods, init
             "protein": [
                 f"Target {protein}g protein daily",
                 "Space protein intake throughout the day",
-                f"Minimum {int(protein/4)}g protein per main meal"
+                f"Minimum {values['protein_per_meal']}g protein per main meal"
             ],
             "carbs": [
                 f"Target {carbs}g complex carbs daily",
@@ -746,40 +606,22 @@ def create_progressive_content(content_type, current_period, total_periods, init
         })
         
         # Add monthly tasks
-        base['tasks'] = [
-            f"Week 1: Meal prep and grocery planning",
-            f"Week 2: Review and adjust portions based on progress",
-            f"Week 3: Try new recipes with seasonal ingredients",
-            f"Week 4: Monthly progress assessment and adjustments"
-        ]
+        base['tasks'] = MEAL_TASKS
         
-        # Add contextual tips
-        if period_name:
-            seasonal_tips = {
-                'winter': ["Boost vitamin D intake", "Include warming foods", "Focus on immune support"],
-                'spring': ["Incorporate fresh greens", "Lighter cooking methods", "Seasonal produce focus"],
-                'summer': ["Stay hydrated", "Light, cooling meals", "Grill and fresh prep"],
-                'fall': ["Boost fiber intake", "Hearty, warming dishes", "Immune system support"]
-            }
-            season = get_season(period_name)
-            base['tips'] = seasonal_tips.get(season, ["Stay consistent with portions", "Track macros daily", "Prep meals in advance"])
-        
-        # Adjust meals based on season if period_name is a month
+        # Add contextual tips and adjust meals based on season if period_name is a month
         if period_name:
+            base['tips'] = SEASONAL_TIPS.get(get_season(period_name), DEFAULT_MEAL_TIPS)
             seasonal_foods = get_seasonal_foods(period_name)
             base['meals'] = create_varied_meal_plan(seasonal_foods, protein, period_name)
             
     elif content_type == "finance":
         # Progressive financial targets
-        monthly_savings = float(initial_values['monthly_savings'].rstrip('%'))
-        savings_target = monthly_savings + (5 * progress)
-        investment_ratio = float(initial_values['investment_ratio'].rstrip('%'))
-        investment_target = investment_ratio + (10 * progress)
+        savings_target, investment_target = values['savings'], values['investment']
         
         base['goals'].update({
             "savings_target": f"{savings_target:.1f}%",
             "investment_allocation": f"{investment_target:.1f}%",
-            "expense_reduction": f"{5 + (5 * progress):.1f}%"
+            "expense_reduction": f"{values['expense_reduction']:.1f}%"
         })
         
         # Update tracking metrics
@@ -795,34 +637,11 @@ def create_progressive_content(content_type, current_period, total_periods, init
 
 def get_season(month):
     """Determine season based on month."""
-    seasons = {
-        'winter': ['December', 'January', 'February'],
-        'spring': ['March', 'April', 'May'],
-        'summer': ['June', 'July', 'August'],
-        'fall': ['September', 'October', 'November']
-    }
-    for season, months in seasons.items():
-        if month in months:
-            return season
-    return 'summer'  # default
+    return MONTH_SEASONS.get(month, 'summer')  # default summer
 
 def get_seasonal_foods(month):
     """Get seasonal foods for each month."""
-    seasonal_map = {
-        'January': ['root vegetables', 'citrus fruits', 'winter greens'],
-        'February': ['winter squash', 'potatoes', 'citrus fruits'],
-        'March': ['spring greens', 'asparagus', 'early berries'],
-        'April': ['peas', 'asparagus', 'spring onions'],
-        'May': ['strawberries', 'new potatoes', 'spring vegetables'],
-        'June': ['summer berries', 'leafy greens', 'early tomatoes'],
-        'July': ['tomatoes', 'summer squash', 'stone fruits'],
-        'August': ['corn', 'tomatoes', 'melons'],
-        'September': ['apples', 'pears', 'fall squash'],
-        'October': ['pumpkins', 'apples', 'root vegetables'],
-        'November': ['winter squash', 'root vegetables', 'cranberries'],
-        'December': ['winter citrus', 'root vegetables', 'winter greens']
-    }
-    return seasonal_map.get(month, ['vegetables', 'fruits', 'proteins'])
+    return SEASONAL_FOODS.get(month, DEFAULT_SEASONAL_FOODS)
 
 def create_varied_meal_plan(seasonal_foods, protein_target, month):
     """Create a varied meal plan incorporating seasonal foods."""
@@ -870,315 +689,78 @@ def create_varied_meal_plan(seasonal_foods, protein_target, month):
 
 def create_financial_tasks(period_num, period_name=''):
     """Create specific financial tasks based on the period."""
-    common_tasks = [
-        "Review and categorize expenses",
-        "Update budget tracking spreadsheet",
-        "Check progress on savings goals"
-    ]
-    
     if period_name:  # Monthly tasks
-        month_specific = {
-            'January': ["Set annual financial goals", "Review previous year's performance"],
-            'April': ["Prepare tax documents", "Review Q1 performance"],
-            'July': ["Mid-year financial review", "Adjust investment strategy"],
-            'October': ["Q4 planning", "Holiday budget preparation"]
-        }
-        return month_specific.get(period_name, common_tasks)
+        return FINANCE_MONTH_TASKS.get(period_name, FINANCE_COMMON_TASKS)
     
-    return common_tasks
+    return FINANCE_COMMON_TASKS
 
 def create_content_template(content_type):
     """Create a content template based on the type."""
-    if content_type == "workout":
-        return {
-            "exercises": [],
-            "duration": "45-60 minutes",
-            "intensity": "Moderate",
-            "equipment": [],
-            "notes": []
-        }
-    elif content_type == "study":
-        return {
-            "topics": [],
-            "schedule": {
-                "morning": [],
-                "afternoon": [],
-                "evening": []
-            },
-            "resources": [],
-            "goals": []
-        }
-    elif content_type == "meal":
-        return {
-            "meals": {
-                "breakfast": [],
-                "lunch": [],
-                "dinner": [],
-                "snacks": []
-            },
-            "nutrients": {
-                "protein": [],
-                "carbs": [],
-                "fats": []
-            },
-            "macros": {
-                "protein_target": "0g",
-                "carbs_target": "0g",
-                "fats_target": "0g",
-                "total_calories": "0"
-            },
-            "tasks": [],
-            "tips": [],
-            "tracking": {
-                "weight": "",
-                "protein_intake": "",
-                "water_intake": ""
-            }
-        }
-    elif content_type == "finance":
-        return {
-            "budget": {
-                "income": [],
-                "expenses": [],
-                "savings": []
-            },
-            "goals": {
-                "savings_target": "0",
-                "expense_reduction": "0",
-                "investment_allocation": "0"
-            },
-            "tracking": {
-                "current_balance": "",
-                "savings_progress": "",
-                "expense_categories": []
-            },
-            "tasks": [],
-            "tips": []
-        }
-    else:
-        return {
-            "tasks": [],
-            "schedule": {
-                "morning": [],
-                "afternoon": [],
-                "evening": []
-            },
-            "goals": [],
-            "notes": []
-        }
+    if content_type not in CONTENT_TEMPLATES:
+        content_type = "general"
+    return copy_template(CONTENT_TEMPLATES[content_type], TEMPLATE_NESTED_KEYS[content_type])
 
 def create_prompt(query, time_period, content_type, base_structure):
     """Create a prompt for the model to generate content."""
-    
-    # Add content-specific requirements
-    content_requirements = ""
-    if content_type == "meal":
-        content_requirements = """
-        For meal/diet plans:
-        1. Each entry must have UNIQUE and SPECIFIC:
-           - Meal options with portions and calories
-           - Macro targets (protein/carbs/fats in grams)
-           - Total calorie targets
-           - Specific tasks and tips
-        2. For each meal provide:
-           - Exact ingredients and portions
-           - Protein content per meal
-           - Cooking instructions or prep notes
-        3. Progressive changes:
-           - Gradually increase/adjust portions
-           - Vary meal choices each week/month
-           - Adapt to seasonal ingredients
-        4. Tracking metrics:
-           - Set specific weight targets
-           - Daily protein intake goals
-           - Water intake requirements
-        5. Make content contextual:
-           - Monday-Friday: Quick prep meals
-           - Weekends: More elaborate meals
-           - Monthly: Seasonal ingredients
-           - Consider holidays and events
-        """
-    elif content_type == "workout":
-        content_requirements = """
-        For workout plans:
-        1. Include specific exercises with sets and reps
-        2. Provide duration and intensity
-        3. List required equipment
-        4. Add form tips and safety notes
-        5. Include progressive overload
-        """
-    elif content_type == "study":
-        content_requirements = """
-        For study plans:
-        1. Break down topics into manageable chunks
-        2. Include specific resources and materials
-        3. Add review and practice sessions
-        4. Track progress with assessments
-        """
-    
-    prompt = f"""
-    Generate a detailed {time_period} plan for: "{query}"
-    Content type: {content_type}
-    
-    Follow this EXACT format:
-    {{
-        "period": "{time_period}",
-        "title": "Title of the plan",
-        "entries": [
-            {{
-                "period": "day/week/month",
-                "periodName": "Name of the period",
-                "date": "today's date: {datetime.now().strftime("%Y-%m-%d")}",
-                "title": "Title for this entry",
-                "description": {{
-                    // Content specific to the type
-                    // MUST BE UNIQUE for each entry
-                    // NO DEFAULT VALUES
-                }}
-            }}
-        ]
-    }}
-    
-    Base structure to follow:
-    {json.dumps(base_structure, indent=2)}
-    
-    {content_requirements}
-    
-    IMPORTANT REQUIREMENTS:
-    1. Keep EXACT format - no additional fields
-    2. Fill all arrays with UNIQUE, SPECIFIC items
-    3. NO DEFAULT VALUES or placeholder text
-    4. Make content unique for each entry
-    5. Keep content focused and actionable
-    6. Return ONLY valid JSON
-    7. Ensure no empty arrays in description
-    8. Make content progressive and build over time
-    9. Include specific, measurable goals
-    10. Adapt content based on the time period (day/week/month)
-    11. For meal plans: Include specific portions, calories, and macros
-    12. For tracking fields: Always include specific target values
-    """
-    
-    return prompt
+    # Static text is compiled once per period and type; the plan is embedded compactly, within the token budget
+    return render_plan_prompt(query, time_period, content_type, base_structure, datetime.now().strftime("%Y-%m-%d"))
+
+# Sampling settings for plan chunks; the temperature rises on retries
+CHUNK_TEMPERATURES = (0.3, 0.4)
+CHUNK_GENERATION_CONFIG = {
+    "top_p": 0.95,
+    "top_k": 50,
+    "max_output_tokens": 8192,
+    "candidate_count": 1
+}
+
+def chunk_generation_config(attempt):
+    """Return the sampling settings for the given 1-based attempt."""
+    temperature = CHUNK_TEMPERATURES[min(attempt, len(CHUNK_TEMPERATURES)) - 1]
+    return dict(CHUNK_GENERATION_CONFIG, temperature=temperature)
 
-def generate_plan_chunk(prompt, attempt=1):
+def create_chunk_prompt(prompt):
+    """Wrap a plan prompt in the JSON response instructions."""
+    return render_chunk_prompt(prompt)
+
+def parse_plan_chunk(text):
+    """Parse a model response into a trimmed plan chunk, raising ValueError if it is unusable."""
+    # Cut the JSON out of fences or prose and repair it in a single pass
+    plan = json.loads(repair_json(text))
+    if not isinstance(plan, dict) or not validate_plan_content(plan):
+        raise ValueError("Incomplete plan content")
+    return trim_content(plan)
+
+@timed('generate_plan_chunk')
+def generate_plan_chunk(prompt):
     """Generate a single chunk of the plan with error handling."""
-    try:
-        temperature = 0.3 if attempt == 1 else 0.4
-        
-        # Create a more structured prompt
-        json_prompt = f"""
-        You are a specialized plan generator. Create a detailed plan following these rules:
-
-        INPUT QUERY:
-        {prompt}
-
-        RESPONSE FORMAT:
-        {{
-            "title": "Clear, specific title",
-            "description": "Brief, focused description",
-            "plan_type": "Type of plan (day/week/month/year)",
-            "content": {{
-                // Specific content based on the plan type
-                // Use the structure provided in the input
-            }},
-            "metrics": [
-                // 3-4 specific, measurable metrics
-            ],
-            "resources": [
-                // 3-4 specific required resources
-            ],
-            "tips": [
-                // 3-4 actionable recommendations
-            ]
-        }}
-
-        REQUIREMENTS:
-        1. Use ONLY double quotes for ALL strings
-        2. Include ALL required sections
-        3. Make content specific and actionable
-        4. Keep lists to 3-4 items maximum
-        5. Use proper JSON format
-        6. No comments or extra text
-        """
-        
-        response = model.generate_content(json_prompt, 
-            generation_config={
-                "temperature": 0.9,
-                "top_p": 0.95,
-                "top_k": 50,
-                "max_output_tokens": 8192,
-                "candidate_count": 1
-            })
-        
-        # Clean and parse the response
-        text = response.text.strip()
-        text = text.replace('```json', '').replace('```', '').strip()
-        text = text.replace('\n', ' ').replace('\r', ' ')
-        
-        # Ensure proper JSON structure
-        if not text.startswith('{'): text = '{' + text
-        if not text.endswith('}'): text = text + '}'
-        
-        # Fix JSON issues
-        text = aggressive_json_fix(text)
-        
-        try:
-            plan = json.loads(text)
-            if not validate_plan_content(plan):
-                raise ValueError("Incomplete plan content")
-            return trim_content(plan)
-        except (json.JSONDecodeError, ValueError) as e:
-            if attempt < 2:
-                return generate_plan_chunk(prompt, attempt + 1)
-            else:
-                # Create a more specific fallback structure
-                return create_specific_fallback(prompt)
-    except Exception as e:
-        if attempt < 2:
-            return generate_plan_chunk(prompt, attempt + 1)
-        else:
-            return create_specific_fallback(prompt)
-
-def aggressive_json_fix(text):
-    """Aggressively fix common JSON formatting issues."""
-    # Remove any non-JSON text
-    text = re.sub(r'^[^{]*{', '{', text)
-    text = re.sub(r'}[^}]*$', '}', text)
-    
-    # Fix quote issues
-    text = text.replace("'", '"')  # Replace single quotes with double quotes
-    text = re.sub(r'(?<!\\)"`|`"', '"', text)  # Remove backticks
-    
-    # Fix property names
-    text = re.sub(r'([{,])\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:', r'\1"\2":', text)
+    def attempt_chunk(attempt):
+        response = model.generate_content(create_chunk_prompt(prompt),
+            generation_config=chunk_generation_config(attempt))
+        return parse_plan_chunk(response.text)
     
-    # Fix trailing commas
-    text = re.sub(r',(\s*[}\]])', r'\1', text)
-    
-    # Fix missing quotes around string values
-    text = re.sub(r':\s*([a-zA-Z][a-zA-Z0-9_\s-]*[a-zA-Z0-9])([,}\]])', r':"\1"\2', text)
-    
-    # Fix common structural issues
-    text = re.sub(r',\s*,', ',', text)  # Remove duplicate commas
-    text = re.sub(r'{\s*,', '{', text)  # Remove leading commas in objects
-    text = re.sub(r'\[\s*,', '[', text)  # Remove leading commas in arrays
+    try:
+        return llm_retry.call(attempt_chunk, breaker=llm_breaker)
+    except Exception:
+        # Create a more specific fallback structure
+        return create_specific_fallback(prompt)
+
+@timed('generate_plan_chunk')
+async def generate_plan_chunk_async(prompt):
+    """Async generate_plan_chunk; waits on the shared model runner instead of a thread."""
+    async def attempt_chunk(attempt):
+        text = await model_runner.generate(create_chunk_prompt(prompt), chunk_generation_config(attempt))
+        return parse_plan_chunk(text)
     
-    return text
+    try:
+        return await llm_retry.call_async(attempt_chunk, breaker=llm_breaker)
+    except Exception:
+        return create_specific_fallback(prompt)
 
 def create_specific_fallback(prompt):
     """Create a more specific fallback structure based on the prompt content."""
-    # Try to extract key information from the prompt
-    prompt_lower = prompt.lower()
-    
-    # Determine the type of plan
-    plan_type = "general"
-    if any(word in prompt_lower for word in ["diet", "meal", "food"]):
-        plan_type = "meal"
-    elif any(word in prompt_lower for word in ["workout", "exercise", "fitness"]):
-        plan_type = "workout"
-    elif any(word in prompt_lower for word in ["study", "learn", "education"]):
-        plan_type = "study"
+    # Determine the type of plan from the words of the prompt
+    plan_type = content_classifier.classify(prompt)[0]
     
     # Create specific content based on plan type
     if plan_type == "meal":
@@ -1252,6 +834,7 @@ def trim_content(obj):
                 trim_content(item)
     return obj
 
+@timed('validate_plan_content')
 def validate_plan_content(plan):
     """Validate that the plan has no empty arrays or missing content."""
     def check_empty(obj):
@@ -1280,106 +863,8 @@ def validate_and_fill_content(entry, content_type):
     
     description = entry['description']
         
-    # Default content templates based on type
-    default_content = {
-        'exercises': [
-            "Warm-up exercises (10 minutes)",
-            "Main workout routine",
-            "Cool-down stretches"
-        ],
-        'equipment': [
-            "Exercise mat",
-            "Water bottle",
-            "Comfortable clothes"
-        ],
-        'notes': [
-            "Start with proper form",
-            "Listen to your body",
-            "Stay hydrated"
-        ],
-        'morning': [
-            "Start with light activity",
-            "Focus on main goals",
-            "Track progress"
-        ],
-        'afternoon': [
-            "Continue with planned activities",
-            "Review progress",
-            "Adjust as needed"
-        ],
-        'evening': [
-            "Complete remaining tasks",
-            "Review day's progress",
-            "Plan for tomorrow"
-        ],
-        'goals': [
-            "Complete planned activities",
-            "Maintain consistent effort",
-            "Track progress"
-        ],
-        'tasks': [
-            "Priority task 1",
-            "Secondary task",
-            "Follow-up activities"
-        ],
-        'meals': {
-            'breakfast': [
-                "High-protein breakfast option",
-                "Healthy carbs and fruits"
-            ],
-            'lunch': [
-                "Balanced protein and vegetables",
-                "Complex carbohydrates"
-            ],
-            'dinner': [
-                "Lean protein option",
-                "Vegetables and whole grains"
-            ],
-            'snacks': [
-                "Protein-rich snack",
-                "Healthy fruits or nuts"
-            ]
-        },
-        'nutrients': {
-            'protein': [
-                "Track daily protein intake",
-                "Aim for balanced protein distribution"
-            ],
-            'carbs': [
-                "Focus on complex carbohydrates",
-                "Monitor carb intake"
-            ],
-            'fats': [
-                "Include healthy fats",
-                "Balance fat consumption"
-            ]
-        },
-        'tips': [
-            "Stay hydrated throughout the day",
-            "Prepare meals in advance",
-            "Track your nutrition"
-        ],
-        'budget': {
-            'income': [
-                "Regular income sources",
-                "Additional income opportunities"
-            ],
-            'expenses': [
-                "Essential expenses",
-                "Non-essential spending"
-            ],
-            'savings': [
-                "Emergency fund allocation",
-                "Long-term savings goals"
-            ]
-        },
-        'expense_categories': [
-            "Housing and utilities",
-            "Food and groceries",
-            "Transportation",
-            "Healthcare"
-        ]
-    }
+    # Defaults are frozen and shared, so they can be assigned without copying
+    default_content = DEFAULT_CONTENT
     
     # Fill empty arrays based on content type
     if content_type == "workout" or content_type == "fitness":
@@ -1464,19 +949,110 @@ def validate_and_fill_content(entry, content_type):
     
     return entry
 
-def generate_plan(query):
+@profiler.profiled
+def generate_plan(query, enrich=False, calendar=None, page=None):
     """Generate a structured plan based on the input query."""
-    # Analyze and clean the query
-    analysis = analyze_query(query)
-    cleaned_query = clean_query(query)
-    time_period = detect_time_period(query)
+    analysis = QueryAnalysis.of(query)
+    calendar = calendar or PlanCalendar()
+    plan = collect_plan(iter_plan(analysis, calendar, page))
+    if page is not None:
+        plan["next_cursor"] = next_cursor(page, plan["total_entries"], calendar.day)
     
-    # Generate time-specific content directly
-    plan = generate_time_content(cleaned_query, time_period, analysis)
+    if enrich:
+        plan = model_runner.run(enrich_plan(plan, clean_query(analysis), plan_content_type(analysis)))
     
     return plan
 
-@app.route('/generate', methods=['POST'])
+def iter_plan(query, calendar=None, page=None):
+    """Analyze the query and return a stream of the plan header followed by its entries."""
+    # Analyze the query once; every stage reads from the shared analysis
+    analysis = QueryAnalysis.of(query)
+    cleaned_query = clean_query(analysis)
+    
+    # The keyword scan decides period, type and duration; tag with NLTK only when it is unsure
+    fast = analysis.fast
+    if fast.ambiguous:
+        query_info = analyze_query(analysis)
+        time_period = detect_time_period(analysis)
+        return iter_time_content(cleaned_query, time_period, query_info, content_type=analysis.content_type,
+                                 duration=detect_duration(analysis), calendar=calendar, page=page)
+    return iter_time_content(cleaned_query, fast.period, analysis, content_type=fast.content_type,
+                             duration=fast.duration, calendar=calendar, page=page)
+
+def plan_content_type(query):
+    """Return the content type the plan for ``query`` is built with."""
+    return QueryAnalysis.of(query).content_type
+
+def plan_inputs(query, page=None):
+    """Return the canonical inputs that, with the day, fully determine the plan for ``query``.
+
+    Only the query analysis runs; no entry is built.
+    """
+    analysis = QueryAnalysis.of(query)
+    fast = analysis.fast
+    if fast.ambiguous:
+        time_period, duration = detect_time_period(analysis), detect_duration(analysis)
+    else:
+        time_period, duration = fast.period, fast.duration
+    span = [page.offset, page.limit] if page is not None else None
+    return [time_period, plan_content_type(analysis), get_entry_count(time_period, duration), span,
+            clean_query(analysis).strip().title(), PROGRESSION_CURVE]
+
+def remember_plan(etag, query, page=None):
+    """Record the query and page of plan ``etag`` so /plans/<etag> can rebuild it."""
+    span = [page.offset, page.limit] if page is not None else None
+    plan_index.put(etag, plan_day(etag), {"query": query, "page": span})
+
+def iter_plan_events(query, enrich=False, calendar=None, page=None):
+    """Yield (event, data) pairs: the plan header, each entry as it is built, then the end marker."""
+    analysis = QueryAnalysis.of(query)
+    calendar = calendar or PlanCalendar()
+    content = iter_plan(analysis, calendar, page)
+    plan = next(content)
+    yield 'plan', dict(plan)
+    
+    offset = page.offset if page is not None else 0
+    entries = []
+    for entry in content:
+        yield 'entry', {"index": offset + len(entries), "entry": entry}
+        entries.append(entry)
+    
+    if enrich:
+        plan["entries"] = entries
+        enriched = model_runner.run(enrich_plan(plan, clean_query(analysis), plan_content_type(analysis)))
+        yield 'enrichment', {"enrichment": enriched['enrichment']}
+    end = {"entries": len(entries)}
+    if page is not None:
+        end["next_cursor"] = next_cursor(page, plan["total_entries"], calendar.day)
+    yield 'end', end
+
+async def enrich_plan(plan, query, content_type):
+    """Add model-written guidance to a generated plan."""
+    enriched = dict(plan)
+    if llm_breaker.is_open():
+        # The upstream is failing; answer with the deterministic plan alone
+        enriched['enrichment'] = None
+        return enriched
+    prompt = create_prompt(query, plan['period'], content_type, plan)
+    enriched['enrichment'] = await generate_plan_chunk_async(prompt)
+    return enriched
+
+@planner.before_request
+def start_timing():
+    """Start collecting stage timings for this request."""
+    g.request_start = perf_counter()
+    start_request()
+
+@planner.after_request
+def add_server_timing(response):
+    """Report the stage timings in a Server-Timing header and count the request."""
+    total = perf_counter() - g.request_start
+    # A streamed body is produced after this point, so its stages reach /metrics only
+    response.headers['Server-Timing'] = server_timing(finish_request(), total)
+    metrics.count_request(request.endpoint, response.status_code)
+    return response
+
+@planner.route('/generate', methods=['POST'])
 def generate():
     """API endpoint to generate plans."""
     if not request.is_json:
@@ -1486,10 +1062,97 @@ def generate():
     if 'query' not in data:
         return jsonify({"error": "Query is required"}), 400
     
-    plan = generate_plan(data['query'])
-    return jsonify(plan)
+    enrich = bool(data.get('enrich'))
+    # Dates follow the client's day when it sends an IANA time zone such as "Asia/Kolkata";
+    # later pages keep the day of the first one, which their cursor carries
+    try:
+        page = parse_page({**request.args.to_dict(), **data})
+        calendar = PlanCalendar(now=page and page.day, tz=data.get('timezone'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    if wants_stream(request, data):
+        events = iter_plan_events(data['query'], enrich=enrich, calendar=calendar, page=page)
+        sse = wants_sse(request)
+        return Response(stream_with_context(encode_events(events, sse)),
+                        mimetype='text/event-stream' if sse else 'application/x-ndjson')
+    
+    if profiler.allows(request.headers):
+        plan, profile_id = profiler.profile(generate_plan, data['query'], enrich=enrich, calendar=calendar,
+                                            page=page, label=data['query'])
+        response = plan_response(plan, request)
+        if profile_id:
+            response.headers['X-Profile-Id'] = profile_id
+        return response
+    
+    if enrich:
+        return plan_response(generate_plan(data['query'], enrich=True, calendar=calendar, page=page), request)
+    
+    # Without enrichment the plan is fixed by its inputs, so a client holding its tag gets a 304
+    analysis = QueryAnalysis.of(data['query'])
+    etag = plan_id(plan_inputs(analysis, page), calendar.day)
+    if is_fresh(request, etag):
+        return not_modified(etag)
+    remember_plan(etag, data['query'], page)
+    plan = generate_plan(analysis, calendar=calendar, page=page)
+    return tag(plan_response(plan, request), etag)
+
+@planner.route('/plans/<etag>', methods=['GET'])
+def get_plan(etag):
+    """Serve a plan by the ETag /generate gave it, answering If-None-Match with 304."""
+    try:
+        day = plan_day(etag)
+    except ValueError:
+        return jsonify({"error": "Unknown plan"}), 404
+    # Plans from up to PLAN_INDEX_KEEP_DAYS ago, or tomorrow in zones ahead, are still served
+    age = (date.today() - date.fromisoformat(day)).days
+    if not -1 <= age <= plan_index.keep_days:
+        return jsonify({"error": "Unknown plan"}), 404
+    # A plan id names one day's plan, so its content never changes
+    if is_fresh(request, etag):
+        return not_modified(etag)
+    record = plan_index.get(etag)
+    if record is None:
+        return jsonify({"error": "Unknown plan"}), 404
+    
+    calendar = PlanCalendar(now=date.fromisoformat(day))
+    page = Page(*record["page"], calendar.today) if record["page"] else None
+    plan = generate_plan(record["query"], calendar=calendar, page=page)
+    return tag(plan_response(plan, request), etag)
+
+@planner.route('/generate/batch', methods=['POST'])
+def generate_batch():
+    """Generate plans for many queries, streamed back as NDJSON in input order."""
+    if request.mimetype == 'application/x-ndjson':
+        queries = iter_ndjson_queries(request.stream)
+    elif request.is_json:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not isinstance(data.get('queries'), list):
+            return jsonify({"error": "Queries must be a list"}), 400
+        queries = data['queries']
+    else:
+        return jsonify({"error": "Request must be JSON or NDJSON"}), 400
+    
+    return Response(stream_with_context(iter_ndjson_results(queries)), mimetype='application/x-ndjson')
 
-@app.route('/sample', methods=['GET'])
+@planner.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """Return plan cache hit/miss counters."""
+    return jsonify(plan_cache.get_stats())
+
+@planner.route('/enrich/stats', methods=['GET'])
+def enrich_stats():
+    """Return model call, retry and circuit breaker counters for the enrichment stage."""
+    response_cache = model.cache.get_stats() if isinstance(model, CachedModel) else None
+    return jsonify(dict(model_runner.get_stats(), retry=llm_retry.get_stats(), breaker=llm_breaker.get_stats(),
+                        response_cache=response_cache))
+
+@planner.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Return stage latency histograms and request counters in Prometheus text format."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@planner.route('/sample', methods=['GET'])
 def get_sample():
     """Return sample queries and their expected output format."""
     return jsonify({
@@ -1511,5 +1174,32 @@ def get_sample():
         }
     })
 
+# One query per period and content type, so preload() touches every table and NLTK model
+PRELOAD_QUERIES = (
+    "Create a daily study schedule for exams",
+    "Build a 7-day protein rich diet plan for muscle gain",
+    "Create a month-long workout routine for weight loss",
+    "Plan a year-long financial savings strategy",
+    "Organize my garden project over the next few weeks"
+)
+
+def preload():
+    """Load NLTK data, the tagger, the chunker and the plan tables before worker processes fork."""
+    sent_tokenize("Warm the sentence tokenizer. It is shared by every worker.")
+    for query in PRELOAD_QUERIES:
+        analysis = QueryAnalysis(query)
+        analyze_query(analysis)
+        clean_query(analysis)
+        generate_plan(analysis)
+
+def create_app():
+    """Create the Flask application serving the planner routes."""
+    app = Flask(__name__)
+    app.register_blueprint(planner)
+    return app
+
+app = create_app()
+
 if __name__ == '__main__':
+    # Development server only; production runs `gunicorn -c gunicorn.conf.py wsgi:app`
     app.run(debug=True, port=5000)
\ No newline at end of file
@@ -0,0 +1,231 @@
+"""Model backends: the Gemini API or a local fake for tests and benchmarks.
+
+``create_model()`` picks the backend from LLM_BACKEND:
+
+- ``gemini`` (default) uses GOOGLE_API_KEY and the network.
+- ``fake`` (or ``stub``) answers locally with a FakeModel, configured by
+  LLM_FAKE_* environment variables. No key or network is needed.
+
+The fake can replay recorded responses, add latency drawn from a
+distribution, and at configurable rates truncate the JSON, wrap it in a
+code fence, switch it to single quotes or raise an exception. All random
+choices come from one seeded generator, so a sequential run is
+reproducible.
+
+Either backend is wrapped in an llm_cache.CachedModel when LLM_CACHE_MODE
+asks for it. The Gemini backend caches by default; the fake only when the
+mode is set, so its injected failures stay random.
+"""
+import asyncio
+import itertools
+import json
+import os
+import random
+import threading
+import time
+
+GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-1.5-flash')
+
+DEFAULT_CHUNK = {
+    "title": "Fake plan",
+    "description": "Generated locally without a model",
+    "plan_type": "general",
+    "content": {"summary": "Fake content"},
+    "metrics": ["Goal completion rate"],
+    "resources": ["Notebook"],
+    "tips": ["Review progress weekly"]
+}
+
+# Prompts are scanned for an embedded JSON template among the first few braces only
+TEMPLATE_SCAN_LIMIT = 8
+
+
+class FakeResponse:
+    """The part of a GenerateContentResponse the planner reads."""
+
+    def __init__(self, text):
+        self.text = text
+
+
+def parse_latency(spec):
+    """Return a function drawing a latency in seconds from ``spec``.
+
+    ``spec`` is one of ``0.5``, ``uniform:0.2,1.5``, ``normal:1.0,0.3`` or
+    ``lognormal:1.0,0.5`` (median and sigma).
+    """
+    spec = (spec or '0').strip()
+    kind, _, params = spec.partition(':')
+    if not params:
+        value = float(kind)
+        return lambda rng: value
+    a, b = (float(value) for value in params.split(','))
+    if kind == 'uniform':
+        return lambda rng: rng.uniform(a, b)
+    if kind == 'normal':
+        return lambda rng: max(rng.gauss(a, b), 0.0)
+    if kind == 'lognormal':
+        return lambda rng: rng.lognormvariate(0.0, b) * a
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def load_replay(path):
+    """Read recorded response texts from a JSON list or a JSONL file of strings or {"text": ...}."""
+    with open(path) as f:
+        content = f.read()
+    try:
+        items = json.loads(content)
+        if not isinstance(items, list):
+            items = [items]
+    except ValueError:
+        items = [json.loads(line) for line in content.splitlines() if line.strip()]
+    return [item['text'] if isinstance(item, dict) else item for item in items]
+
+
+def make_error(kind):
+    """Build the exception the fake raises for an injected failure of ``kind``."""
+    try:
+        from google.api_core import exceptions as api_exceptions
+    except ImportError:
+        api_exceptions = None
+
+    if kind == 'timeout':
+        return TimeoutError("Injected timeout")
+    if kind == 'connection':
+        return ConnectionError("Injected connection failure")
+    if api_exceptions is not None:
+        if kind == 'unavailable':
+            return api_exceptions.ServiceUnavailable("Injected 503")
+        if kind == 'rate_limit':
+            return api_exceptions.ResourceExhausted("Injected 429")
+        if kind == 'invalid_argument':
+            return api_exceptions.InvalidArgument("Injected 400")
+    if kind in ('unavailable', 'rate_limit'):
+        return ConnectionError(f"Injected {kind}")
+    return RuntimeError(f"Injected {kind}")
+
+
+class FakeModel:
+    """Local stand-in for genai.GenerativeModel with latency and failure injection."""
+
+    def __init__(self, latency='0', replay=None, truncate_rate=0.0, fence_rate=0.0,
+                 single_quote_rate=0.0, error_rate=0.0, errors=('connection',), seed=0):
+        self.latency = parse_latency(latency) if isinstance(latency, str) else (lambda rng: latency)
+        self.responses = itertools.cycle(replay) if replay else None
+        self.truncate_rate = truncate_rate
+        self.fence_rate = fence_rate
+        self.single_quote_rate = single_quote_rate
+        self.error_rate = error_rate
+        self.errors = tuple(errors)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'errors': 0,
+            'truncated': 0,
+            'fenced': 0,
+            'single_quoted': 0
+        }
+
+    @classmethod
+    def from_env(cls):
+        """Build a fake configured by LLM_FAKE_* environment variables."""
+        replay_path = os.getenv('LLM_FAKE_REPLAY')
+        return cls(
+            latency=os.getenv('LLM_FAKE_LATENCY', '0'),
+            replay=load_replay(replay_path) if replay_path else None,
+            truncate_rate=float(os.getenv('LLM_FAKE_TRUNCATE_RATE', '0')),
+            fence_rate=float(os.getenv('LLM_FAKE_FENCE_RATE', '0')),
+            single_quote_rate=float(os.getenv('LLM_FAKE_SINGLE_QUOTE_RATE', '0')),
+            error_rate=float(os.getenv('LLM_FAKE_ERROR_RATE', '0')),
+            errors=[kind.strip() for kind in os.getenv('LLM_FAKE_ERRORS', 'connection').split(',') if kind.strip()],
+            seed=int(os.getenv('LLM_FAKE_SEED', '0'))
+        )
+
+    def _plan(self, prompt):
+        """Draw the latency and outcome of one call: (seconds, text or exception)."""
+        with self._lock:
+            rng = self._random
+            self.stats['calls'] += 1
+            delay = self.latency(rng)
+            if self.error_rate and rng.random() < self.error_rate:
+                self.stats['errors'] += 1
+                return delay, make_error(rng.choice(self.errors))
+
+            text = next(self.responses) if self.responses is not None else default_response(prompt)
+            if self.single_quote_rate and rng.random() < self.single_quote_rate:
+                self.stats['single_quoted'] += 1
+                text = text.replace('"', "'")
+            if self.truncate_rate and rng.random() < self.truncate_rate:
+                self.stats['truncated'] += 1
+                text = text[:int(len(text) * rng.uniform(0.3, 0.9))]
+            if self.fence_rate and rng.random() < self.fence_rate:
+                self.stats['fenced'] += 1
+                text = f"```json\n{text}\n```"
+        return delay, text
+
+    def generate_content(self, prompt, generation_config=None, **kwargs):
+        delay, outcome = self._plan(prompt)
+        if delay:
+            time.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResponse(outcome)
+
+    async def generate_content_async(self, prompt, generation_config=None, **kwargs):
+        delay, outcome = self._plan(prompt)
+        if delay:
+            await asyncio.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResponse(outcome)
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+
+def fill_placeholders(value):
+    """Return ``value`` with empty lists and strings filled, as a model answer would be."""
+    if isinstance(value, dict):
+        return {key: fill_placeholders(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [fill_placeholders(item) for item in value] or ["Fake item"]
+    if isinstance(value, str) and not value.strip():
+        return "Fake text"
+    return value
+
+
+def default_response(prompt):
+    """Echo the JSON template a prompt embeds, filled in, else a generic plan chunk.
+
+    Plan skeletons carry empty lists for the model to fill; they are filled
+    with placeholders so the response passes validation.
+    """
+    decoder = json.JSONDecoder()
+    start = prompt.find('{')
+    for _ in range(TEMPLATE_SCAN_LIMIT):
+        if start == -1:
+            break
+        try:
+            template, _ = decoder.raw_decode(prompt, start)
+        except ValueError:
+            template = None
+        if isinstance(template, dict) and 'entries' in template:
+            return json.dumps(fill_placeholders(template))
+        start = prompt.find('{', start + 1)
+    return json.dumps(DEFAULT_CHUNK)
+
+
+def create_model(backend=None):
+    """Return the model selected by ``backend`` or LLM_BACKEND."""
+    from llm_cache import CachedModel
+
+    backend = backend or os.getenv('LLM_BACKEND', 'gemini')
+    if backend in ('fake', 'stub'):
+        return CachedModel.from_env(FakeModel.from_env(), 'fake', default_mode='off')
+    if backend != 'gemini':
+        raise ValueError(f"Unknown LLM_BACKEND: {backend}")
+
+    import google.generativeai as genai
+    genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
+    return CachedModel.from_env(genai.GenerativeModel(GEMINI_MODEL), GEMINI_MODEL)
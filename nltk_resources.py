@@ -0,0 +1,188 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_FILE = os.path.join(BASE_DIR, 'nltk_manifest.json')
+DEFAULT_DATA_DIR = os.path.join(BASE_DIR, 'nltk_data')
+LOCK_FILENAME = 'nltk_manifest.lock.json'
+
+
+class NLTKResourceError(RuntimeError):
+    """Raised when the pinned NLTK data does not match the manifest."""
+
+
+def get_data_dir():
+    """Return the pinned NLTK data directory."""
+    return os.path.abspath(os.getenv('NLTK_DATA_DIR', DEFAULT_DATA_DIR))
+
+
+def load_manifest(manifest_path=MANIFEST_FILE):
+    """Load the list of NLTK resources the planner needs."""
+    with open(manifest_path) as f:
+        return json.load(f)['resources']
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Compute the SHA-256 digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def package_archive(data_dir, resource):
+    """Return the path of the downloaded package archive for a resource."""
+    return os.path.join(data_dir, resource['path'] + '.zip')
+
+
+def pinned_sha256(resource):
+    """Return the digest the committed manifest pins for ``resource``."""
+    if not resource.get('sha256'):
+        raise NLTKResourceError(
+            f"NLTK resource '{resource['id']}' has no sha256 in the manifest; run 'python nltk_resources.py pin'"
+        )
+    return resource['sha256']
+
+
+def download(resource, data_dir):
+    """Download one resource and return the path of its archive."""
+    import nltk
+
+    try:
+        ok = nltk.download(resource['id'], download_dir=data_dir, quiet=True, raise_on_error=True)
+    except ValueError as e:
+        raise NLTKResourceError(f"Failed to download NLTK resource '{resource['id']}': {e}") from None
+    if not ok:
+        raise NLTKResourceError(f"Failed to download NLTK resource '{resource['id']}'")
+
+    archive = package_archive(data_dir, resource)
+    if not os.path.exists(archive):
+        raise NLTKResourceError(f"Download of '{resource['id']}' did not produce {archive}")
+    return archive
+
+
+def prepare_data(data_dir=None, manifest_path=MANIFEST_FILE):
+    """Download every manifest resource into the pinned directory, checking it against the manifest's digest."""
+    data_dir = data_dir or get_data_dir()
+    os.makedirs(data_dir, exist_ok=True)
+
+    resources = load_manifest(manifest_path)
+    # Refuse before downloading anything if a digest is missing
+    for resource in resources:
+        pinned_sha256(resource)
+
+    locked = {}
+    for resource in resources:
+        archive = download(resource, data_dir)
+        checksum = file_sha256(archive)
+        if checksum != resource['sha256']:
+            raise NLTKResourceError(
+                f"Checksum mismatch for '{resource['id']}': expected {resource['sha256']}, got {checksum}"
+            )
+
+        locked[resource['id']] = {
+            'path': resource['path'],
+            'sha256': checksum,
+            'size': os.path.getsize(archive)
+        }
+
+    with open(os.path.join(data_dir, LOCK_FILENAME), 'w') as f:
+        json.dump({'resources': locked}, f, indent=2, sort_keys=True)
+
+    return locked
+
+
+def pin_manifest(data_dir=None, manifest_path=MANIFEST_FILE):
+    """Download every resource and write its digest into the manifest, for review and commit."""
+    data_dir = data_dir or get_data_dir()
+    os.makedirs(data_dir, exist_ok=True)
+
+    resources = load_manifest(manifest_path)
+    for resource in resources:
+        resource['sha256'] = file_sha256(download(resource, data_dir))
+
+    lines = ',\n'.join(f"    {json.dumps(resource)}" for resource in resources)
+    with open(manifest_path, 'w') as f:
+        f.write(f'{{\n  "resources": [\n{lines}\n  ]\n}}\n')
+    return resources
+
+
+def verify_data(data_dir=None, full=False, manifest_path=MANIFEST_FILE):
+    """Verify the pinned directory against the manifest without any network access.
+
+    The default check only stats each archive against the recorded size;
+    ``full=True`` re-hashes every archive.
+    """
+    data_dir = data_dir or get_data_dir()
+    lock_path = os.path.join(data_dir, LOCK_FILENAME)
+    try:
+        with open(lock_path) as f:
+            locked = json.load(f)['resources']
+    except (OSError, ValueError, KeyError):
+        raise NLTKResourceError(
+            f"No NLTK data lock file at {lock_path}; run 'python nltk_resources.py prepare-data'"
+        )
+
+    for resource in load_manifest(manifest_path):
+        entry = locked.get(resource['id'])
+        if entry is None:
+            raise NLTKResourceError(f"NLTK resource '{resource['id']}' is not installed in {data_dir}")
+        if pinned_sha256(resource) != entry['sha256']:
+            raise NLTKResourceError(f"NLTK resource '{resource['id']}' does not match the pinned checksum")
+
+        archive = package_archive(data_dir, resource)
+        try:
+            size = os.path.getsize(archive)
+        except OSError:
+            raise NLTKResourceError(f"NLTK resource '{resource['id']}' is missing from {data_dir}")
+        if size != entry['size']:
+            raise NLTKResourceError(f"NLTK resource '{resource['id']}' has changed since prepare-data")
+        if full and file_sha256(archive) != resource['sha256']:
+            raise NLTKResourceError(f"NLTK resource '{resource['id']}' failed checksum verification")
+
+    return data_dir
+
+
+def ensure_resources():
+    """Verify the pinned NLTK data and make it the first place NLTK looks."""
+    import nltk
+
+    full = os.getenv('NLTK_VERIFY_CHECKSUMS', '').lower() in ('1', 'true', 'yes')
+    data_dir = verify_data(full=full)
+    if data_dir not in nltk.data.path:
+        nltk.data.path.insert(0, data_dir)
+    return data_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Provision and verify the NLTK data used by the planner.")
+    parser.add_argument('--data-dir', help="Pinned data directory (default: $NLTK_DATA_DIR or ./nltk_data)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('prepare-data', help="Download the manifest resources and check them against its digests")
+    subparsers.add_parser('pin', help="Download the manifest resources and write their digests into the manifest")
+    verify_parser = subparsers.add_parser('verify', help="Check the pinned data against the manifest")
+    verify_parser.add_argument('--full', action='store_true', help="Re-hash every archive")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'prepare-data':
+            locked = prepare_data(args.data_dir)
+            print(f"Installed {len(locked)} NLTK resources into {args.data_dir or get_data_dir()}")
+        elif args.command == 'pin':
+            pinned = pin_manifest(args.data_dir)
+            print(f"Pinned {len(pinned)} NLTK resources in {MANIFEST_FILE}; review and commit it")
+        else:
+            data_dir = verify_data(args.data_dir, full=args.full)
+            print(f"NLTK data in {data_dir} matches the manifest")
+    except NLTKResourceError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""Cursor pagination of plan entries.
+
+A cursor is an opaque, URL-safe token holding the offset of the next entry
+and the day the first page was planned on. Later pages are dated from that
+day, so a plan paged across midnight stays consistent.
+"""
+import base64
+import json
+import os
+from collections import namedtuple
+from datetime import date
+
+PAGE_DEFAULT_LIMIT = int(os.getenv('PAGE_DEFAULT_LIMIT', '100'))
+PAGE_MAX_LIMIT = int(os.getenv('PAGE_MAX_LIMIT', '1000'))
+
+# Entries offset..offset+limit of a plan; day is the cursor's plan day or None
+Page = namedtuple('Page', ['offset', 'limit', 'day'])
+
+
+def encode_cursor(offset, day):
+    raw = json.dumps([offset, day], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (offset, date) from a cursor, raising ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        offset, day = json.loads(raw)
+        offset, day = int(offset), date.fromisoformat(day)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor") from None
+    if offset < 0:
+        raise ValueError("Invalid cursor")
+    return offset, day
+
+
+def parse_page(params):
+    """Return the Page asked for by ``limit``/``cursor`` in ``params``, or None when not paginated."""
+    limit, cursor = params.get('limit'), params.get('cursor')
+    if limit is None and cursor is None:
+        return None
+    if limit is None:
+        limit = PAGE_DEFAULT_LIMIT
+    try:
+        if isinstance(limit, bool):
+            raise ValueError
+        limit = int(limit)
+    except (ValueError, TypeError):
+        limit = 0
+    if not 1 <= limit <= PAGE_MAX_LIMIT:
+        raise ValueError(f"limit must be an integer from 1 to {PAGE_MAX_LIMIT}")
+    if cursor is None:
+        return Page(0, limit, None)
+    if not isinstance(cursor, str):
+        raise ValueError("Invalid cursor")
+    offset, day = decode_cursor(cursor)
+    return Page(offset, limit, day)
+
+
+def next_cursor(page, total, day):
+    """Return the cursor of the page after ``page``, or None after the last entry."""
+    end = page.offset + page.limit
+    return encode_cursor(end, day) if end < total else None
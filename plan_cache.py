@@ -0,0 +1,169 @@
+"""Two-tier cache for deterministic plan entries.
+
+Generated entries depend only on the canonical tuple
+``(period, content_type, entry_count, day)``, never on the raw query, so the
+cache is keyed by that tuple. The first tier is an in-process LRU; the second
+is a SQLite file shared by every worker process on the host. Entries from
+before the previous day are dropped as soon as the date rolls over; clients
+in other time zones, and pinned pagination cursors, still ask for the days
+on either side of the newest one.
+
+Cached entries are shared between requests and must be treated as read-only.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+
+
+class PlanCache:
+    """In-process LRU in front of an optional shared SQLite store."""
+
+    def __init__(self, path=None, max_entries=256, max_disk_entries=10000):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._day = None
+        self.stats = {
+            'memory_hits': 0,
+            'memory_misses': 0,
+            'disk_hits': 0,
+            'disk_misses': 0,
+            'evictions': 0,
+            'rollovers': 0
+        }
+
+    @classmethod
+    def from_env(cls):
+        """Build a cache configured by PLAN_CACHE_* environment variables."""
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        path = os.getenv('PLAN_CACHE_PATH', os.path.join(base_dir, 'plan_cache.sqlite3'))
+        return cls(
+            path=path or None,
+            max_entries=int(os.getenv('PLAN_CACHE_SIZE', '256')),
+            max_disk_entries=int(os.getenv('PLAN_CACHE_DISK_SIZE', '10000'))
+        )
+
+    def _connection(self):
+        """Return this thread's SQLite connection, reopening it after a fork."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS plans ('
+                'key TEXT PRIMARY KEY, day TEXT NOT NULL, entries TEXT NOT NULL, created REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS plans_created ON plans (created)')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _check_day(self, day):
+        """Drop what was cached for earlier days once the date rolls forward."""
+        if self._day is not None and day <= self._day:
+            return
+        with self._lock:
+            if self._day is not None and day <= self._day:
+                return
+            if self._day is not None:
+                self.stats['rollovers'] += 1
+            self._memory.clear()
+            self._day = day
+        if self.path:
+            oldest = (date.fromisoformat(day) - timedelta(days=1)).isoformat()
+            try:
+                self._connection().execute('DELETE FROM plans WHERE day < ?', (oldest,))
+            except sqlite3.Error:
+                pass
+
+    def get(self, key, day=None):
+        """Return cached entries for ``key`` or None."""
+        day = day or date.today().isoformat()
+        self._check_day(day)
+        full_key = key + (day,)
+
+        with self._lock:
+            entries = self._memory.get(full_key)
+            if entries is not None:
+                self._memory.move_to_end(full_key)
+                self.stats['memory_hits'] += 1
+                return entries
+            self.stats['memory_misses'] += 1
+
+        if not self.path:
+            return None
+        try:
+            row = self._connection().execute(
+                'SELECT entries FROM plans WHERE key = ?', (json.dumps(full_key),)
+            ).fetchone()
+        except sqlite3.Error:
+            row = None
+        with self._lock:
+            self.stats['disk_hits' if row is not None else 'disk_misses'] += 1
+        if row is None:
+            return None
+
+        entries = json.loads(row[0])
+        self._remember(full_key, entries)
+        return entries
+
+    def put(self, key, entries, day=None):
+        """Store entries for ``key`` in both tiers."""
+        day = day or date.today().isoformat()
+        self._check_day(day)
+        full_key = key + (day,)
+        self._remember(full_key, entries)
+
+        if not self.path:
+            return
+        try:
+            conn = self._connection()
+            conn.execute(
+                'INSERT OR REPLACE INTO plans (key, day, entries, created) VALUES (?, ?, ?, ?)',
+                (json.dumps(full_key), day, json.dumps(entries), time.time())
+            )
+            # Keep the shared store bounded, dropping the oldest rows first
+            conn.execute(
+                'DELETE FROM plans WHERE key IN (SELECT key FROM plans ORDER BY created '
+                'LIMIT max(0, (SELECT COUNT(*) FROM plans) - ?))',
+                (self.max_disk_entries,)
+            )
+        except sqlite3.Error:
+            pass
+
+    def _remember(self, full_key, entries):
+        with self._lock:
+            self._memory[full_key] = entries
+            self._memory.move_to_end(full_key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        """Empty both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self.path:
+            try:
+                self._connection().execute('DELETE FROM plans')
+            except sqlite3.Error:
+                pass
+
+    def get_stats(self):
+        """Return hit/miss counters and current sizes."""
+        with self._lock:
+            stats = dict(self.stats, memory_size=len(self._memory), day=self._day)
+        if self.path:
+            try:
+                stats['disk_size'] = self._connection().execute('SELECT COUNT(*) FROM plans').fetchone()[0]
+            except sqlite3.Error:
+                stats['disk_size'] = None
+        return stats
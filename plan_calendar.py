@@ -0,0 +1,100 @@
+"""Entry dates for every plan period, computed from a single clock reading.
+
+A PlanCalendar reads the clock once, optionally in the client's time zone,
+and derives every entry date from that day alone. A plan built across
+midnight therefore never mixes two days. The dates for a period and entry
+count depend only on the day, so they are computed in one pass over
+month-length tables and cached for that day.
+"""
+from datetime import date, datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from content_catalog import WEEKDAY_NUMBERS, MONTH_NUMBERS
+
+# Days per month in a common year; February gains a day in leap years
+MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def month_end(year, month):
+    """Return the last day of ``month`` (1-12) in ``year``."""
+    return 29 if month == 2 and is_leap(year) else MONTH_DAYS[month - 1]
+
+
+@lru_cache(maxsize=1024)
+def entry_dates(day, time_period, count, start=0):
+    """Return the date strings of entries ``start:count`` of a ``time_period`` plan made on ``day``.
+
+    ``day`` is a date ordinal, so one cache entry serves the whole day. An
+    entry's date depends only on its index, so a page is computed alone.
+    """
+    today = date.fromordinal(day)
+    if time_period == 'week':
+        # The next Monday..Sunday strictly after today
+        weekday = today.weekday()
+        return tuple(date.fromordinal(day + (target - weekday - 1) % 7 + 1).isoformat()
+                     for target in range(start, count))
+
+    if time_period == 'days':
+        # Consecutive days starting today
+        return tuple(date.fromordinal(day + index).isoformat() for index in range(start, count))
+
+    if time_period == 'month':
+        # Consecutive seven-day ranges starting today
+        return tuple(f"{date.fromordinal(day + 7 * week).isoformat()} to "
+                     f"{date.fromordinal(day + 7 * week + 6).isoformat()}"
+                     for week in range(start, count))
+
+    if time_period in ('year', 'months'):
+        dates = []
+        for index in range(start, count):
+            if time_period == 'year':
+                # January..December, each in this year unless it has already started
+                month = index % 12 + 1
+                year = today.year if month >= today.month else today.year + 1
+            else:
+                # Consecutive calendar months starting with this one
+                year, month = divmod(today.year * 12 + today.month - 1 + index, 12)
+                month += 1
+            dates.append(f"{year:04d}-{month:02d}-01 to {year:04d}-{month:02d}-{month_end(year, month):02d}")
+        return tuple(dates)
+
+    return (today.isoformat(),) * (count - start)
+
+
+class PlanCalendar:
+    """Entry dates for plans generated at one instant."""
+
+    def __init__(self, now=None, tz=None):
+        zone = None
+        if tz:
+            try:
+                zone = ZoneInfo(tz)
+            except (ZoneInfoNotFoundError, ValueError):
+                raise ValueError(f"Unknown timezone: {tz}") from None
+        if now is None:
+            now = datetime.now(zone)
+        elif zone is not None and getattr(now, 'tzinfo', None) is not None:
+            now = now.astimezone(zone)
+        self.today = now.date() if isinstance(now, datetime) else now
+        self.day = self.today.isoformat()
+
+    def entry_dates(self, time_period, count, start=0):
+        """Return the dates of entries ``start:count`` of a ``time_period`` plan."""
+        return entry_dates(self.today.toordinal(), time_period, count, start)
+
+    def date_for(self, time_period, period_name):
+        """Return the date of the entry called ``period_name`` (a weekday, "Week N" or month)."""
+        if time_period == 'week':
+            index = WEEKDAY_NUMBERS.get(period_name, 0)
+        elif time_period == 'month':
+            index = int(period_name.split()[1]) - 1
+        elif time_period == 'year':
+            index = MONTH_NUMBERS.get(period_name, 1) - 1
+        else:
+            index = 0
+        return self.entry_dates(time_period, index + 1)[index]
@@ -0,0 +1,107 @@
+"""Index of plans served by ETag, so GET /plans/<etag> can rebuild them.
+
+Each row maps a plan id to the query and page it was built from. The index
+is kept apart from PlanCache, in its own SQLite file and with its own
+limits, so cache churn and day roll-overs never drop a plan that has
+already been handed out. Rows are kept while their plan can still be
+served (PLAN_INDEX_KEEP_DAYS after the day it is dated from) and the oldest
+are dropped beyond PLAN_INDEX_SIZE; both sweeps run once every PRUNE_EVERY
+stores.
+
+With PLAN_INDEX_PATH empty the index lives in each worker's memory, and
+/plans/<etag> only finds plans served by the same worker process.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+
+# Stores between expiry and size sweeps
+PRUNE_EVERY = 64
+
+
+class PlanIndex:
+    """Plan id -> {"query", "page"} in SQLite, or in memory without a path."""
+
+    def __init__(self, path=None, max_entries=100000, keep_days=1):
+        self.path = path
+        self.max_entries = max_entries
+        self.keep_days = keep_days
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._puts = 0
+
+    @classmethod
+    def from_env(cls):
+        """Build an index configured by PLAN_INDEX_* environment variables."""
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        path = os.getenv('PLAN_INDEX_PATH', os.path.join(base_dir, 'plan_index.sqlite3'))
+        return cls(
+            path=path or None,
+            max_entries=int(os.getenv('PLAN_INDEX_SIZE', '100000')),
+            keep_days=int(os.getenv('PLAN_INDEX_KEEP_DAYS', '1'))
+        )
+
+    def _connection(self):
+        """Return this thread's SQLite connection, reopening it after a fork."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS plan_index ('
+                'etag TEXT PRIMARY KEY, day TEXT NOT NULL, record TEXT NOT NULL, created REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS plan_index_created ON plan_index (created)')
+            conn.execute('CREATE INDEX IF NOT EXISTS plan_index_day ON plan_index (day)')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, etag):
+        """Return the record stored for ``etag``, or None."""
+        if not self.path:
+            with self._lock:
+                return self._memory.get(etag)
+        try:
+            row = self._connection().execute('SELECT record FROM plan_index WHERE etag = ?', (etag,)).fetchone()
+        except sqlite3.Error:
+            return None
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, etag, day, record):
+        """Store ``record`` for plan ``etag`` dated from ``day``, unless it is already indexed."""
+        if not self.path:
+            with self._lock:
+                self._memory[etag] = record
+                while len(self._memory) > self.max_entries:
+                    self._memory.popitem(last=False)
+            return
+        with self._lock:
+            self._puts += 1
+            prune = self._puts % PRUNE_EVERY == 1
+        try:
+            conn = self._connection()
+            conn.execute(
+                'INSERT OR IGNORE INTO plan_index (etag, day, record, created) VALUES (?, ?, ?, ?)',
+                (etag, day, json.dumps(record), time.time())
+            )
+            if prune:
+                self._prune(conn)
+        except sqlite3.Error:
+            pass
+
+    def _prune(self, conn):
+        # Measured from the server's today, never from a requested day
+        oldest = (date.today() - timedelta(days=self.keep_days)).isoformat()
+        conn.execute('DELETE FROM plan_index WHERE day < ?', (oldest,))
+        conn.execute(
+            'DELETE FROM plan_index WHERE etag IN (SELECT etag FROM plan_index ORDER BY created '
+            'LIMIT max(0, (SELECT COUNT(*) FROM plan_index) - ?))',
+            (self.max_entries,)
+        )
@@ -0,0 +1,181 @@
+"""Compact, read-only plans for holding many of them in memory.
+
+Generated plans are nested dicts and lists, and every entry repeats the same
+keys and many identical strings. ``freeze()`` turns a plan into Plan, Entry
+and Description objects with ``__slots__``:
+
+- the keys of each dict layout are stored once, as a shared tuple;
+- lists become tuples;
+- strings go through a pool, so equal strings are stored once.
+
+A pool is a plain dict that lives only as long as the caller keeps it:
+one per ``freeze()`` call by default, or one per batch chunk when the
+caller passes it in. Nothing is pooled for the life of the process, so a
+long-running server does not fill up with one-off titles and dates.
+
+``to_dict()`` (or ``thaw()``) gives back exactly the JSON shape /generate
+returns, and ``json_default`` lets json.dumps and orjson serialize frozen
+plans directly.
+"""
+import os
+from collections.abc import Mapping
+
+# Distinct strings one pool holds; later strings are kept as they are
+STRING_POOL_SIZE = int(os.getenv('STRING_POOL_SIZE', '100000'))
+
+ENTRY_KEYS = ('period', 'periodName', 'date', 'title', 'description')
+# Optional plan fields that come before "entries"; the others follow it
+PLAN_HEADER_KEYS = ('total_entries',)
+
+# Dict layouts come from the fixed plan and catalog shapes, so this stays small
+_layouts = {}
+
+
+def intern(text, pool):
+    """Return the copy of ``text`` held in ``pool``."""
+    pooled = pool.get(text)
+    if pooled is None:
+        if len(pool) >= STRING_POOL_SIZE:
+            return text
+        pooled = pool[text] = text
+    return pooled
+
+
+def _layout(keys):
+    """Return the shared tuple for a dict's keys."""
+    keys = tuple(keys)
+    return _layouts.setdefault(keys, keys)
+
+
+def freeze(value, pool=None):
+    """Return ``value`` with its plans, entries, dicts, lists and strings in compact form.
+
+    Pass the same ``pool`` dict to several calls to share strings between them.
+    """
+    if pool is None:
+        pool = {}
+    if isinstance(value, str):
+        return intern(value, pool)
+    if isinstance(value, dict):
+        if 'entries' in value and 'period' in value and 'title' in value:
+            return Plan.from_dict(value, pool)
+        if tuple(value) == ENTRY_KEYS:
+            return Entry.from_dict(value, pool)
+        return Description.from_dict(value, pool)
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item, pool) for item in value)
+    return value
+
+
+def thaw(value):
+    """Return the plain dicts and lists a frozen value was made from."""
+    if isinstance(value, (Plan, Entry, Description)):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def json_default(value):
+    """``default`` hook for json.dumps and orjson.dumps."""
+    if isinstance(value, (Plan, Entry, Description)):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class Description(Mapping):
+    """A read-only dict stored as a shared key tuple and a tuple of values."""
+
+    __slots__ = ('_keys', '_values')
+
+    def __init__(self, keys, values):
+        self._keys = keys
+        self._values = values
+
+    @classmethod
+    def from_dict(cls, data, pool):
+        return cls(_layout(data), tuple(freeze(value, pool) for value in data.values()))
+
+    def __getitem__(self, key):
+        try:
+            return self._values[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return f"Description({self.to_dict()!r})"
+
+    def to_dict(self):
+        return {key: thaw(value) for key, value in zip(self._keys, self._values)}
+
+
+class Entry:
+    """One dated plan entry."""
+
+    __slots__ = ('period', 'period_name', 'date', 'title', 'description')
+
+    def __init__(self, period, period_name, date, title, description):
+        self.period = period
+        self.period_name = period_name
+        self.date = date
+        self.title = title
+        self.description = description
+
+    @classmethod
+    def from_dict(cls, data, pool):
+        return cls(*(freeze(data[key], pool) for key in ENTRY_KEYS))
+
+    def __eq__(self, other):
+        if not isinstance(other, Entry):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Entry({self.period_name!r}, {self.date!r})"
+
+    def to_dict(self):
+        return dict(zip(ENTRY_KEYS, (self.period, self.period_name, self.date, self.title,
+                                     thaw(self.description))))
+
+
+class Plan:
+    """A plan: its period, title, entries and any optional fields such as ``next_cursor``."""
+
+    __slots__ = ('period', 'title', 'entries', 'extra')
+
+    def __init__(self, period, title, entries, extra=()):
+        self.period = period
+        self.title = title
+        self.entries = entries
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data, pool):
+        extra = tuple((intern(key, pool), freeze(value, pool)) for key, value in data.items()
+                      if key not in ('period', 'title', 'entries'))
+        return cls(intern(data['period'], pool), intern(data['title'], pool), freeze(data['entries'], pool), extra)
+
+    def __eq__(self, other):
+        if not isinstance(other, Plan):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Plan({self.period!r}, {self.title!r}, {len(self.entries)} entries)"
+
+    def to_dict(self):
+        plan = {"period": self.period, "title": self.title}
+        plan.update((key, thaw(value)) for key, value in self.extra if key in PLAN_HEADER_KEYS)
+        plan["entries"] = thaw(self.entries)
+        plan.update((key, thaw(value)) for key, value in self.extra if key not in PLAN_HEADER_KEYS)
+        return plan
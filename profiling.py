@@ -0,0 +1,214 @@
+"""On-demand profiling of plan generation.
+
+A profile is taken when PROFILE_ENABLED=1 (every call, or a PROFILE_RATE
+fraction of calls), or when a request carries the PROFILE_HEADER header
+(``X-Profile``) with one of the PROFILE_TOKENS. Each profile is written to
+PROFILE_DIR as two files:
+
+- ``<id>.collapsed``: one ``frame;frame;frame weight`` line per stack, the
+  input format of flamegraph.pl, speedscope and similar tools.
+- ``<id>.txt``: the top PROFILE_TOP functions by self and total weight.
+
+``deterministic`` mode traces every call in the profiled thread and weighs
+stacks in microseconds. ``sampling`` mode records the thread's stack every
+PROFILE_INTERVAL seconds and weighs stacks in samples. Only the newest
+PROFILE_KEEP profiles are kept. When profiling is off, nothing is wrapped.
+"""
+import functools
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+
+def frame_label(code):
+    """Name a Python function as ``file.py:qualname``."""
+    return f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def builtin_label(func):
+    """Name a C function as ``module:qualname``."""
+    module = getattr(func, '__module__', None) or '<built-in>'
+    return f"{module}:{getattr(func, '__qualname__', repr(func))}"
+
+
+class _Tracer:
+    """sys.setprofile hook charging elapsed time to the current call stack."""
+
+    def __init__(self):
+        self.stack = []
+        self.stacks = Counter()
+        self.last = time.perf_counter_ns()
+
+    def __call__(self, frame, event, arg):
+        now = time.perf_counter_ns()
+        if self.stack:
+            self.stacks[tuple(self.stack)] += now - self.last
+        if event == 'call':
+            self.stack.append(frame_label(frame.f_code))
+        elif event == 'c_call':
+            self.stack.append(builtin_label(arg))
+        elif self.stack:
+            # return, c_return or c_exception; a generator's yield is a return too
+            self.stack.pop()
+        self.last = time.perf_counter_ns()
+
+
+class Profiler:
+    """Profile single calls and keep the newest results on disk."""
+
+    def __init__(self, directory='profiles', mode='deterministic', interval=0.001, keep=50, top=20,
+                 enabled=False, rate=1.0, header='X-Profile', tokens=()):
+        if mode not in ('deterministic', 'sampling'):
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.directory = directory
+        self.mode = mode
+        self.interval = interval
+        self.keep = keep
+        self.top = top
+        self.enabled = enabled
+        self.rate = rate
+        self.header = header
+        self.tokens = frozenset(tokens)
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+
+    @classmethod
+    def from_env(cls):
+        """Build a profiler configured by PROFILE_* environment variables."""
+        return cls(
+            directory=os.getenv('PROFILE_DIR', 'profiles'),
+            mode=os.getenv('PROFILE_MODE', 'deterministic'),
+            interval=float(os.getenv('PROFILE_INTERVAL', '0.001')),
+            keep=int(os.getenv('PROFILE_KEEP', '50')),
+            top=int(os.getenv('PROFILE_TOP', '20')),
+            enabled=os.getenv('PROFILE_ENABLED', '0') == '1',
+            rate=float(os.getenv('PROFILE_RATE', '1')),
+            header=os.getenv('PROFILE_HEADER', 'X-Profile'),
+            tokens=[token.strip() for token in os.getenv('PROFILE_TOKENS', '').split(',') if token.strip()]
+        )
+
+    def allows(self, headers):
+        """True when ``headers`` carry an allow-listed profiling token."""
+        return bool(self.tokens) and headers.get(self.header) in self.tokens
+
+    def profiled(self, func):
+        """Decorate ``func`` to be profiled on every call (or at PROFILE_RATE) when enabled."""
+        if not self.enabled:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if self.rate < 1.0 and random.random() >= self.rate:
+                return func(*args, **kwargs)
+            return self.profile(func, *args, **kwargs)[0]
+        return wrapper
+
+    def profile(self, func, *args, label=None, **kwargs):
+        """Call ``func`` under the profiler and return (result, profile id or None).
+
+        Nested calls inside a profile are not profiled again.
+        """
+        if getattr(self._local, 'active', False):
+            return func(*args, **kwargs), None
+        self._local.active = True
+        start = time.perf_counter()
+        try:
+            if self.mode == 'sampling':
+                result, stacks = self._sample(func, args, kwargs)
+            else:
+                result, stacks = self._trace(func, args, kwargs)
+        finally:
+            self._local.active = False
+        elapsed = time.perf_counter() - start
+        return result, self._write(stacks, elapsed, label or getattr(func, '__name__', repr(func)))
+
+    def _trace(self, func, args, kwargs):
+        tracer = _Tracer()
+        sys.setprofile(tracer)
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            sys.setprofile(None)
+        # Nanoseconds to microseconds; stacks under half a microsecond are dropped
+        stacks = Counter({stack: round(ns / 1000) for stack, ns in tracer.stacks.items() if ns >= 500})
+        return result, stacks
+
+    def _sample(self, func, args, kwargs):
+        thread_id = threading.get_ident()
+        # Stop each stack at the caller's frame so only func and what it calls are recorded
+        caller = sys._getframe()
+        stacks = Counter()
+        done = threading.Event()
+
+        def sample():
+            while not done.wait(self.interval):
+                frame = sys._current_frames().get(thread_id)
+                stack = []
+                while frame is not None and frame is not caller:
+                    stack.append(frame_label(frame.f_code))
+                    frame = frame.f_back
+                if stack:
+                    stacks[tuple(reversed(stack))] += 1
+
+        sampler = threading.Thread(target=sample, name='profile-sampler', daemon=True)
+        sampler.start()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            done.set()
+            sampler.join()
+        return result, stacks
+
+    def _write(self, stacks, elapsed, label):
+        """Write the collapsed stacks and the summary; return the profile id."""
+        os.makedirs(self.directory, exist_ok=True)
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{next(self._ids):04d}"
+        base = os.path.join(self.directory, profile_id)
+
+        with open(base + '.collapsed', 'w') as f:
+            for stack, weight in sorted(stacks.items()):
+                f.write(f"{';'.join(stack)} {weight}\n")
+        with open(base + '.txt', 'w') as f:
+            f.write(self.summary(stacks, elapsed, label))
+
+        self._prune()
+        return profile_id
+
+    def summary(self, stacks, elapsed, label):
+        """Top functions by self weight (leaf of a stack) and total weight (anywhere in it)."""
+        own, total = Counter(), Counter()
+        for stack, weight in stacks.items():
+            own[stack[-1]] += weight
+            for name in set(stack):
+                total[name] += weight
+        unit = 'samples' if self.mode == 'sampling' else 'us'
+        lines = [
+            f"label: {label}",
+            f"mode: {self.mode}, wall time {elapsed * 1e3:.3f} ms, weights in {unit}",
+            "",
+            f"{'self':>10} {'total':>10}  function"
+        ]
+        for name, weight in own.most_common(self.top):
+            lines.append(f"{weight:>10} {total[name]:>10}  {name}")
+        lines += ["", f"{'total':>10}  function"]
+        for name, weight in total.most_common(self.top):
+            lines.append(f"{weight:>10}  {name}")
+        return '\n'.join(lines) + '\n'
+
+    def _prune(self):
+        """Delete the oldest profiles beyond ``keep``; ids sort in creation order."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        ids = sorted({name.rsplit('.', 1)[0] for name in names if name.endswith(('.collapsed', '.txt'))})
+        for profile_id in ids[:max(len(ids) - self.keep, 0)]:
+            for suffix in ('.collapsed', '.txt'):
+                try:
+                    os.remove(os.path.join(self.directory, profile_id + suffix))
+                except FileNotFoundError:
+                    pass  # Another worker pruned it first
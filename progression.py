@@ -0,0 +1,96 @@
+"""Numeric series of progressive plans, computed for every entry at once.
+
+Each entry of a plan advances a ``progress`` value towards 1.0, and its
+numbers (macros and calories, intensity and heart-rate bands, savings and
+investment targets, accuracy goals) follow from it. ``progression()``
+computes all of them for a whole plan, or a page of it, as NumPy arrays
+in one pass; entries only format the values they are handed.
+
+PROGRESSION_CURVE shapes ``progress``:
+
+- ``linear`` (the default): entry n of N is at n / N.
+- ``step[:S]``: held flat in S equal blocks (default 4), reaching 1.0 in the last.
+- ``periodized[:C]``: cycles of C entries (default 4) that build for C - 1
+  entries, then deload back to the level the cycle started at.
+"""
+import os
+
+import numpy as np
+
+CURVES = ('linear', 'step', 'periodized')
+
+PROGRESSION_CURVE = os.getenv('PROGRESSION_CURVE', 'linear')
+
+
+def parse_curve(spec):
+    """Return (name, parameter) for a curve spec such as ``step:4``."""
+    name, _, parameter = spec.partition(':')
+    if name not in CURVES:
+        raise ValueError(f"Unknown progression curve: {spec}")
+    try:
+        parameter = int(parameter) if parameter else 4
+    except ValueError:
+        raise ValueError(f"Unknown progression curve: {spec}") from None
+    if parameter < 1 or (name == 'periodized' and parameter < 2):
+        raise ValueError(f"Unknown progression curve: {spec}")
+    return name, parameter
+
+
+# Fail at start-up, not on the first plan, when the spec is wrong
+parse_curve(PROGRESSION_CURVE)
+
+
+def progress_curve(total, start=0, stop=None, curve=PROGRESSION_CURVE):
+    """Return the progress of entries ``start:stop`` of a ``total``-entry plan."""
+    name, parameter = parse_curve(curve)
+    periods = np.arange(start + 1, (total if stop is None else stop) + 1, dtype=np.float64)
+    if name == 'step':
+        return np.ceil(periods * parameter / total) / parameter
+    if name == 'periodized':
+        # The last entry of each cycle repeats the cycle's first
+        deload = periods % parameter == 0
+        return np.where(deload, periods - (parameter - 1), periods) / total
+    return periods / total
+
+
+def progression(content_type, total, initial_values, start=0, stop=None, curve=PROGRESSION_CURVE):
+    """Return one dict of precomputed values for each of entries ``start:stop``.
+
+    The arithmetic matches the scalar formulas it replaced, including the
+    truncation of int(), so linear plans are unchanged.
+    """
+    progress = progress_curve(total, start, stop, curve)
+    series = {'progress': progress}
+    if content_type == 'study':
+        series['accuracy'] = (70 + progress * 20).astype(np.int64)
+
+    elif content_type == 'workout':
+        heart_rate = (progress * 40).astype(np.int64)
+        series.update({
+            'intensity': np.minimum((progress * 5).astype(np.int64), 4),
+            'level': np.select([progress > 0.6, progress > 0.3], [2, 1], 0),
+            'minutes': 45 + (progress * 15).astype(np.int64),
+            'bpm_low': 110 + heart_rate,
+            'bpm_high': 130 + heart_rate
+        })
+
+    elif content_type == 'meal':
+        protein = int(initial_values['protein_target']) + (10 * progress).astype(np.int64)
+        series.update({
+            'protein': protein,
+            'protein_per_meal': (protein / 4).astype(np.int64),
+            'carbs': int(initial_values['carbs_target']) - (20 * progress).astype(np.int64),
+            'fats': np.full(len(progress), int(initial_values['fats_target'])),
+            'calories': int(initial_values['daily_calories']) + (100 * progress).astype(np.int64)
+        })
+
+    elif content_type == 'finance':
+        series.update({
+            'savings': float(initial_values['monthly_savings'].rstrip('%')) + (5 * progress),
+            'investment': float(initial_values['investment_ratio'].rstrip('%')) + (10 * progress),
+            'expense_reduction': 5 + (5 * progress)
+        })
+
+    # Plain Python numbers, so entries format exactly as before
+    columns = {name: values.tolist() for name, values in series.items()}
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
@@ -0,0 +1,272 @@
+"""Compiled prompt templates with a local token estimate and an input budget.
+
+A PromptTemplate is dedented and split into its static text and ``$name``
+slots once. Rendering is a join, and the static part's token estimate is
+known in advance. ``plan_template()`` compiles the plan prompt once per
+(period, content type). Embedded structures are written as compact JSON.
+
+``estimate_tokens()`` approximates subword tokenizers without a vocabulary.
+Words count one token per six letters, numbers one per three digits, and
+every other non-space character one. Prompts are fitted to
+PROMPT_TOKEN_BUDGET: the plan's entries are cut to as many as fit, and
+text that still does not fit is truncated.
+"""
+import json
+import os
+import re
+import textwrap
+from functools import lru_cache
+
+# Input tokens the model is sent per call, including the response instructions
+PROMPT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', '4000'))
+
+TOKEN_RE = re.compile(r'[^\W\d_]{1,6}|\d{1,3}|\S')
+SLOT_RE = re.compile(r'\$(\w+)')
+
+
+def estimate_tokens(text):
+    """Estimate how many tokens a model's tokenizer splits ``text`` into."""
+    return len(TOKEN_RE.findall(text))
+
+
+def truncate_tokens(text, max_tokens):
+    """Return the longest prefix of ``text`` estimated at ``max_tokens`` or fewer."""
+    # A token is at least one character, so short text always fits
+    if len(text) <= max_tokens:
+        return text
+    for count, match in enumerate(TOKEN_RE.finditer(text)):
+        if count == max_tokens:
+            return text[:match.start()].rstrip()
+    return text
+
+
+def compact_json(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+class PromptTemplate:
+    """Static prompt text compiled once, with ``$name`` slots filled per call."""
+
+    def __init__(self, text):
+        text = textwrap.dedent(text).strip()
+        # Indentation is for the source, not the model; keep one blank line between blocks
+        text = re.sub(r'\n{3,}', '\n\n', '\n'.join(line.rstrip() for line in text.splitlines()))
+        pieces = SLOT_RE.split(text)
+        self.parts = pieces[::2]
+        self.slots = pieces[1::2]
+        self.static_tokens = estimate_tokens(''.join(self.parts))
+
+    def render(self, **values):
+        out = [self.parts[0]]
+        for slot, part in zip(self.slots, self.parts[1:]):
+            out.append(str(values[slot]))
+            out.append(part)
+        return ''.join(out)
+
+    def partial(self, **values):
+        """Return a template with some slots filled in; the rest stay open."""
+        return PromptTemplate(self.render(**values, **{slot: f"${slot}" for slot in self.slots if slot not in values}))
+
+
+CONTENT_REQUIREMENTS = {
+    "meal": """
+        For meal/diet plans:
+        1. Each entry must have UNIQUE and SPECIFIC:
+           - Meal options with portions and calories
+           - Macro targets (protein/carbs/fats in grams)
+           - Total calorie targets
+           - Specific tasks and tips
+        2. For each meal provide:
+           - Exact ingredients and portions
+           - Protein content per meal
+           - Cooking instructions or prep notes
+        3. Progressive changes:
+           - Gradually increase/adjust portions
+           - Vary meal choices each week/month
+           - Adapt to seasonal ingredients
+        4. Tracking metrics:
+           - Set specific weight targets
+           - Daily protein intake goals
+           - Water intake requirements
+        5. Make content contextual:
+           - Monday-Friday: Quick prep meals
+           - Weekends: More elaborate meals
+           - Monthly: Seasonal ingredients
+           - Consider holidays and events""",
+    "workout": """
+        For workout plans:
+        1. Include specific exercises with sets and reps
+        2. Provide duration and intensity
+        3. List required equipment
+        4. Add form tips and safety notes
+        5. Include progressive overload""",
+    "study": """
+        For study plans:
+        1. Break down topics into manageable chunks
+        2. Include specific resources and materials
+        3. Add review and practice sessions
+        4. Track progress with assessments"""
+}
+
+PLAN_PROMPT = PromptTemplate("""
+    Generate a detailed $period plan for: "$query"
+    Content type: $content_type
+
+    Follow this EXACT format:
+    {
+        "period": "$period",
+        "title": "Title of the plan",
+        "entries": [
+            {
+                "period": "day/week/month",
+                "periodName": "Name of the period",
+                "date": "today's date: $today",
+                "title": "Title for this entry",
+                "description": {
+                    // Content specific to the type
+                    // MUST BE UNIQUE for each entry
+                    // NO DEFAULT VALUES
+                }
+            }
+        ]
+    }
+
+    Base structure to follow:
+    $structure
+    $omitted
+
+    $requirements
+
+    IMPORTANT REQUIREMENTS:
+    1. Keep EXACT format - no additional fields
+    2. Fill all arrays with UNIQUE, SPECIFIC items
+    3. NO DEFAULT VALUES or placeholder text
+    4. Make content unique for each entry
+    5. Keep content focused and actionable
+    6. Return ONLY valid JSON
+    7. Ensure no empty arrays in description
+    8. Make content progressive and build over time
+    9. Include specific, measurable goals
+    10. Adapt content based on the time period (day/week/month)
+    11. For meal plans: Include specific portions, calories, and macros
+    12. For tracking fields: Always include specific target values
+    """)
+
+CHUNK_PROMPT = PromptTemplate("""
+    You are a specialized plan generator. Create a detailed plan following these rules:
+
+    INPUT QUERY:
+    $prompt
+
+    RESPONSE FORMAT:
+    {
+        "title": "Clear, specific title",
+        "description": "Brief, focused description",
+        "plan_type": "Type of plan (day/week/month/year)",
+        "content": {
+            // Specific content based on the plan type
+            // Use the structure provided in the input
+        },
+        "metrics": [
+            // 3-4 specific, measurable metrics
+        ],
+        "resources": [
+            // 3-4 specific required resources
+        ],
+        "tips": [
+            // 3-4 actionable recommendations
+        ]
+    }
+
+    REQUIREMENTS:
+    1. Use ONLY double quotes for ALL strings
+    2. Include ALL required sections
+    3. Make content specific and actionable
+    4. Keep lists to 3-4 items maximum
+    5. Use proper JSON format
+    6. No comments or extra text
+    """)
+
+
+MILESTONE_PROMPT = PromptTemplate("""
+    Generate a detailed plan in JSON format for: "$query".
+    Use this structure:
+    $structure
+
+    Current date: $today
+
+    Follow these period formatting rules strictly:
+    1. Use ONLY the period type specified in the template above
+    2. Keep all periodName values exactly as provided in the template
+    3. Maintain the exact dates provided in the template
+    4. Include all activities for each period in the description field
+    5. DO NOT create additional entries or change the period structure
+
+    Based on the type of plan requested, include these specific details in the description field:
+    - For fitness/workout plans: Include exercises, sets, reps, and rest periods
+    - For diet plans: Include meals, portions, calories, and nutritional info
+    - For study plans: Include topics, learning objectives, and resources
+    - For financial plans: Include specific amounts, strategies, and goals
+    - For project plans: Include tasks, deadlines, and deliverables
+    - For habit-building plans: Include specific actions, triggers, and tracking methods
+
+    Keep descriptions detailed but concise. Format numbers consistently.
+    """)
+
+
+@lru_cache(maxsize=64)
+def plan_template(time_period, content_type):
+    """Return the plan prompt with its period, type and requirements filled in."""
+    requirements = textwrap.dedent(CONTENT_REQUIREMENTS.get(content_type, '')).strip()
+    return PLAN_PROMPT.partial(period=time_period, content_type=content_type, requirements=requirements)
+
+
+def fit_structure(structure, max_tokens):
+    """Return (compact JSON of ``structure``, entries left out) within ``max_tokens``.
+
+    Entries are kept from the start of the plan for as long as they fit; the
+    rest are summarized in one line of the prompt.
+    """
+    entries = structure.get('entries')
+    if not isinstance(entries, list):
+        return truncate_tokens(compact_json(structure), max_tokens), 0
+    header = dict(structure, entries=[])
+    used = estimate_tokens(compact_json(header))
+    kept = 0
+    for entry in entries:
+        # One more token for the comma between entries
+        used += estimate_tokens(compact_json(entry)) + 1
+        if used > max_tokens:
+            break
+        kept += 1
+    if kept == len(entries):
+        return compact_json(structure), 0
+    return compact_json(dict(structure, entries=entries[:kept])), len(entries) - kept
+
+
+def render_plan_prompt(query, time_period, content_type, structure, today, budget=PROMPT_TOKEN_BUDGET):
+    """Render the plan prompt, trimmed to ``budget`` tokens once the response instructions are added."""
+    template = plan_template(time_period, content_type)
+    available = budget - CHUNK_PROMPT.static_tokens - template.static_tokens
+    # The query gets at most a quarter of the room; the structure takes what is left
+    query = truncate_tokens(query, max(available // 4, 0))
+    available -= estimate_tokens(query) + estimate_tokens(today)
+    # Reserve room for the note about left-out entries
+    structure_json, omitted = fit_structure(structure, max(available - 20, 0))
+    note = f"({omitted} more entries follow the same structure.)" if omitted else ""
+    return template.render(query=query, today=today, structure=structure_json, omitted=note)
+
+
+def render_milestone_prompt(query, timeframe, entries, today, budget=PROMPT_TOKEN_BUDGET):
+    """Render temp.py's milestone prompt, trimmed to ``budget`` tokens."""
+    available = budget - MILESTONE_PROMPT.static_tokens
+    query = truncate_tokens(query, max(available // 4, 0))
+    available -= estimate_tokens(query) + estimate_tokens(today)
+    structure = {"period": timeframe, "title": "plan title", "entries": entries}
+    structure_json, _ = fit_structure(structure, max(available, 0))
+    return MILESTONE_PROMPT.render(query=query, structure=structure_json, today=today)
+
+
+def render_chunk_prompt(prompt, budget=PROMPT_TOKEN_BUDGET):
+    """Wrap a plan prompt in the response instructions, truncating it to fit ``budget``."""
+    return CHUNK_PROMPT.render(prompt=truncate_tokens(prompt, max(budget - CHUNK_PROMPT.static_tokens, 0)))
@@ -0,0 +1,89 @@
+import re
+from functools import cached_property, lru_cache
+from nltk.tokenize import word_tokenize
+from nltk.tag import pos_tag, pos_tag_sents
+from nltk.chunk import ne_chunk
+from nltk.corpus import stopwords
+from fast_path import fast_analyze
+from content_classifier import content_classifier
+
+
+@lru_cache(maxsize=None)
+def get_stop_words():
+    """Load the English stopword set once per process."""
+    return frozenset(stopwords.words('english'))
+
+
+class QueryAnalysis:
+    """NLTK analysis of a single query, computed lazily and at most once.
+
+    Every field is a cached property, so a stage only pays for the NLTK work it
+    actually reads and later stages reuse it instead of re-tokenizing.
+    """
+
+    def __init__(self, query):
+        self.query = query
+
+    @classmethod
+    def of(cls, query):
+        """Return ``query`` if it is already an analysis, otherwise wrap it."""
+        return query if isinstance(query, cls) else cls(query)
+
+    @cached_property
+    def lower(self):
+        return self.query.lower()
+
+    @cached_property
+    def content_type(self):
+        return content_classifier.classify(self.lower)[0]
+
+    @cached_property
+    def fast(self):
+        return fast_analyze(self.query, self.content_type)
+
+    @cached_property
+    def tokens(self):
+        return word_tokenize(self.query)
+
+    @cached_property
+    def lower_tokens(self):
+        return [token.lower() for token in self.tokens]
+
+    @cached_property
+    def pos_tags(self):
+        return pos_tag(self.tokens)
+
+    @cached_property
+    def filtered_tokens(self):
+        stop_words = get_stop_words()
+        return [token for token, lower in zip(self.tokens, self.lower_tokens) if lower not in stop_words]
+
+    @cached_property
+    def named_entities(self):
+        return ne_chunk(self.pos_tags)
+
+    @cached_property
+    def cleaned(self):
+        stop_words = get_stop_words()
+        cleaned = ' '.join(token for token in self.lower_tokens if token not in stop_words)
+        # Remove special characters but keep basic punctuation
+        return re.sub(r'[^\w\s.,!?-]', '', cleaned)
+
+
+def classify_analyses(analyses):
+    """Classify the content type of every analysis not classified yet with a single batch scoring."""
+    pending = [analysis for analysis in analyses if 'content_type' not in analysis.__dict__]
+    if pending:
+        labels, _ = content_classifier.classify_batch([analysis.lower for analysis in pending])
+        for analysis, label in zip(pending, labels):
+            analysis.content_type = label
+    return analyses
+
+
+def tag_analyses(analyses):
+    """POS-tag every analysis that is not tagged yet with a single pos_tag_sents call."""
+    pending = [analysis for analysis in analyses if 'pos_tags' not in analysis.__dict__]
+    if pending:
+        for analysis, tags in zip(pending, pos_tag_sents([analysis.tokens for analysis in pending])):
+            analysis.pos_tags = tags
+    return analyses
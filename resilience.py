@@ -0,0 +1,265 @@
+"""Retries with backoff and a circuit breaker for calls to the language model.
+
+Errors fall into four classes:
+
+- transient: timeouts, connection failures, rate limits and 5xx responses.
+  Retried, and counted against the upstream by the breaker.
+- invalid: the model answered but the response was unusable. Retried,
+  since the next sample may parse, but the upstream counts as healthy.
+- fatal: bad requests and auth failures. Not retried.
+- missing: replay mode has no recorded response for the prompt. Not
+  retried, and not held against the upstream, which was never called.
+
+After ``failure_threshold`` consecutive upstream failures the breaker
+opens. Calls then fail immediately until ``reset_timeout`` has passed,
+when a single trial call is let through.
+"""
+import asyncio
+import os
+import random
+import threading
+import time
+
+try:
+    from google.api_core import exceptions as api_exceptions
+except ImportError:  # The SDK is optional when a stub model is used
+    api_exceptions = None
+
+TRANSIENT, INVALID, FATAL, MISSING = 'transient', 'invalid', 'fatal', 'missing'
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the model while the breaker is open."""
+
+
+class ReplayMissError(LookupError):
+    """Raised in replay mode for a prompt with no recorded response."""
+
+
+def classify_error(error):
+    """Return TRANSIENT, INVALID, FATAL or MISSING for an exception raised by a model call."""
+    if isinstance(error, ReplayMissError):
+        return MISSING
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return TRANSIENT
+    if api_exceptions is not None and isinstance(error, api_exceptions.GoogleAPICallError):
+        code = getattr(error, 'code', None)
+        if isinstance(error, (api_exceptions.TooManyRequests, api_exceptions.ResourceExhausted,
+                              api_exceptions.ServerError, api_exceptions.DeadlineExceeded)):
+            return TRANSIENT
+        if isinstance(code, int) and (code == 429 or code >= 500):
+            return TRANSIENT
+        return FATAL
+    if isinstance(error, ValueError):
+        # Unparseable or incomplete JSON, including JSONDecodeError
+        return INVALID
+    if isinstance(error, OSError):
+        return TRANSIENT
+    return FATAL
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker shared by every thread and the event loop."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self.stats = {
+            'opened': 0,
+            'rejected': 0,
+            'successes': 0,
+            'failures': 0
+        }
+
+    @classmethod
+    def from_env(cls):
+        """Build a breaker configured by LLM_BREAKER_* environment variables."""
+        return cls(
+            failure_threshold=int(os.getenv('LLM_BREAKER_THRESHOLD', '5')),
+            reset_timeout=float(os.getenv('LLM_BREAKER_RESET', '30'))
+        )
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._trial_running = False
+        return self._state
+
+    def is_open(self):
+        """Whether calls would be rejected right now (without claiming a half-open trial)."""
+        with self._lock:
+            state = self._current_state()
+            return state == OPEN or (state == HALF_OPEN and self._trial_running)
+
+    def allow(self):
+        """Claim permission for one call; False means fail fast."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.stats['rejected'] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.stats['successes'] += 1
+            self._failures = 0
+            self._state = CLOSED
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.stats['failures'] += 1
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.stats['opened'] += 1
+                self._state = OPEN
+                self._opened_at = self.clock()
+                self._trial_running = False
+
+    def release(self):
+        """Give back a half-open trial whose call was abandoned before it finished."""
+        with self._lock:
+            self._trial_running = False
+
+    def get_stats(self):
+        """Return the breaker state and counters."""
+        with self._lock:
+            return dict(self.stats, state=self._current_state(), consecutive_failures=self._failures,
+                        failure_threshold=self.failure_threshold, reset_timeout=self.reset_timeout)
+
+
+class RetryPolicy:
+    """Bounded retries with exponential backoff and full jitter."""
+
+    def __init__(self, max_attempts=2, base_delay=0.5, max_delay=8.0, classify=classify_error):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.classify = classify
+        self._lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'attempts': 0,
+            'retries': 0,
+            'successes': 0,
+            'exhausted': 0,
+            'fatal': 0,
+            'missing': 0,
+            'short_circuited': 0
+        }
+
+    @classmethod
+    def from_env(cls):
+        """Build a policy configured by LLM_RETRY_* environment variables."""
+        return cls(
+            max_attempts=int(os.getenv('LLM_RETRY_ATTEMPTS', '2')),
+            base_delay=float(os.getenv('LLM_RETRY_BASE_DELAY', '0.5')),
+            max_delay=float(os.getenv('LLM_RETRY_MAX_DELAY', '8'))
+        )
+
+    def backoff(self, attempt):
+        """Seconds to wait after failed attempt ``attempt`` (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _before(self, breaker):
+        if breaker is not None and not breaker.allow():
+            self._count('short_circuited')
+            raise CircuitOpenError("Model circuit breaker is open")
+        self._count('attempts')
+
+    def _after_error(self, error, attempt, breaker):
+        """Record a failed attempt; return True if it should be retried."""
+        kind = self.classify(error)
+        if kind == MISSING:
+            self._abandon(breaker)
+            self._count('missing')
+            return False
+        if breaker is not None:
+            if kind == INVALID:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+        if kind == FATAL:
+            self._count('fatal')
+            return False
+        if attempt >= self.max_attempts:
+            self._count('exhausted')
+            return False
+        self._count('retries')
+        return True
+
+    def _abandon(self, breaker):
+        if breaker is not None:
+            breaker.release()
+
+    def _after_success(self, breaker):
+        if breaker is not None:
+            breaker.record_success()
+        self._count('successes')
+
+    def call(self, func, breaker=None):
+        """Call ``func(attempt)`` until it succeeds, retries run out or the error is fatal."""
+        self._count('calls')
+        attempt = 1
+        while True:
+            self._before(breaker)
+            try:
+                result = func(attempt)
+            except BaseException as e:
+                if not isinstance(e, Exception):
+                    self._abandon(breaker)
+                    raise
+                if not self._after_error(e, attempt, breaker):
+                    raise
+                time.sleep(self.backoff(attempt))
+                attempt += 1
+                continue
+            self._after_success(breaker)
+            return result
+
+    async def call_async(self, func, breaker=None):
+        """Async ``call`` for a coroutine function ``func(attempt)``."""
+        self._count('calls')
+        attempt = 1
+        while True:
+            self._before(breaker)
+            try:
+                result = await func(attempt)
+            except BaseException as e:
+                if not isinstance(e, Exception):
+                    self._abandon(breaker)  # Cancelled or interrupted
+                    raise
+                if not self._after_error(e, attempt, breaker):
+                    raise
+                await asyncio.sleep(self.backoff(attempt))
+                attempt += 1
+                continue
+            self._after_success(breaker)
+            return result
+
+    def get_stats(self):
+        """Return retry counters and limits."""
+        with self._lock:
+            return dict(self.stats, max_attempts=self.max_attempts)
@@ -0,0 +1,153 @@
+"""Content-negotiated serialization and compression of plan responses.
+
+``plan_response()`` picks the body format from ``Accept``: JSON (encoded
+with orjson when it is installed), MessagePack or CBOR. It picks the
+compression from ``Accept-Encoding``: brotli or gzip. Formats and encodings
+whose package is missing are simply not offered.
+
+Entries served from the plan cache are the same objects in every response.
+For long plans, their serialized array is kept as a byte fragment and spliced into each
+response, so the repeated template content is encoded once per format.
+"""
+import gzip
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from flask import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON = 'application/json'
+MSGPACK = 'application/msgpack'
+CBOR = 'application/cbor'
+
+# Bodies smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', '5'))
+FRAGMENT_CACHE_SIZE = int(os.getenv('FRAGMENT_CACHE_SIZE', '512'))
+# Shorter entry lists encode faster than their fragment can be looked up
+FRAGMENT_MIN_ENTRIES = int(os.getenv('FRAGMENT_MIN_ENTRIES', '32'))
+
+
+def dumps_json(obj):
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def _cbor_map_header(length):
+    """CBOR major type 5 (map) header for ``length`` pairs."""
+    if length < 24:
+        return bytes([0xa0 + length])
+    return bytes([0xb8, length]) if length < 256 else bytes([0xb9]) + length.to_bytes(2, 'big')
+
+
+def _join_json(items):
+    return b'{' + b','.join(dumps_json(key) + b':' + value for key, value in items) + b'}'
+
+
+def _join_msgpack(items):
+    header = msgpack.Packer().pack_map_header(len(items))
+    return header + b''.join(msgpack.packb(key) + value for key, value in items)
+
+
+def _join_cbor(items):
+    return _cbor_map_header(len(items)) + b''.join(cbor2.dumps(key) + value for key, value in items)
+
+
+# media type -> (encode one value, join (key, encoded value) pairs into a map)
+FORMATS = {JSON: (dumps_json, _join_json)}
+if msgpack is not None:
+    FORMATS[MSGPACK] = (msgpack.packb, _join_msgpack)
+    FORMATS['application/x-msgpack'] = FORMATS[MSGPACK]
+if cbor2 is not None:
+    FORMATS[CBOR] = (cbor2.dumps, _join_cbor)
+
+# Preferred first
+ENCODINGS = (['br'] if brotli is not None else []) + ['gzip']
+
+
+class FragmentCache:
+    """Serialized entry arrays, keyed by format and the identity of the entries."""
+
+    def __init__(self, max_entries=FRAGMENT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._fragments = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get(self, media_type, entries, encode):
+        """Return ``encode(entries)``, reusing the bytes if these exact entry objects were seen."""
+        key = (media_type,) + tuple(map(id, entries))
+        with self._lock:
+            cached = self._fragments.get(key)
+            # The entries are kept alive with their bytes, so their ids cannot be reused
+            if cached is not None and all(a is b for a, b in zip(cached[0], entries)):
+                self._fragments.move_to_end(key)
+                self.stats['hits'] += 1
+                return cached[1]
+            self.stats['misses'] += 1
+        fragment = encode(entries)
+        if self.max_entries > 0:
+            with self._lock:
+                self._fragments[key] = (tuple(entries), fragment)
+                while len(self._fragments) > self.max_entries:
+                    self._fragments.popitem(last=False)
+        return fragment
+
+
+fragment_cache = FragmentCache()
+
+
+def serialize_plan(plan, media_type=JSON, fragments=fragment_cache):
+    """Encode ``plan`` as ``media_type``, splicing in the cached fragment for its entries."""
+    encode, join = FORMATS[media_type]
+    entries = plan.get('entries')
+    if not isinstance(entries, list) or len(entries) < FRAGMENT_MIN_ENTRIES or fragments is None:
+        return encode(plan)
+    return join([(key, fragments.get(media_type, value, encode) if key == 'entries' else encode(value))
+                 for key, value in plan.items()])
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime=0 keeps identical bodies byte-identical once compressed
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def negotiate(request):
+    """Return (media type, content encoding or None) for a request."""
+    media_type = request.accept_mimetypes.best_match(list(FORMATS), default=JSON) or JSON
+    encoding = request.accept_encodings.best_match(ENCODINGS)
+    return media_type, encoding
+
+
+def plan_response(plan, request, status=200):
+    """Build a Response for ``plan`` in the format and encoding the client accepts."""
+    media_type, encoding = negotiate(request)
+    body = serialize_plan(plan, media_type)
+    response = Response(body, status=status, mimetype=media_type)
+    if encoding and len(body) >= COMPRESS_MIN_BYTES:
+        response.set_data(compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+    response.vary.update(('Accept', 'Accept-Encoding'))
+    return response
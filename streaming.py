@@ -0,0 +1,34 @@
+"""Encoding of streamed plan events as NDJSON or Server-Sent Events."""
+import json
+
+STREAM_TRUE = ('1', 'true', 'yes')
+
+
+def wants_stream(request, data=None):
+    """Whether the client asked for a streamed response (``stream=true`` in the query or body)."""
+    if request.args.get('stream', '').lower() in STREAM_TRUE:
+        return True
+    return bool(data and data.get('stream'))
+
+
+def wants_sse(request):
+    """Whether to stream Server-Sent Events rather than NDJSON."""
+    if request.args.get('format') == 'sse':
+        return True
+    return request.accept_mimetypes.best == 'text/event-stream'
+
+
+def encode_event(event, data, sse=False):
+    """Encode one event as an SSE frame or an NDJSON line with a "type" field."""
+    if sse:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"type": event, **data}) + '\n'
+
+
+def encode_events(events, sse=False):
+    """Encode (event, data) pairs, ending with an "error" event if the stream fails."""
+    try:
+        for event, data in events:
+            yield encode_event(event, data, sse)
+    except Exception as e:
+        yield encode_event('error', {"error": f"{type(e).__name__}: {e}"}, sse)
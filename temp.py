@@ -1,29 +1,20 @@
-import google.generativeai as genai
 import json
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 from dotenv import load_dotenv
-import os
+from model_backend import create_model
+from content_classifier import timeframe_classifier
+from prompts import render_milestone_prompt
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure Gemini API with key from environment variable
-genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
-model = genai.GenerativeModel('gemini-1.5-flash')
+# Configure the model from environment variables (LLM_BACKEND=fake needs no key)
+model = create_model()
 
 def generate_milestone_plan(user_query):
-    # Determine timeframe from query
-    timeframe = "weekly"  # default
-    timeframe_map = {
-        'week': 'week',
-        'month': 'month',
-        'year': 'year'
-    }
-    for key in timeframe_map:
-        if key in user_query.lower():
-            timeframe = timeframe_map[key]
-            break
+    # Determine timeframe from query (week when it names none)
+    timeframe = timeframe_classifier.classify(user_query)[0]
 
     # Generate appropriate date ranges
     base_date = datetime.now()
@@ -61,33 +52,8 @@ def generate_milestone_plan(user_query):
             "description": "detailed description"
         })
 
-    # Generate prompt for Gemini
-    prompt = f"""Generate a detailed plan in JSON format for: "{user_query}".
-    Use this structure:
-    {{
-        "period": "{timeframe}",
-        "title": "plan title",
-        "entries": {json.dumps(entries_template, indent=2)}
-    }}
-    
-    Current date: {base_date.strftime('%Y-%m-%d')}
-
-    Follow these period formatting rules strictly:
-    1. Use ONLY the period type specified in the template above
-    2. Keep all periodName values exactly as provided in the template
-    3. Maintain the exact dates provided in the template
-    4. Include all activities for each period in the description field
-    5. DO NOT create additional entries or change the period structure
-    
-    Based on the type of plan requested, include these specific details in the description field:
-    - For fitness/workout plans: Include exercises, sets, reps, and rest periods
-    - For diet plans: Include meals, portions, calories, and nutritional info
-    - For study plans: Include topics, learning objectives, and resources
-    - For financial plans: Include specific amounts, strategies, and goals
-    - For project plans: Include tasks, deadlines, and deliverables
-    - For habit-building plans: Include specific actions, triggers, and tracking methods
-    
-    Keep descriptions detailed but concise. Format numbers consistently."""
+    # Generate prompt for Gemini from the compiled template
+    prompt = render_milestone_prompt(user_query, timeframe, entries_template, base_date.strftime('%Y-%m-%d'))
     
     try:
         response = model.generate_content(prompt)
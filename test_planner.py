@@ -1,12 +1,12 @@
+import argparse
 import requests
 import json
 import time
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def test_plan_generation(query):
+def test_plan_generation(query, url="http://localhost:5000/generate"):
     """Test plan generation with a specific query."""
-    url = "http://localhost:5000/generate"
     payload = {"query": query}
     
     try:
@@ -93,21 +93,28 @@ def main():
         "Design a yearly business strategy"
     ]
     
+    parser = argparse.ArgumentParser(description="Smoke-test /generate with a fixed set of queries")
+    parser.add_argument('--url', default="http://localhost:5000/generate")
+    parser.add_argument('--workers', type=int, default=4, help="Queries sent at the same time")
+    parser.add_argument('--quiet', action='store_true', help="Only print the summary")
+    args = parser.parse_args()
+    
     print("Starting AI Planner Tests...")
-    print(f"Testing {len(test_queries)} queries")
+    print(f"Testing {len(test_queries)} queries with {args.workers} workers")
     print("Note: Each test has a 30-second timeout")
-    print("\nFull output will be shown for each test")
+    print("For load testing use: python -m benchmarks.load")
     
     start_time = time.time()
     results = []
     
-    # Test queries sequentially for clearer output
-    for query in test_queries:
-        result = test_plan_generation(query)
-        results.append(result)
-        print_test_result(result)
-        print("Press Enter to continue to next test...")
-        input()
+    # Send queries concurrently and print each result as it arrives
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(test_plan_generation, query, args.url) for query in test_queries]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if not args.quiet:
+                print_test_result(result)
     
     end_time = time.time()
     
@@ -126,5 +133,4 @@ def main():
 
 if __name__ == "__main__":
     print("Make sure the Flask server is running (python milestone_generator.py)")
-    input("Press Enter to begin tests...")
     main() 
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""Keyword vocabularies used to detect a query's time period, duration and content type.
+
+Both the NLTK pipeline in milestone_generator.py and the keyword scanner in
+fast_path.py read these tables, so the two always agree on the words they
+look for. Order matters wherever a tuple is used: the first match wins.
+"""
+
+# Single tokens that directly name a period
+TIME_MAPPINGS = {
+    'daily': 'day',
+    'tomorrow': 'day',
+    'today': 'day',
+    'weekly': 'week',
+    'monthly': 'month',
+    'yearly': 'year',
+    'annual': 'year'
+}
+
+# Time unit tokens
+TIME_UNITS = {
+    'day': ['day', 'days', 'daily', 'tomorrow', 'today'],
+    'week': ['week', 'weeks', 'weekly', '7-day', 'seven-day'],
+    'month': ['month', 'months', 'monthly', '30-day', 'thirty-day'],
+    'year': ['year', 'years', 'yearly', 'annual', 'annually']
+}
+
+# Numeric time patterns (e.g., "7 day", "30 day"), tried before any token
+NUMERIC_TIME_PATTERN = r'(\d+)[\s-]*(day|week|month|year)s?'
+WORD_NUMBER_TIME_PATTERN = r'(seven|thirty)[\s-]*(day|week|month)s?'
+
+# Phrases checked when no time token is found
+TIME_PHRASES = (
+    ('next week', 'week'),
+    ('this month', 'month'),
+    ('this year', 'year'),
+    ('daily routine', 'day'),
+    ('weekly plan', 'week'),
+    ('monthly schedule', 'month'),
+    ('yearly goals', 'year')
+)
+
+# Context words used as the last resort before defaulting to a week
+DAY_CONTEXT_WORDS = ('routine', 'today', 'tomorrow', 'schedule')
+WEEK_CONTEXT_WORDS = ('weekend', 'weekly')
+
+# Compound time words that override the detected period
+COMPOUND_PERIODS = (
+    ('week', ('week long', 'week-long', 'weekly')),
+    ('month', ('month long', 'month-long', 'monthly')),
+    ('year', ('year long', 'year-long', 'yearly', 'annual')),
+    ('day', ('daily', 'day long', 'day-long', "tomorrow's", "today's"))
+)
+
+# Explicit spans that override everything else
+EXPLICIT_PERIODS = (
+    ('week', ('7 day', 'seven day', '7-day')),
+    ('month', ('30 day', 'thirty day', '30-day')),
+    ('year', ('365 day', 'year long'))
+)
+
+# Plans that should span at least a week even if the query says "daily"
+MULTI_DAY_WORDS = ('workout', 'diet', 'meal', 'study', 'learn')
+
+# Whole-word weights per content type, scored by content_classifier.py; ties go to the earlier type.
+# Words that also name other things ("training", "practice", "course") weigh less.
+CONTENT_TYPE_WEIGHTS = (
+    ('workout', {
+        'workout': 1.0, 'workouts': 1.0, 'fitness': 1.0, 'exercise': 1.0, 'exercises': 1.0,
+        'training': 0.75, 'gym': 1.0, 'cardio': 1.0, 'strength': 0.5
+    }),
+    ('study', {
+        'study': 1.0, 'studying': 1.0, 'learn': 1.0, 'learning': 1.0, 'practice': 0.5,
+        'education': 1.0, 'course': 0.5, 'courses': 0.5, 'ielts': 1.0, 'coding': 1.0, 'exam': 1.0, 'exams': 1.0
+    }),
+    ('meal', {
+        'diet': 1.0, 'meal': 1.0, 'meals': 1.0, 'food': 1.0, 'nutrition': 1.0, 'protein': 0.75,
+        'vegetarian': 1.0, 'vegan': 1.0, 'calorie': 0.75, 'calories': 0.75
+    }),
+    ('finance', {
+        'budget': 1.0, 'budgeting': 1.0, 'savings': 1.0, 'financial': 1.0, 'money': 0.75,
+        'finance': 1.0, 'finances': 1.0, 'invest': 1.0, 'investing': 1.0, 'debt': 1.0
+    })
+)
+
+# Whole-word weights per plan timeframe, for the standalone milestone planner in temp.py
+TIMEFRAME_WEIGHTS = (
+    ('week', {'week': 1.0, 'weeks': 1.0, 'weekly': 1.0}),
+    ('month', {'month': 1.0, 'months': 1.0, 'monthly': 1.0}),
+    ('year', {'year': 1.0, 'years': 1.0, 'yearly': 1.0, 'annual': 1.0})
+)
+
+# "<number> <unit>" horizons such as "24-month", "52 weeks" or "three years"
+HORIZON_NUMBER_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7,
+    'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'thirty': 30
+}
+HORIZON_PATTERN = rf"\b(\d+|{'|'.join(HORIZON_NUMBER_WORDS)})[\s-]*(day|week|month|year)s?\b"
+
+# Words that set the spacing of a horizon's entries, in priority order
+CADENCE_WORDS = (('daily', 'day'), ('weekly', 'week'), ('monthly', 'month'))
+
+# Day counts the period rules already turn into a week, month or year plan
+PERIOD_DAYS = (7, 30, 365)
+
+# Length of each unit in days, for converting a horizon to another cadence
+UNIT_DAYS = {'day': 1, 'week': 7, 'month': 365 / 12, 'year': 365}
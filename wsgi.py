@@ -0,0 +1,17 @@
+"""WSGI entry point for production: ``gunicorn -c gunicorn.conf.py wsgi:app``.
+
+With ``preload_app`` on, gunicorn imports this module once in the master.
+The NLTK data, the tagger and the plan tables are loaded here, before the
+workers fork, so every worker shares those pages copy-on-write instead of
+loading its own copy.
+"""
+import gc
+
+from milestone_generator import create_app, preload
+
+preload()
+app = create_app()
+
+# Move everything loaded so far out of the collector's reach; otherwise the
+# first collection in each worker writes to (and so copies) the shared pages
+gc.freeze()